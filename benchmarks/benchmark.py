@@ -0,0 +1,222 @@
+"""
+End-to-end benchmark of the action, run offline against the mock translation API.
+
+Synthetic locale trees are generated in a temporary directory, then src/main.py is run on them in several scenarios:
+- `cold`: no target file exists, every key is translated.
+- `warm`: the same run again, nothing is left to translate.
+- `incremental`: a few source values changed since the last run, and the manifest retranslates them.
+
+The wall time, the peak memory, the number of requests and the number of retries of each run are printed and can be saved as JSON. When a baseline is given, the run fails if a scenario got slower, used more memory or sent more requests than the baseline allows.
+
+Usage:
+  python benchmarks/benchmark.py --files 2000 --depth 4 --keys 40 --languages 8 --output results.json
+  python benchmarks/benchmark.py --baseline results.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+LANGUAGES = ["fr", "de", "es", "it", "nl", "pl", "pt", "ja", "ko", "zh", "sv", "da", "fi", "cs", "tr", "uk"]
+WORDS = ["account", "save", "cancel", "delete", "profile", "settings", "welcome", "message", "file", "folder", "upload", "download", "search", "filter", "sort", "page", "error", "success", "warning", "retry"]
+
+def parse_arguments() -> argparse.Namespace:
+  """
+  Parse the command line arguments.
+
+  :return: The arguments.
+  """
+  parser = argparse.ArgumentParser(description="Benchmark the action offline against the mock translation API.")
+  parser.add_argument("--files", type=int, default=500, help="The number of source files.")
+  parser.add_argument("--depth", type=int, default=3, help="The nesting depth of the keys.")
+  parser.add_argument("--keys", type=int, default=30, help="The number of keys per source file.")
+  parser.add_argument("--languages", type=int, default=4, help="The number of target languages.")
+  parser.add_argument("--file-type", choices=["yaml", "json"], default="yaml", help="The type of the locale files.")
+  parser.add_argument("--shared-ratio", type=float, default=0.3, help="The ratio of values shared between files.")
+  parser.add_argument("--latency", type=float, default=0.02, help="The latency of each request to the mock API, in seconds.")
+  parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="The probability of a request to be rate limited.")
+  parser.add_argument("--concurrency", type=int, default=4, help="The concurrency of the action.")
+  parser.add_argument("--parse-workers", type=int, default=1, help="The number of processes parsing the locale files.")
+  parser.add_argument("--seed", type=int, default=0, help="The seed of the generated trees and of the mock API failures.")
+  parser.add_argument("--output", help="The path of the JSON file to save the results to.")
+  parser.add_argument("--baseline", help="The path of the JSON results to compare to.")
+  parser.add_argument("--tolerance", type=float, default=0.2, help="The allowed relative regression compared to the baseline.")
+  return parser.parse_args()
+
+def generate_value(rng: random.Random, shared_values: list[str]) -> str:
+  """
+  Generate a source value, either shared with other files or unique.
+
+  :param rng: The random generator.
+  :param shared_values: The values shared between files.
+  :return: The value.
+  """
+  if shared_values and rng.random() < arguments.shared_ratio:
+    return rng.choice(shared_values)
+  words = rng.sample(WORDS, k=rng.randint(1, 8))
+  if rng.random() < 0.3:
+    words.insert(rng.randint(0, len(words)), "%{" + rng.choice(["name", "count", "date"]) + "}")
+  return " ".join(words).capitalize() + f" {rng.randint(0, 10 ** 6)}"
+
+def generate_data(rng: random.Random, keys_count: int, depth: int, shared_values: list[str]) -> dict:
+  """
+  Generate the contents of a source file.
+
+  :param rng: The random generator.
+  :param keys_count: The number of keys.
+  :param depth: The nesting depth of the keys.
+  :param shared_values: The values shared between files.
+  :return: The contents of the file.
+  """
+  data = {}
+  for index in range(keys_count):
+    node = data
+    for level in range(rng.randint(0, max(0, depth - 1))):
+      node = node.setdefault(f"section_{level}_{rng.randint(0, 3)}", {})
+    node[f"key_{index}"] = generate_value(rng, shared_values)
+  return data
+
+def write_data(file_path: str, data: dict, file_type: str) -> None:
+  """
+  Write the contents of a locale file.
+
+  :param file_path: The path to the file.
+  :param data: The contents of the file.
+  :param file_type: The type of the file.
+  """
+  os.makedirs(os.path.dirname(file_path), exist_ok=True)
+  with open(file_path, "w") as file:
+    if file_type == "yaml":
+      yaml.safe_dump(data, file, allow_unicode=True)
+    else:
+      json.dump(data, file, indent=2)
+
+def generate_tree(directory: str) -> list[str]:
+  """
+  Generate the source files of a synthetic locale tree.
+
+  :param directory: The directory of the tree.
+  :return: The paths to the source files.
+  """
+  rng = random.Random(arguments.seed)
+  shared_values = [generate_value(rng, []) for _ in range(max(1, arguments.keys))]
+  extension = "yml" if arguments.file_type == "yaml" else "json"
+  source_files = []
+  for index in range(arguments.files):
+    file_path = os.path.join(directory, "locales", "en", f"module_{index % 50}", f"file_{index}.{extension}")
+    write_data(file_path, generate_data(rng, arguments.keys, arguments.depth, shared_values), arguments.file_type)
+    source_files.append(file_path)
+  return source_files
+
+def change_values(source_files: list[str], ratio: float = 0.01) -> None:
+  """
+  Change a few values of the source files, to benchmark an incremental run.
+
+  :param source_files: The paths to the source files.
+  :param ratio: The ratio of files to change.
+  """
+  rng = random.Random(arguments.seed + 1)
+  for file_path in rng.sample(source_files, k=max(1, int(len(source_files) * ratio))):
+    with open(file_path) as file:
+      data = yaml.safe_load(file) if arguments.file_type == "yaml" else json.load(file)
+    node = data
+    while isinstance(node, dict) and any(isinstance(value, dict) for value in node.values()):
+      node = next(value for value in node.values() if isinstance(value, dict))
+    key = next(key for key, value in node.items() if isinstance(value, str))
+    node[key] = f"{node[key]} (changed)"
+    write_data(file_path, data, arguments.file_type)
+
+def run_action(directory: str, scenario: str) -> dict:
+  """
+  Run the action on a locale tree and measure it.
+
+  :param directory: The directory of the tree.
+  :param scenario: The name of the scenario.
+  :return: The measures of the run.
+  """
+  report_path = os.path.join(directory, f"report-{scenario}.json")
+  environment = os.environ | {
+    "SOURCE_LANGUAGE": "en",
+    "TARGET_LANGUAGES": ",".join(LANGUAGES[:arguments.languages]),
+    "VARIABLE_PATTERN": "%{(.*?)}",
+    "SOURCE_FILES_DIRECTORY": "locales/{language}",
+    "TARGET_FILES_DIRECTORY": "locales/{language}",
+    "API_KEYS": f"latency={arguments.latency}&rate_limit_rate={arguments.rate_limit_rate}&seed={arguments.seed}",
+    "API_TYPE": "mock",
+    "FILE_TYPE": arguments.file_type,
+    "MANIFEST_PATH": "auto-localize.lock.json",
+    "CONCURRENCY": str(arguments.concurrency),
+    "PARSE_WORKERS": str(arguments.parse_workers),
+    "VERBOSITY": "0",
+    "RUN_REPORT_PATH": report_path
+  }
+  environment.pop("GITHUB_STEP_SUMMARY", None)
+  start = time.perf_counter()
+  process = subprocess.Popen([sys.executable, MAIN_SCRIPT], cwd=directory, env=environment, stdout=subprocess.DEVNULL)
+  _, status, resource_usage = os.wait4(process.pid, 0)
+  wall_time = time.perf_counter() - start
+  process.returncode = os.waitstatus_to_exitcode(status)
+  if process.returncode != 0:
+    raise RuntimeError(f"The {scenario} run failed with exit code {process.returncode}")
+  with open(report_path) as file:
+    report = json.load(file)
+  return {
+    "wall_time_seconds": round(wall_time, 3),
+    "peak_memory_megabytes": round(resource_usage.ru_maxrss / 1024, 1),
+    "requests": sum(statistics["requests"] for statistics in report["http"].values()),
+    "retries": sum(statistics["retries"] for statistics in report["http"].values()),
+    "timers": { name: round(timer["total_seconds"], 3) for name, timer in report["timers"].items() }
+  }
+
+def compare(results: dict, baseline: dict) -> list[str]:
+  """
+  Compare results to a baseline.
+
+  :param results: The results of the benchmark.
+  :param baseline: The results to compare to.
+  :return: The regressions, as messages.
+  """
+  regressions = []
+  for scenario, measures in results["scenarios"].items():
+    for measure in ["wall_time_seconds", "peak_memory_megabytes", "requests"]:
+      reference = baseline.get("scenarios", {}).get(scenario, {}).get(measure)
+      if reference is not None and measures[measure] > reference * (1 + arguments.tolerance):
+        regressions.append(f"{scenario}: {measure} went from {reference} to {measures[measure]}")
+  return regressions
+
+def main() -> int:
+  """
+  Run the benchmark.
+
+  :return: The exit code.
+  """
+  results = { "parameters": vars(arguments), "scenarios": {} }
+  with tempfile.TemporaryDirectory() as directory:
+    source_files = generate_tree(directory)
+    for scenario in ["cold", "warm", "incremental"]:
+      if scenario == "incremental":
+        change_values(source_files)
+      results["scenarios"][scenario] = run_action(directory, scenario)
+      measures = results["scenarios"][scenario]
+      print(f"[{scenario}] {measures['wall_time_seconds']}s, {measures['peak_memory_megabytes']} MB, {measures['requests']} requests, {measures['retries']} retries")
+  if arguments.output:
+    with open(arguments.output, "w") as file:
+      json.dump(results, file, indent=2)
+  if arguments.baseline:
+    with open(arguments.baseline) as file:
+      regressions = compare(results, json.load(file))
+    for regression in regressions:
+      print(f"[Regression] {regression}")
+    return 1 if regressions else 0
+  return 0
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  sys.exit(main())
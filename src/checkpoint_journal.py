@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+
+class CheckpointJournal:
+  """
+  Append-only journal of the translations obtained during a run, checkpointed to disk periodically so that an interrupted run can be resumed without requesting them again.
+
+  Each line of the journal is a JSON object. The first one describes the settings the translations depend on, and a journal written with other settings is discarded. The journal is deleted once a run completes.
+  A journal opened read only, to estimate the cost of a run, only resumes translations: it is neither rewritten, checkpointed nor deleted.
+  """
+  __VERSION = 1
+
+  def __init__(self, file_path: str, provider: str, placeholders: str, checkpoint_interval: float = 10, read_only: bool = False) -> None:
+    self.__file_path = file_path
+    self.__read_only = read_only
+    self.__header = { "version": self.__VERSION, "provider": provider, "placeholders": placeholders }
+    self.__checkpoint_interval = checkpoint_interval
+    self.__translations = {}
+    self.__pending_lines = []
+    self.__last_checkpoint = time.monotonic()
+    self.__statistics = { "resumed": 0, "checkpointed": 0 }
+    self.__lock = threading.Lock()
+    self.__file = None
+    self.__load()
+    if not read_only:
+      if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+      self.__rewrite()
+      self.__file = open(file_path, "a", encoding="utf-8")
+
+  def lookup(self, texts: list[str], source_language: str, target_language: str) -> dict[str, str]:
+    """
+    Look up the translations of the given texts obtained by a previous, interrupted run.
+
+    :param texts: The texts to look up.
+    :param source_language: The language of the texts.
+    :param target_language: The language of the translations.
+    :return: The translations found, keyed by text.
+    """
+    with self.__lock:
+      journaled_translations = self.__translations.get((source_language, target_language), {})
+      translations = { text: journaled_translations[text] for text in texts if text in journaled_translations }
+      self.__statistics["resumed"] += len(translations)
+    return translations
+
+  def store(self, translations: dict[str, str], source_language: str, target_language: str) -> None:
+    """
+    Add translations to the journal, and write the journal to disk if the checkpoint interval has elapsed.
+
+    :param translations: The translations to add, keyed by source text.
+    :param source_language: The language of the source texts.
+    :param target_language: The language of the translations.
+    """
+    if self.__read_only:
+      return
+    with self.__lock:
+      self.__translations.setdefault((source_language, target_language), {}).update(translations)
+      self.__pending_lines.extend(json.dumps({ "source_language": source_language, "target_language": target_language, "source": source_text, "target": target_text }, ensure_ascii=False) for source_text, target_text in translations.items())
+      if time.monotonic() - self.__last_checkpoint >= self.__checkpoint_interval:
+        self.__checkpoint()
+
+  def statistics(self) -> dict:
+    """
+    Get the statistics of the journal since it was opened.
+
+    :return: The number of translations resumed from a previous run and of translations checkpointed to disk.
+    """
+    with self.__lock:
+      return dict(self.__statistics)
+
+  def close(self, is_completed: bool) -> None:
+    """
+    Close the journal, deleting it if the run completed, or writing its last translations to disk otherwise.
+
+    :param is_completed: Whether the run completed, so that the journal is not needed anymore.
+    """
+    if self.__read_only:
+      return
+    with self.__lock:
+      if not is_completed:
+        self.__checkpoint()
+      self.__file.close()
+      if is_completed:
+        os.remove(self.__file_path)
+
+  # --- Private methods ---
+
+  def __load(self) -> None:
+    """
+    Load the translations of the journal left by a previous run. A journal written with other settings is discarded.
+    """
+    if os.path.exists(self.__file_path):
+      with open(self.__file_path, "r", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+      if lines and self.__decode(lines[0]) == self.__header:
+        for line in lines[1:]:
+          entry = self.__decode(line)
+          if entry is not None:
+            self.__translations.setdefault((entry["source_language"], entry["target_language"]), {})[entry["source"]] = entry["target"]
+
+  def __rewrite(self) -> None:
+    """
+    Rewrite the journal with the loaded translations, without the duplicate and truncated lines of the previous run and with the current settings.
+    """
+    temporary_file_path = f"{self.__file_path}.tmp"
+    with open(temporary_file_path, "w", encoding="utf-8") as file:
+      file.write(json.dumps(self.__header) + "\n")
+      for (source_language, target_language), translations in self.__translations.items():
+        for source_text, target_text in translations.items():
+          file.write(json.dumps({ "source_language": source_language, "target_language": target_language, "source": source_text, "target": target_text }, ensure_ascii=False) + "\n")
+    os.replace(temporary_file_path, self.__file_path)
+
+  def __checkpoint(self) -> None:
+    """
+    Write the pending translations to disk, and make sure they reached it.
+    """
+    if self.__pending_lines:
+      self.__file.write("\n".join(self.__pending_lines) + "\n")
+      self.__file.flush()
+      os.fsync(self.__file.fileno())
+      self.__statistics["checkpointed"] += len(self.__pending_lines)
+      self.__pending_lines = []
+    self.__last_checkpoint = time.monotonic()
+
+  @staticmethod
+  def __decode(line: str) -> dict:
+    """
+    Decode a line of the journal.
+
+    :param line: The line.
+    :return: The decoded line, or None if it was truncated by an interruption.
+    """
+    try:
+      return json.loads(line)
+    except json.JSONDecodeError:
+      return None
@@ -1,4 +1,8 @@
 from .factory import ClientFactory
 from .deepl import DeeplClient
+from .libretranslate import LibreTranslateClient
+from .mock import MockClient
+from .placeholder_codec import PlaceholderCodec
+from .scheduler import QuotaScheduler
 
-__all__ = ["ClientFactory", "DeeplClient"]
+__all__ = ["ClientFactory", "DeeplClient", "LibreTranslateClient", "MockClient", "PlaceholderCodec", "QuotaScheduler"]
@@ -1,5 +1,12 @@
+import json
 import requests
-import re
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+from .placeholder_codec import PlaceholderCodec
 
 class BaseClient:
   """
@@ -16,61 +23,251 @@ class BaseClient:
   class UsageError(ClientError):
     pass
 
-  __DEFAULT_VARIABLE_PATTERN_STRING = '%{(.*?)}'
-  __FIRST_CAPTURED_GROUP_PATTERN = r"\(([^()]*?)\)"
+  __DEFAULT_POOL_SIZE = 10
+  __DEFAULT_TIMEOUT = (10, 60)
+  __DEFAULT_MAX_RETRIES = 5
+  __RETRY_BASE_DELAY = 1
+  __RETRY_MAX_DELAY = 60
+  __RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504, 529]
+  __LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+  # Capabilities of the API, overridden by each client. None means unlimited.
+  _MAX_TEXTS_PER_REQUEST = None
+  _MAX_REQUEST_SIZE = None
+  _REQUEST_SIZE_MARGIN = 0
+  _REQUESTS_PER_SECOND = None
+  _MAX_CONCURRENT_REQUESTS = None
 
-  def __init__(self, api_key: str, variable_pattern: str = None) -> None:
+  def __init__(self, api_key: str, variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, placeholder_syntaxes: list[str] = None) -> None:
     self._api_key = api_key
     self._is_api_key_validated = False
-    self._variable_pattern = re.compile(self.__DEFAULT_VARIABLE_PATTERN_STRING if not variable_pattern else variable_pattern)
-    self._replacement_pattern = self.__generate_replacement_pattern()
+    self._lock = threading.RLock()
+    self._placeholder_codec = PlaceholderCodec(variable_pattern=variable_pattern, syntaxes=placeholder_syntaxes)
+    self._timeout = self.__DEFAULT_TIMEOUT if timeout is None else timeout
+    self._session = self.__generate_session(self.__DEFAULT_POOL_SIZE if pool_size is None else pool_size)
+    self._max_retries = self.__DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+    self._statistics = {
+      "requests": 0,
+      "retries": 0,
+      "bytes_sent": 0,
+      "bytes_received": 0,
+      "total_latency_seconds": 0.0,
+      "latency_histogram": { f"<={bucket}s": 0 for bucket in self.__LATENCY_BUCKETS } | { "slower": 0 }
+    }
 
   @staticmethod
-  def generate_clients(_api_keys: list[str], _variable_pattern: str = None) -> list['BaseClient']:
+  def generate_clients(_api_keys: list[str], _variable_pattern: str = None, _pool_size: int = None, _timeout: tuple[float, float] = None, _max_retries: int = None, _api_url: str = None, _placeholder_syntaxes: list[str] = None, _languages_cache_path: str = None) -> list['BaseClient']:
     raise NotImplementedError
 
-  @staticmethod
-  def best_client(_clients: list['BaseClient']) -> 'BaseClient':
-    raise NotImplementedError
+  @classmethod
+  def batches(cls, texts: list[str]) -> list[list[str]]:
+    """
+    Splits a list of texts into batches that fit in a single translate request of the API.
+
+    A batch holds at most the maximum number of texts per request of the API, and its JSON-encoded texts stay below the maximum request size of the API, minus a margin for the rest of the body.
+
+    :param texts: The texts to split.
+    :return: The batches of texts, in the same order as the texts.
+    """
+    max_batch_size = cls._MAX_REQUEST_SIZE - cls._REQUEST_SIZE_MARGIN if cls._MAX_REQUEST_SIZE is not None else None
+    batches = []
+    batch = []
+    batch_size = 0
+    for text in texts:
+      text_size = len(json.dumps(text).encode("utf-8")) + 2 if max_batch_size is not None else 0
+      if batch and ((cls._MAX_TEXTS_PER_REQUEST is not None and len(batch) >= cls._MAX_TEXTS_PER_REQUEST) or (max_batch_size is not None and batch_size + text_size > max_batch_size)):
+        batches.append(batch)
+        batch = []
+        batch_size = 0
+      batch.append(text)
+      batch_size += text_size
+    if batch:
+      batches.append(batch)
+    return batches
 
   def translate(self, _texts: list[str], _source_language, _target_language: str) -> list[str]:
     raise NotImplementedError
 
+  def billed_characters(self, _texts: list[str]) -> int:
+    raise NotImplementedError
+
   def validate_api_key(self) -> bool:
     raise NotImplementedError
 
   def usage(self) -> int:
     raise NotImplementedError
 
+  def refresh_usage(self) -> int:
+    raise NotImplementedError
+
+  def capabilities(self) -> dict:
+    """
+    Returns the capabilities of the API, used to batch and schedule the translate requests.
+
+    :return: The maximum number of texts and size of a translate request, the maximum number of requests per second and of concurrent requests, and the supported source and target languages. None means unlimited, or any language.
+    """
+    source_languages, target_languages = self._supported_languages()
+    return {
+      "max_texts_per_request": self._MAX_TEXTS_PER_REQUEST,
+      "max_request_size": self._MAX_REQUEST_SIZE,
+      "requests_per_second": self._REQUESTS_PER_SECOND,
+      "max_concurrent_requests": self._MAX_CONCURRENT_REQUESTS,
+      "source_languages": source_languages,
+      "target_languages": target_languages
+    }
+
+  def supports_languages(self, source_language: str, target_language: str = None) -> bool:
+    """
+    Checks if the API can translate from a source language to a target language.
+
+    :param source_language: The source language.
+    :param target_language: The target language, or None to only check the source language.
+    :return: True if both languages are supported, False otherwise.
+    """
+    source_languages, target_languages = self._supported_languages()
+    return (source_languages is None or self._match_language(source_language, source_languages) is not None) and (target_language is None or target_languages is None or self._match_language(target_language, target_languages) is not None)
+
+  def statistics(self) -> dict:
+    """
+    Returns the statistics of the HTTP requests sent by the client.
+
+    :return: The number of requests and retries, the bytes sent and received, and the total latency with its histogram.
+    """
+    with self._lock:
+      return self._statistics | { "latency_histogram": dict(self._statistics["latency_histogram"]) }
+
+  def close(self) -> None:
+    """
+    Closes the connections kept alive by the client.
+    """
+    self._session.close()
+
   # --- Protected methods ---
 
+  def _supported_languages(self) -> tuple[list[str], list[str]]:
+    """
+    Returns the languages supported by the API.
+
+    :return: The supported source languages and target languages, or None for any language.
+    """
+    return None, None
+
+  @staticmethod
+  def _match_language(language: str, supported_languages: list[str]) -> str:
+    """
+    Finds the supported language matching a language, ignoring the case and falling back to the language without its region.
+
+    :param language: The language, like "en", "pt_BR" or "PT-br".
+    :param supported_languages: The languages supported by the API, as the API names them.
+    :return: The matching supported language, or None if the language is not supported.
+    """
+    supported_languages_by_normalized_language = { supported_language.lower(): supported_language for supported_language in supported_languages }
+    normalized_language = language.lower().replace("_", "-")
+    return supported_languages_by_normalized_language.get(normalized_language) or supported_languages_by_normalized_language.get(normalized_language.split("-")[0])
+
   def _get(self, *args, **kwargs) -> requests.Response:
     """
-    Wrapper around requests.get.
+    Wrapper around requests.Session.get, reusing the pooled connections of the client and retrying transient failures.
 
-    :param args: Positional arguments for requests.get.
-    :param kwargs: Keyword arguments for requests.get.
-    :return: The response from requests.get.
+    :param args: Positional arguments for requests.Session.get.
+    :param kwargs: Keyword arguments for requests.Session.get.
+    :return: The response from requests.Session.get.
     """
-    return requests.get(*args, **kwargs)
+    return self.__request_with_retries("GET", *args, **kwargs)
 
   def _post(self, *args, **kwargs) -> requests.Response:
     """
-    Wrapper around requests.post.
+    Wrapper around requests.Session.post, reusing the pooled connections of the client and retrying transient failures.
 
-    :param args: Positional arguments for requests.post.
-    :param kwargs: Keyword arguments for requests.post.
-    :return: The response from requests.post.
+    :param args: Positional arguments for requests.Session.post.
+    :param kwargs: Keyword arguments for requests.Session.post.
+    :return: The response from requests.Session.post.
     """
-    return requests.post(*args, **kwargs)
+    return self.__request_with_retries("POST", *args, **kwargs)
 
   # --- Private methods ---
 
-  def __generate_replacement_pattern(self) -> str:
+  @staticmethod
+  def __generate_session(pool_size: int) -> requests.Session:
+    """
+    Generates a session keeping up to pool_size connections alive per host.
+
+    :param pool_size: The maximum number of connections kept alive per host.
+    :return: The session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+  def __request_with_retries(self, method: str, *args, **kwargs) -> requests.Response:
+    """
+    Sends a request, retrying it with exponential backoff and jitter on rate limiting, server errors and connection errors.
+
+    A request that is not a GET is not retried when its response timed out, since the API may have processed and billed it already.
+
+    :param method: The HTTP method.
+    :param args: Positional arguments for requests.Session.request.
+    :param kwargs: Keyword arguments for requests.Session.request.
+    :raises requests.ConnectionError: If the connection still fails after the last retry.
+    :raises requests.Timeout: If the request still times out after the last retry, or if the response to a request that is not a GET timed out.
+    :return: The response of the last attempt.
+    """
+    kwargs.setdefault("timeout", self._timeout)
+    data = kwargs.get("data") or b""
+    bytes_sent = len(data.encode("utf-8") if isinstance(data, str) else data)
+    attempt = 0
+    while True:
+      start = time.perf_counter()
+      try:
+        response = self._session.request(method, *args, **kwargs)
+      except (requests.ConnectionError, requests.Timeout) as error:
+        self.__record_request(latency=time.perf_counter() - start, bytes_sent=bytes_sent, bytes_received=0)
+        if attempt >= self._max_retries or (method != "GET" and isinstance(error, requests.Timeout) and not isinstance(error, requests.ConnectTimeout)):
+          raise
+        delay = self.__retry_delay(attempt=attempt)
+      else:
+        self.__record_request(latency=time.perf_counter() - start, bytes_sent=bytes_sent, bytes_received=len(response.content))
+        if response.status_code not in self.__RETRYABLE_STATUS_CODES or attempt >= self._max_retries:
+          return response
+        delay = self.__retry_delay(attempt=attempt, retry_after=response.headers.get("Retry-After"))
+      with self._lock:
+        self._statistics["retries"] += 1
+      time.sleep(delay)
+      attempt += 1
+
+  def __record_request(self, latency: float, bytes_sent: int, bytes_received: int) -> None:
     """
-    Generates a replacement pattern for the variable pattern.
+    Records the statistics of a request.
 
-    :return: The replacement pattern.
+    :param latency: The latency of the request, in seconds.
+    :param bytes_sent: The size of the body of the request.
+    :param bytes_received: The size of the body of the response.
     """
-    return self._variable_pattern.pattern.replace(re.search(self.__FIRST_CAPTURED_GROUP_PATTERN, self._variable_pattern.pattern)[0], r"\1")
+    bucket = next((f"<={bucket}s" for bucket in self.__LATENCY_BUCKETS if latency <= bucket), "slower")
+    with self._lock:
+      self._statistics["requests"] += 1
+      self._statistics["bytes_sent"] += bytes_sent
+      self._statistics["bytes_received"] += bytes_received
+      self._statistics["total_latency_seconds"] += latency
+      self._statistics["latency_histogram"][bucket] += 1
 
+  def __retry_delay(self, attempt: int, retry_after: str = None) -> float:
+    """
+    Returns the delay before retrying a request.
+
+    :param attempt: The number of the failed attempt, starting at 0.
+    :param retry_after: The value of the Retry-After header of the response, if any.
+    :return: The delay in seconds, honoring Retry-After when present, or an exponential backoff with full jitter otherwise.
+    """
+    if retry_after:
+      try:
+        return min(max(0, float(retry_after)), self.__RETRY_MAX_DELAY)
+      except ValueError:
+        pass
+      try:
+        return min(max(0, parsedate_to_datetime(retry_after).timestamp() - time.time()), self.__RETRY_MAX_DELAY)
+      except (TypeError, ValueError):
+        pass
+    return random.uniform(0, min(self.__RETRY_MAX_DELAY, self.__RETRY_BASE_DELAY * 2 ** attempt))
@@ -1,74 +1,101 @@
-import re
 import json
+import os
+import threading
+import time
 
 from .base import BaseClient
 
 class DeeplClient(BaseClient):
   """
   Client for the DeepL API.
+
+  The supported languages are either the ones known when the client was written, or the live ones fetched from the API and cached in a local file when a languages cache path is given.
   """
   __USAGE_ENDPOINT = "/v2/usage"
   __TRANSLATE_ENDPOINT = "/v2/translate"
+  __LANGUAGES_ENDPOINT = "/v2/languages"
+  __LANGUAGES_CACHE_MAX_AGE = 24 * 60 * 60
   __FREE_HOST = "api-free.deepl.com"
   __PREMIUM_HOST = "api.deepl.com"
-  __VARIABLE_XML_TAG = "x"
+  __PLACEHOLDER_XML_TAG = "x"
+  _MAX_TEXTS_PER_REQUEST = 50
+  _MAX_REQUEST_SIZE = 128 * 1024
+  _REQUEST_SIZE_MARGIN = 4 * 1024
 
   __SUPPORTED_SOURCE_LANGUAGES = ["AR", "BG", "CS", "DA", "DE", "EL", "EN", "ES", "ET", "FI", "FR", "HU", "ID", "IT", "JA", "KO", "LT", "LV", "NB", "NL", "PL", "PT", "RO", "RU", "SK", "SL", "SV", "TR", "UK", "ZH"]
   __SUPPORTED_TARGET_LANGUAGES = ["AR", "BG", "CS", "DA", "DE", "EL", "EN", "EN-GB", "EN-US", "ES", "ET", "FI", "FR", "HU", "ID", "IT", "JA", "KO", "LT", "LV", "NB", "NL", "PL", "PT", "PT-BR", "PT-PT", "RO", "RU", "SK", "SL", "SV", "TR", "UK", "ZH"]
-
-  def __init__(self, api_key: str, variable_pattern: str = None) -> None:
-    super().__init__(api_key=api_key, variable_pattern=variable_pattern)
+  # The live target languages only have the regional variants of these languages
+  __DEFAULT_REGIONAL_LANGUAGES = { "en": "EN-US", "pt": "PT-PT" }
+  # The live languages are shared by all the clients, so that they are fetched once per run.
+  __live_languages = {}
+  __live_languages_lock = threading.Lock()
+
+  def __init__(self, api_key: str, variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, placeholder_syntaxes: list[str] = None, languages_cache_path: str = None) -> None:
+    super().__init__(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, placeholder_syntaxes=placeholder_syntaxes)
+    self.__languages_cache_path = languages_cache_path
+    self.__languages = None
     self.__is_api_key_free = None
     self.__source_languages_dictionary = {}
     self.__target_languages_dictionary = {}
     self.__remaining_characters = None
 
   @staticmethod
-  def generate_clients(api_keys: list[str], variable_pattern: str = None) -> list['DeeplClient']:
+  def generate_clients(api_keys: list[str], variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, api_url: str = None, placeholder_syntaxes: list[str] = None, languages_cache_path: str = None) -> list['DeeplClient']:
     """
     Generates a list of clients for the DeepL API.
 
     :param api_keys: The API keys to generate clients for.
     :param variable_pattern: The pattern to match variables in the texts.
+    :param pool_size: The maximum number of connections kept alive by each client.
+    :param timeout: The connect and read timeouts of the requests, in seconds.
+    :param max_retries: The maximum number of retries of a failed request.
+    :param api_url: Unused, the URL of the DeepL API depends on the type of the API key.
+    :param placeholder_syntaxes: The syntaxes of the placeholders to protect besides the variables, see PlaceholderCodec.
+    :param languages_cache_path: The path to the file caching the languages fetched from the API. The known languages are used if empty.
     :return: The list of clients.
     """
-    return list(map(lambda api_key: DeeplClient(api_key=api_key, variable_pattern=variable_pattern), api_keys))
-
-  @staticmethod
-  def best_client(clients: list['DeeplClient']) -> 'DeeplClient':
-    """
-    Returns the client with the most remaining characters.
-
-    :param clients: The clients to choose from.
-    :return: The client with the most remaining characters.
-    """
-    clients_with_remaining_characters = list(filter(lambda client: client.usage() > 0, clients))
-    if len(clients_with_remaining_characters) == 0:
-      raise BaseClient.UsageError("No clients have remaining characters.")
-    return max(clients_with_remaining_characters, key=lambda client: client.usage())
+    return list(map(lambda api_key: DeeplClient(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, placeholder_syntaxes=placeholder_syntaxes, languages_cache_path=languages_cache_path), api_keys))
 
   def translate(self, texts: list[str], source_language: str, target_language: str) -> list[str]:
     """
     Translates a list of texts from a source language to a target language.
 
+    The texts are sent in as few requests as the API limits allow.
+
     :param texts: The texts to translate.
     :param source_language: The language of the texts.
     :param target_language: The language to translate the texts to.
-    :return: The translated texts.
+    :return: The translated texts, in the same order as the texts, or None for each text whose placeholders did not come back.
     """
     self.validate_api_key()
-    return list(map(lambda text: self.__post_translate(texts=[text], source_language=source_language, target_language=target_language)[0], texts))
+    translated_texts = []
+    for batch in self.batches(texts):
+      translated_texts.extend(self.__post_translate(texts=batch, source_language=source_language, target_language=target_language))
+    return translated_texts
+
+  def billed_characters(self, texts: list[str]) -> int:
+    """
+    Counts the characters that translating a list of texts would consume from the quota.
+
+    :param texts: The texts to translate.
+    :return: The number of billed characters.
+    """
+    return len("".join(self._placeholder_codec.encode(texts)[0]))
 
   def validate_api_key(self) -> None:
     """
-    Validates the API key.
+    Validates the API key, and loads the live languages if a languages cache path is given.
 
     :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :raises BaseClient.ClientError: If the languages cannot be fetched.
     """
-    if self._is_api_key_validated:
-      return
-    self.__detect_api_key_type()
-    self._is_api_key_validated = True
+    with self._lock:
+      if self._is_api_key_validated:
+        return
+      self.__detect_api_key_type()
+      if self.__languages_cache_path:
+        self.__languages = self.__load_languages()
+      self._is_api_key_validated = True
 
   def usage(self) -> int:
     """
@@ -78,9 +105,50 @@ class DeeplClient(BaseClient):
     :return: The number of remaining characters.
     """
     self.validate_api_key()
-    if self.__remaining_characters is None:
-      self.__remaining_characters = self.__get_usage()
-    return self.__remaining_characters
+    with self._lock:
+      if self.__remaining_characters is None:
+        self.__remaining_characters = self.__get_usage()
+      return self.__remaining_characters
+
+  def refresh_usage(self) -> int:
+    """
+    Polls the number of remaining characters from the API.
+
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :return: The number of remaining characters.
+    """
+    self.validate_api_key()
+    remaining_characters = self.__get_usage()
+    with self._lock:
+      self.__remaining_characters = remaining_characters
+      return self.__remaining_characters
+
+  # Protected methods
+
+  def _supported_languages(self) -> tuple[list[str], list[str]]:
+    """
+    Returns the languages supported by the DeepL API, the live ones if they were loaded.
+
+    :return: The supported source languages and target languages.
+    """
+    if self.__languages is not None:
+      return self.__languages["source"], self.__languages["target"]
+    return self.__SUPPORTED_SOURCE_LANGUAGES, self.__SUPPORTED_TARGET_LANGUAGES
+
+  @staticmethod
+  def _match_language(language: str, supported_languages: list[str]) -> str:
+    """
+    Finds the supported language matching a language, see BaseClient._match_language. A language without its region, like "en" or "pt", falls back to its default regional variant, EN-US or PT-PT, when only the regional variants are supported.
+
+    :param language: The language, like "en", "pt_BR" or "PT-br".
+    :param supported_languages: The languages supported by the API, as the API names them.
+    :return: The matching supported language, or None if the language is not supported.
+    """
+    matching_language = BaseClient._match_language(language, supported_languages)
+    default_regional_language = DeeplClient.__DEFAULT_REGIONAL_LANGUAGES.get(language.lower().replace("_", "-"))
+    if matching_language is None and default_regional_language is not None:
+      return BaseClient._match_language(default_regional_language, supported_languages)
+    return matching_language
 
   # Private methods
 
@@ -94,21 +162,22 @@ class DeeplClient(BaseClient):
       return
     for is_api_key_free in [True, False]:
       try:
-        self.__ping(is_api_key_free=is_api_key_free)
+        self.__remaining_characters = self.__ping(is_api_key_free=is_api_key_free)
         self.__is_api_key_free = is_api_key_free
         return
       except BaseClient.InvalidApiKeyError:
         pass
     raise BaseClient.InvalidApiKeyError("The API key is invalid.")
 
-  def __ping(self, is_api_key_free: bool) -> None:
+  def __ping(self, is_api_key_free: bool) -> int:
     """
     Pings the DeepL API.
 
     :param is_api_key_free: Whether the API key is free.
     :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :return: The number of remaining characters.
     """
-    self.__get_usage(is_api_key_free=is_api_key_free)
+    return self.__get_usage(is_api_key_free=is_api_key_free)
 
   def __url(self, endpoint: str, is_api_key_free: bool) -> str:
     """
@@ -138,6 +207,63 @@ class DeeplClient(BaseClient):
     """
     return self.__url(endpoint=self.__TRANSLATE_ENDPOINT, is_api_key_free=is_api_key_free)
 
+  def __load_languages(self) -> dict[str, list[str]]:
+    """
+    Loads the languages supported by the API from the cache file, or fetches them and writes the cache file if it is missing or older than a day.
+
+    :raises BaseClient.ClientError: If the languages cannot be fetched.
+    :return: The supported languages, as `source` and `target`.
+    """
+    with DeeplClient.__live_languages_lock:
+      if self.__languages_cache_path not in DeeplClient.__live_languages:
+        languages = self.__read_languages_cache()
+        if languages is None:
+          languages = { language_type: self.__get_languages(language_type) for language_type in ["source", "target"] }
+          self.__write_languages_cache(languages)
+        DeeplClient.__live_languages[self.__languages_cache_path] = languages
+      return DeeplClient.__live_languages[self.__languages_cache_path]
+
+  def __read_languages_cache(self) -> dict[str, list[str]]:
+    """
+    Reads the languages from the cache file.
+
+    :return: The cached languages, or None if the cache file is missing, expired or invalid.
+    """
+    try:
+      if time.time() - os.path.getmtime(self.__languages_cache_path) > self.__LANGUAGES_CACHE_MAX_AGE:
+        return None
+      with open(self.__languages_cache_path, "r", encoding="utf-8") as file:
+        languages = json.load(file)
+    except (OSError, ValueError):
+      return None
+    if not isinstance(languages, dict) or not all(isinstance(languages.get(language_type), list) for language_type in ["source", "target"]):
+      return None
+    return languages
+
+  def __write_languages_cache(self, languages: dict[str, list[str]]) -> None:
+    """
+    Writes the languages to the cache file.
+
+    :param languages: The languages, as `source` and `target`.
+    """
+    if os.path.dirname(self.__languages_cache_path):
+      os.makedirs(os.path.dirname(self.__languages_cache_path), exist_ok=True)
+    temporary_file_path = f"{self.__languages_cache_path}.tmp"
+    with open(temporary_file_path, "w", encoding="utf-8") as file:
+      json.dump(languages, file)
+    os.replace(temporary_file_path, self.__languages_cache_path)
+
+  def __get_languages(self, language_type: str) -> list[str]:
+    """
+    Fetches the languages supported by the API.
+
+    :param language_type: Either `source` or `target`.
+    :raises BaseClient.ClientError: If the languages cannot be fetched.
+    :return: The codes of the languages.
+    """
+    response = self._get(self.__url(endpoint=self.__LANGUAGES_ENDPOINT, is_api_key_free=self.__is_api_key_free), headers=self.__header_for_api_key(), params={ "type": language_type })
+    return [language["language"] for language in self.__handle_json_response(response)]
+
   def __header_for_api_key(self) -> dict:
     """
     Returns the header for the API key.
@@ -154,12 +280,12 @@ class DeeplClient(BaseClient):
     """
     return { "Content-Type": "application/json" }
 
-  def __get_usage(self, is_api_key_free: bool = None) -> dict:
+  def __get_usage(self, is_api_key_free: bool = None) -> int:
     """
-    Returns the usage of the API key.
+    Returns the number of remaining characters of the API key.
 
     :param is_api_key_free: Whether the API key is free.
-    :return: The usage of the API key.
+    :return: The number of remaining characters of the API key.
     """
     if is_api_key_free is None:
       is_api_key_free = self.__is_api_key_free
@@ -177,55 +303,44 @@ class DeeplClient(BaseClient):
     :param texts: The texts to translate.
     :param source_language: The language of the texts.
     :param target_language: The language to translate the texts to.
-    :return: The translated texts.
+    :return: The translated texts, or None for each text whose placeholders did not come back.
     """
     headers = self.__header_for_api_key() | self.__header_for_content_type()
-    data = self.__generate_body_for_translate(texts=texts, source_language=source_language, target_language=target_language)
-    characters_count = len("".join(data["text"]))
-    if (self.usage() < characters_count):
-      raise BaseClient.UsageError("The API key does not have enough characters remaining.")
-    response = self._post(self.__translate_url(self.__is_api_key_free), headers=headers, data=json.dumps(data))
-    json_response = self.__handle_json_response(response)
-    translated_texts = map(lambda translation: self.__format_text_from_api(translation["text"]), json_response["translations"])
-    self.__remaining_characters -= characters_count
-    return list(translated_texts)
+    encoded_texts, placeholders = self._placeholder_codec.encode(texts)
+    data = self.__generate_body_for_translate(texts=encoded_texts, source_language=source_language, target_language=target_language)
+    characters_count = len("".join(encoded_texts))
+    with self._lock:
+      if (self.usage() < characters_count):
+        raise BaseClient.UsageError("The API key does not have enough characters remaining.")
+      self.__remaining_characters -= characters_count
+    try:
+      response = self._post(self.__translate_url(self.__is_api_key_free), headers=headers, data=json.dumps(data))
+      json_response = self.__handle_json_response(response)
+    except BaseClient.ClientError:
+      with self._lock:
+        self.__remaining_characters += characters_count
+      raise
+    if len(json_response["translations"]) != len(texts):
+      raise BaseClient.TranslationError("The API did not return one translation per text.")
+    return self._placeholder_codec.decode([translation["text"] for translation in json_response["translations"]], placeholders)
 
   def __generate_body_for_translate(self, texts: list[str], source_language: str, target_language: str) -> dict:
     """
     Generates the body for the translate endpoint.
 
-    :param texts: The texts to translate.
+    :param texts: The texts to translate, with their placeholders encoded.
     :param source_language: The language of the texts.
     :param target_language: The language to translate the texts to.
     :return: The body for the translate endpoint.
     """
     return {
-      "text": list(map(lambda text: self.__format_text_for_api(text), texts)),
+      "text": texts,
       "source_lang": self.__get_formatted_source_language_for_api(source_language),
       "target_lang": self.__get_formatted_target_language_for_api(target_language),
       "tag_handling": "xml",
-      "ignore_tags": [self.__VARIABLE_XML_TAG]
+      "ignore_tags": [self.__PLACEHOLDER_XML_TAG]
     }
 
-  def __format_text_for_api(self, text: str) -> str:
-    """
-    Formats the text for the API.
-
-    :param text: The text to format.
-    :return: The formatted text.
-    """
-    return re.sub(self._variable_pattern, lambda match: f"<{self.__VARIABLE_XML_TAG}>{match.group(1)}</{self.__VARIABLE_XML_TAG}>", text)
-
-  def __format_text_from_api(self, text: str) -> str:
-    """
-    Formats the text from the API.
-
-    :param text: The text to format.
-    :return: The formatted text.
-    """
-    pattern = re.compile(f"<{self.__VARIABLE_XML_TAG}>(.*?)</{self.__VARIABLE_XML_TAG}>")
-    return re.sub(pattern, self._replacement_pattern, text)
-
   def __get_formatted_target_language_for_api(self, language: str) -> str:
     """
     Returns the formatted target language for the API.
@@ -246,11 +361,8 @@ class DeeplClient(BaseClient):
     :raises BaseClient.UnsupportedLanguageError: If the target language is not supported.
     :return: The formatted target language for the API.
     """
-    formatted_language = language.upper().replace("_", "-")
-    if formatted_language in self.__SUPPORTED_TARGET_LANGUAGES:
-      return formatted_language
-    formatted_language = formatted_language.split("-")[0]
-    if formatted_language in self.__SUPPORTED_TARGET_LANGUAGES:
+    formatted_language = self._match_language(language, self._supported_languages()[1])
+    if formatted_language is not None:
       return formatted_language
     raise BaseClient.UnsupportedLanguageError(f"The target language '{language}' is not supported.")
 
@@ -274,11 +386,8 @@ class DeeplClient(BaseClient):
     :raises BaseClient.UnsupportedLanguageError: If the source language is not supported.
     :return: The formatted source language for the API.
     """
-    formatted_language = language.upper().replace("_", "-")
-    if formatted_language in self.__SUPPORTED_SOURCE_LANGUAGES:
-      return formatted_language
-    formatted_language = formatted_language.split("-")[0]
-    if formatted_language in self.__SUPPORTED_SOURCE_LANGUAGES:
+    formatted_language = self._match_language(language, self._supported_languages()[0])
+    if formatted_language is not None:
       return formatted_language
     raise BaseClient.UnsupportedLanguageError(f"The source language '{language}' is not supported.")
 
@@ -288,11 +397,16 @@ class DeeplClient(BaseClient):
 
     :param response: The response.
     :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :raises BaseClient.UsageError: If the quota of the API key is exceeded.
     :raises BaseClient.ClientError: If the client has an exception.
     :return: The JSON response.
     """
     if response.status_code == 403:
       raise BaseClient.InvalidApiKeyError
+    if response.status_code == 456:
+      raise BaseClient.UsageError("The quota of the API key is exceeded.")
+    if response.status_code == 429:
+      raise BaseClient.ClientError("Too many requests, even after retrying.")
     if response.status_code != 200:
       raise BaseClient.ClientError(f"Client exception: {response.text}")
     return response.json()
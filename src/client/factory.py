@@ -1,4 +1,6 @@
 from .deepl import DeeplClient
+from .libretranslate import LibreTranslateClient
+from .mock import MockClient
 
 class ClientFactory:
   """
@@ -17,4 +19,8 @@ class ClientFactory:
     """
     if api_type == "deepl":
       return DeeplClient
+    if api_type == "libretranslate":
+      return LibreTranslateClient
+    if api_type == "mock":
+      return MockClient
     raise ClientFactory.UnsupportedClientError(f"Client '{api_type}' is not supported")
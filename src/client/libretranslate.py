@@ -0,0 +1,179 @@
+import html
+import json
+
+from .base import BaseClient
+
+class LibreTranslateClient(BaseClient):
+  """
+  Client for the LibreTranslate API, or any API compatible with it, like a self-hosted LibreTranslate instance.
+
+  The texts are sent as HTML, so that the tokens of the placeholders are kept untouched, and the rest of the texts is escaped.
+  The API has no quota, so the remaining characters of a client are unlimited.
+  """
+  __DEFAULT_API_URL = "http://localhost:5000"
+  __LANGUAGES_ENDPOINT = "/languages"
+  __TRANSLATE_ENDPOINT = "/translate"
+  __UNLIMITED_CHARACTERS = 10 ** 12
+  _MAX_TEXTS_PER_REQUEST = 50
+  _MAX_REQUEST_SIZE = 128 * 1024
+  _REQUEST_SIZE_MARGIN = 4 * 1024
+
+  def __init__(self, api_key: str, variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, api_url: str = None, placeholder_syntaxes: list[str] = None) -> None:
+    super().__init__(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, placeholder_syntaxes=placeholder_syntaxes)
+    self.__api_url = (api_url or self.__DEFAULT_API_URL).rstrip("/")
+    self.__target_languages_by_source_language = None
+
+  @staticmethod
+  def generate_clients(api_keys: list[str], variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, api_url: str = None, placeholder_syntaxes: list[str] = None, languages_cache_path: str = None) -> list['LibreTranslateClient']:
+    """
+    Generates a list of clients for the LibreTranslate API.
+
+    :param api_keys: The API keys to generate clients for. An empty API key is not sent, for instances that do not require one.
+    :param variable_pattern: The pattern to match variables in the texts.
+    :param pool_size: The maximum number of connections kept alive by each client.
+    :param timeout: The connect and read timeouts of the requests, in seconds.
+    :param max_retries: The maximum number of retries of a failed request.
+    :param api_url: The URL of the API, defaulting to a LibreTranslate instance running locally.
+    :param placeholder_syntaxes: The syntaxes of the placeholders to protect besides the variables, see PlaceholderCodec.
+    :param languages_cache_path: Unused, the languages are always fetched from the API.
+    :return: The list of clients.
+    """
+    return list(map(lambda api_key: LibreTranslateClient(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, api_url=api_url, placeholder_syntaxes=placeholder_syntaxes), api_keys))
+
+  def translate(self, texts: list[str], source_language: str, target_language: str) -> list[str]:
+    """
+    Translates a list of texts from a source language to a target language.
+
+    :param texts: The texts to translate.
+    :param source_language: The language of the texts.
+    :param target_language: The language to translate the texts to.
+    :raises BaseClient.UnsupportedLanguageError: If the API cannot translate from the source language to the target language.
+    :return: The translated texts, in the same order as the texts, or None for each text whose placeholders did not come back.
+    """
+    self.validate_api_key()
+    formatted_source_language = self._match_language(source_language, list(self.__target_languages_by_source_language))
+    if formatted_source_language is None:
+      raise BaseClient.UnsupportedLanguageError(f"The source language '{source_language}' is not supported.")
+    formatted_target_language = self._match_language(target_language, self.__target_languages_by_source_language[formatted_source_language])
+    if formatted_target_language is None:
+      raise BaseClient.UnsupportedLanguageError(f"The target language '{target_language}' is not supported from '{source_language}'.")
+    translated_texts = []
+    for batch in self.batches(texts):
+      translated_texts.extend(self.__post_translate(texts=batch, source_language=formatted_source_language, target_language=formatted_target_language))
+    return translated_texts
+
+  def billed_characters(self, texts: list[str]) -> int:
+    """
+    Counts the characters sent to the API to translate a list of texts.
+
+    :param texts: The texts to translate.
+    :return: The number of characters.
+    """
+    return len("".join(self._placeholder_codec.encode(texts, escape=self.__escape)[0]))
+
+  def validate_api_key(self) -> None:
+    """
+    Checks that the API is reachable, and fetches the languages it supports.
+
+    The API key itself is only checked by the translate requests.
+
+    :raises BaseClient.ClientError: If the API cannot be reached.
+    """
+    with self._lock:
+      if self._is_api_key_validated:
+        return
+      self.__target_languages_by_source_language = self.__get_languages()
+      self._is_api_key_validated = True
+
+  def usage(self) -> int:
+    """
+    Returns the number of remaining characters, which is unlimited.
+
+    :raises BaseClient.ClientError: If the API cannot be reached.
+    :return: The number of remaining characters.
+    """
+    self.validate_api_key()
+    return self.__UNLIMITED_CHARACTERS
+
+  def refresh_usage(self) -> int:
+    """
+    Returns the number of remaining characters, which is unlimited.
+
+    :raises BaseClient.ClientError: If the API cannot be reached.
+    :return: The number of remaining characters.
+    """
+    return self.usage()
+
+  # --- Protected methods ---
+
+  def _supported_languages(self) -> tuple[list[str], list[str]]:
+    """
+    Returns the languages supported by the API, as fetched when validating the client.
+
+    :return: The supported source languages and target languages, or None before the client is validated.
+    """
+    if self.__target_languages_by_source_language is None:
+      return None, None
+    target_languages = {target_language for target_languages in self.__target_languages_by_source_language.values() for target_language in target_languages}
+    return list(self.__target_languages_by_source_language), sorted(target_languages)
+
+  # --- Private methods ---
+
+  def __get_languages(self) -> dict[str, list[str]]:
+    """
+    Fetches the languages supported by the API.
+
+    :raises BaseClient.ClientError: If the API cannot be reached.
+    :return: The target languages supported by the API, keyed by source language.
+    """
+    response = self._get(f"{self.__api_url}{self.__LANGUAGES_ENDPOINT}")
+    json_response = self.__handle_json_response(response)
+    return { language["code"]: language.get("targets", [language["code"] for language in json_response]) for language in json_response }
+
+  def __post_translate(self, texts: list[str], source_language: str, target_language: str) -> list[str]:
+    """
+    Translates a batch of texts from a source language to a target language.
+
+    :param texts: The texts to translate.
+    :param source_language: The language of the texts, as the API names it.
+    :param target_language: The language to translate the texts to, as the API names it.
+    :raises BaseClient.TranslationError: If the API did not return one translation per text.
+    :return: The translated texts, or None for each text whose placeholders did not come back.
+    """
+    encoded_texts, placeholders = self._placeholder_codec.encode(texts, escape=self.__escape)
+    data = { "q": encoded_texts, "source": source_language, "target": target_language, "format": "html" }
+    if self._api_key:
+      data["api_key"] = self._api_key
+    response = self._post(f"{self.__api_url}{self.__TRANSLATE_ENDPOINT}", headers={ "Content-Type": "application/json" }, data=json.dumps(data))
+    translated_texts = self.__handle_json_response(response)["translatedText"]
+    if not isinstance(translated_texts, list) or len(translated_texts) != len(texts):
+      raise BaseClient.TranslationError("The API did not return one translation per text.")
+    return self._placeholder_codec.decode(translated_texts, placeholders, unescape=html.unescape)
+
+  @staticmethod
+  def __escape(text: str) -> str:
+    """
+    Escapes a part of a text as HTML.
+
+    :param text: The part of the text.
+    :return: The escaped part of the text.
+    """
+    return html.escape(text, quote=False)
+
+  @staticmethod
+  def __handle_json_response(response) -> dict:
+    """
+    Handles a JSON response.
+
+    :param response: The response.
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :raises BaseClient.ClientError: If the client has an exception.
+    :return: The JSON response.
+    """
+    if response.status_code == 403:
+      raise BaseClient.InvalidApiKeyError("The API key is invalid.")
+    if response.status_code == 429:
+      raise BaseClient.ClientError("Too many requests, even after retrying.")
+    if response.status_code != 200:
+      raise BaseClient.ClientError(f"Client exception: {response.text}")
+    return response.json()
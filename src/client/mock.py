@@ -0,0 +1,275 @@
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qsl
+
+import requests
+from requests.adapters import BaseAdapter
+
+from .base import BaseClient
+
+class MockClient(BaseClient):
+  """
+  Offline client simulating a translation API, used to benchmark the action without an API key.
+
+  The API key holds the options of the simulated API as a query string, like `latency=0.05&quota=500000&rate_limit_rate=0.1`:
+  - `latency`: the time each request takes, in seconds (default: 0).
+  - `jitter`: a random time added to the latency of each request, in seconds (default: 0).
+  - `quota`: the number of characters the API key can translate (default: unlimited).
+  - `rate_limit_rate`: the probability of a request to be rate limited (default: 0).
+  - `error_rate`: the probability of a request to fail with a server error (default: 0).
+  - `retry_after`: the value of the Retry-After header of the rate limited requests, in seconds (default: 0).
+  - `invalid`: whether the API key is rejected (default: false).
+  - `seed`: the seed of the random failures, to make runs reproducible.
+  - `requests_per_second`: the rate limit declared in the capabilities of the client, that the scheduler enforces (default: unlimited).
+  - `max_concurrent_requests`: the concurrency limit declared in the capabilities of the client, that the scheduler enforces (default: unlimited).
+
+  Texts are translated by prefixing them with the target language, and the placeholders are sent as tokens that the simulated API checks and keeps untouched. The markup of the texts that is not a token, like the `<x id="INTERPOLATION"/>` of Angular XLIFF files, is kept untouched as well.
+  """
+  __BASE_URL = "mock://translation-api"
+  __USAGE_ENDPOINT = "/usage"
+  __TRANSLATE_ENDPOINT = "/translate"
+  _MAX_TEXTS_PER_REQUEST = 50
+
+  def __init__(self, api_key: str, variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, placeholder_syntaxes: list[str] = None) -> None:
+    super().__init__(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, placeholder_syntaxes=placeholder_syntaxes)
+    options = dict(parse_qsl(api_key))
+    self._session.mount("mock://", MockClient.MockAdapter(options=options))
+    self.__requests_per_second = float(options["requests_per_second"]) if "requests_per_second" in options else None
+    self.__max_concurrent_requests = int(options["max_concurrent_requests"]) if "max_concurrent_requests" in options else None
+    self.__remaining_characters = None
+
+  @staticmethod
+  def generate_clients(api_keys: list[str], variable_pattern: str = None, pool_size: int = None, timeout: tuple[float, float] = None, max_retries: int = None, api_url: str = None, placeholder_syntaxes: list[str] = None, languages_cache_path: str = None) -> list['MockClient']:
+    """
+    Generates a list of clients for the simulated API.
+
+    :param api_keys: The options of the simulated API, one query string per client.
+    :param variable_pattern: The pattern to match variables in the texts.
+    :param pool_size: Unused, kept for compatibility with the other clients.
+    :param timeout: Unused, kept for compatibility with the other clients.
+    :param max_retries: The maximum number of retries of a failed request.
+    :param api_url: Unused, the simulated API has no URL.
+    :param placeholder_syntaxes: The syntaxes of the placeholders to protect besides the variables, see PlaceholderCodec.
+    :param languages_cache_path: Unused, the simulated API supports any language.
+    :return: The list of clients.
+    """
+    return list(map(lambda api_key: MockClient(api_key=api_key, variable_pattern=variable_pattern, pool_size=pool_size, timeout=timeout, max_retries=max_retries, placeholder_syntaxes=placeholder_syntaxes), api_keys))
+
+  def translate(self, texts: list[str], source_language: str, target_language: str) -> list[str]:
+    """
+    Translates a list of texts to a target language.
+
+    :param texts: The texts to translate.
+    :param source_language: The language of the texts, unused by the simulated API.
+    :param target_language: The language to translate the texts to.
+    :return: The translated texts, in the same order as the texts, or None for each text whose placeholders did not come back.
+    """
+    self.validate_api_key()
+    translated_texts = []
+    for batch in self.batches(texts):
+      translated_texts.extend(self.__post_translate(texts=batch, target_language=target_language))
+    return translated_texts
+
+  def capabilities(self) -> dict:
+    """
+    Returns the capabilities of the simulated API, with the limits given in its options.
+
+    :return: The capabilities of the simulated API.
+    """
+    return super().capabilities() | { "requests_per_second": self.__requests_per_second, "max_concurrent_requests": self.__max_concurrent_requests }
+
+  def billed_characters(self, texts: list[str]) -> int:
+    """
+    Counts the characters that translating a list of texts would consume from the quota.
+
+    :param texts: The texts to translate.
+    :return: The number of billed characters.
+    """
+    return len("".join(self._placeholder_codec.encode(texts)[0]))
+
+  def validate_api_key(self) -> None:
+    """
+    Validates the API key.
+
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    """
+    with self._lock:
+      if self._is_api_key_validated:
+        return
+      self.__remaining_characters = self.__get_usage()
+      self._is_api_key_validated = True
+
+  def usage(self) -> int:
+    """
+    Returns the number of remaining characters.
+
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :return: The number of remaining characters.
+    """
+    self.validate_api_key()
+    with self._lock:
+      return self.__remaining_characters
+
+  def refresh_usage(self) -> int:
+    """
+    Polls the number of remaining characters from the simulated API.
+
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :return: The number of remaining characters.
+    """
+    self.validate_api_key()
+    remaining_characters = self.__get_usage()
+    with self._lock:
+      self.__remaining_characters = remaining_characters
+      return self.__remaining_characters
+
+  # --- Private methods ---
+
+  def __get_usage(self) -> int:
+    """
+    Returns the number of remaining characters of the API key.
+
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :return: The number of remaining characters of the API key.
+    """
+    response = self._get(f"{self.__BASE_URL}{self.__USAGE_ENDPOINT}")
+    json_response = self.__handle_json_response(response)
+    return int(json_response["character_limit"]) - int(json_response["character_count"])
+
+  def __post_translate(self, texts: list[str], target_language: str) -> list[str]:
+    """
+    Translates a batch of texts to a target language.
+
+    :param texts: The texts to translate.
+    :param target_language: The language to translate the texts to.
+    :raises BaseClient.UsageError: If the API key does not have enough characters remaining.
+    :raises BaseClient.TranslationError: If the simulated API did not return one translation per text.
+    :return: The translated texts, or None for each text whose placeholders did not come back.
+    """
+    encoded_texts, placeholders = self._placeholder_codec.encode(texts)
+    data = { "text": encoded_texts, "target_lang": target_language }
+    characters_count = len("".join(encoded_texts))
+    with self._lock:
+      if self.usage() < characters_count:
+        raise BaseClient.UsageError("The API key does not have enough characters remaining.")
+      self.__remaining_characters -= characters_count
+    try:
+      response = self._post(f"{self.__BASE_URL}{self.__TRANSLATE_ENDPOINT}", headers={ "Content-Type": "application/json" }, data=json.dumps(data))
+      json_response = self.__handle_json_response(response)
+    except BaseClient.ClientError:
+      with self._lock:
+        self.__remaining_characters += characters_count
+      raise
+    if len(json_response["translations"]) != len(texts):
+      raise BaseClient.TranslationError("The API did not return one translation per text.")
+    return self._placeholder_codec.decode([translation["text"] for translation in json_response["translations"]], placeholders)
+
+  @staticmethod
+  def __handle_json_response(response) -> dict:
+    """
+    Handles a JSON response.
+
+    :param response: The response.
+    :raises BaseClient.InvalidApiKeyError: If the API key is invalid.
+    :raises BaseClient.UsageError: If the quota of the API key is exceeded.
+    :raises BaseClient.ClientError: If the client has an exception.
+    :return: The JSON response.
+    """
+    if response.status_code == 403:
+      raise BaseClient.InvalidApiKeyError("The API key is invalid.")
+    if response.status_code == 456:
+      raise BaseClient.UsageError("The quota of the API key is exceeded.")
+    if response.status_code == 429:
+      raise BaseClient.ClientError("Too many requests, even after retrying.")
+    if response.status_code != 200:
+      raise BaseClient.ClientError(f"Client exception: {response.text}")
+    return response.json()
+
+  class MockAdapter(BaseAdapter):
+    """
+    Transport adapter answering the requests of a client in process, as the simulated API would.
+    """
+    __UNLIMITED_QUOTA = 10 ** 12
+    __MALFORMED_TOKEN_PATTERN = re.compile(r'<x id="\d+"(?!/>)')
+
+    def __init__(self, options: dict[str, str]) -> None:
+      super().__init__()
+      self.__latency = float(options.get("latency", 0))
+      self.__jitter = float(options.get("jitter", 0))
+      self.__quota = int(options["quota"]) if "quota" in options else self.__UNLIMITED_QUOTA
+      self.__rate_limit_rate = float(options.get("rate_limit_rate", 0))
+      self.__error_rate = float(options.get("error_rate", 0))
+      self.__retry_after = options.get("retry_after", "0")
+      self.__is_invalid = options.get("invalid", "false").lower() == "true"
+      self.__random = random.Random(options.get("seed"))
+      self.__character_count = 0
+      self.__lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **_kwargs) -> requests.Response:
+      """
+      Answers a request after the simulated latency.
+
+      :param request: The request.
+      :return: The response of the simulated API.
+      """
+      with self.__lock:
+        delay = self.__latency + self.__random.uniform(0, self.__jitter)
+        draw = self.__random.random()
+      time.sleep(delay)
+      if self.__is_invalid:
+        return self.__response(request, status_code=403, body={ "message": "Forbidden" })
+      if draw < self.__rate_limit_rate:
+        return self.__response(request, status_code=429, body={ "message": "Too many requests" }, headers={ "Retry-After": self.__retry_after })
+      if draw < self.__rate_limit_rate + self.__error_rate:
+        return self.__response(request, status_code=503, body={ "message": "Service unavailable" })
+      if request.url.endswith("/usage"):
+        with self.__lock:
+          return self.__response(request, status_code=200, body={ "character_count": self.__character_count, "character_limit": self.__quota })
+      return self.__translate(request)
+
+    def close(self) -> None:
+      pass
+
+    # --- Private methods ---
+
+    def __translate(self, request: requests.PreparedRequest) -> requests.Response:
+      """
+      Translates the texts of a request by prefixing them with the target language.
+
+      :param request: The request.
+      :return: The response of the simulated API, or a 400 if a placeholder token is malformed, or a 456 if the quota is exceeded.
+      """
+      body = json.loads(request.body)
+      texts = body["text"]
+      if any(self.__MALFORMED_TOKEN_PATTERN.search(text) for text in texts):
+        return self.__response(request, status_code=400, body={ "message": "Malformed placeholder tokens" })
+      characters_count = len("".join(texts))
+      with self.__lock:
+        if self.__character_count + characters_count > self.__quota:
+          return self.__response(request, status_code=456, body={ "message": "Quota exceeded" })
+        self.__character_count += characters_count
+      prefix = f"[{body['target_lang'].upper()}] "
+      return self.__response(request, status_code=200, body={ "translations": [{ "text": prefix + text } for text in texts] })
+
+    @staticmethod
+    def __response(request: requests.PreparedRequest, status_code: int, body: dict, headers: dict = None) -> requests.Response:
+      """
+      Builds a response to a request.
+
+      :param request: The request.
+      :param status_code: The status code of the response.
+      :param body: The JSON body of the response.
+      :param headers: The headers of the response.
+      :return: The response.
+      """
+      response = requests.Response()
+      response.status_code = status_code
+      response._content = json.dumps(body).encode("utf-8")
+      response.headers.update({ "Content-Type": "application/json" } | (headers or {}))
+      response.encoding = "utf-8"
+      response.url = request.url
+      response.request = request
+      return response
@@ -0,0 +1,107 @@
+import re
+from typing import Callable
+
+class PlaceholderCodec:
+  """
+  Protects the placeholders of texts from being translated, by replacing them with opaque tokens before translation and restoring them in the translations.
+
+  The placeholders are matched by the variable pattern along with the enabled syntaxes, all compiled once into a single pattern:
+  - `icu`: ICU arguments, like `{name}`, `{0}` or `{count, number}`.
+  - `printf`: printf conversions, like `%s`, `%1$d`, `%.2f` or `%@`.
+  - `mustache`: Mustache and Handlebars tags, like `{{name}}` or `{{{html}}}`.
+  - `html`: HTML tags, like `<b>`, `</a>` or `<br/>`.
+
+  Each placeholder is replaced by an empty `x` tag holding its position in the text, like `<x id="0"/>`, so that translation APIs handling tags keep it untouched. A translation is only accepted if every token of its text comes back exactly once.
+  The `x` tags already in the texts, like the inline placeholders of XLIFF files, are always protected as placeholders themselves, so that they are never taken for tokens.
+  """
+  class UnsupportedSyntaxError(Exception):
+    pass
+
+  SYNTAXES = {
+    "mustache": r"\{\{\{?[^{}]+?\}?\}\}",
+    "icu": r"\{[A-Za-z0-9_]+(?:\s*,\s*[A-Za-z]+(?:\s*,\s*[^{}]*)?)?\}",
+    "printf": r"%(?:\d+\$)?[-+0#]*(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:hh|h|ll|l|L|q|j|z|t)?[diouxXeEfFgGaAcsp@]",
+    "html": r"</?[A-Za-z][A-Za-z0-9-]*(?:\s+[^<>]*?)?\s*/?>"
+  }
+  __DEFAULT_VARIABLE_PATTERN = "%{(.*?)}"
+  __TOKEN_TAG_PATTERN = r"</?x\b[^<>]*>"
+  __TOKEN_PATTERN = re.compile(r'<x id="(\d+)"\s*(?:/>|>\s*</x>)')
+
+  def __init__(self, variable_pattern: str = None, syntaxes: list[str] = None) -> None:
+    syntaxes = syntaxes or []
+    unsupported_syntaxes = [syntax for syntax in syntaxes if syntax not in self.SYNTAXES]
+    if unsupported_syntaxes:
+      raise PlaceholderCodec.UnsupportedSyntaxError(f"Placeholder syntaxes {unsupported_syntaxes} are not supported, use {list(self.SYNTAXES)}")
+    patterns = [self.__TOKEN_TAG_PATTERN, variable_pattern or self.__DEFAULT_VARIABLE_PATTERN] + [self.SYNTAXES[syntax] for syntax in self.SYNTAXES if syntax in syntaxes]
+    self.__pattern = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+  def encode(self, texts: list[str], escape: Callable[[str], str] = None) -> tuple[list[str], list[list[str]]]:
+    """
+    Replace the placeholders of texts with tokens.
+
+    :param texts: The texts to encode.
+    :param escape: The function escaping the parts of the texts around the placeholders, if the API needs it.
+    :return: The encoded texts, and the placeholders of each text in the order of their tokens.
+    """
+    encoded_texts = []
+    placeholders = []
+    for text in texts:
+      encoded_text = ""
+      text_placeholders = []
+      position = 0
+      for match in self.__pattern.finditer(text):
+        if match.end() == match.start():
+          continue
+        encoded_text += self.__escaped(text[position:match.start()], escape) + f'<x id="{len(text_placeholders)}"/>'
+        text_placeholders.append(match.group(0))
+        position = match.end()
+      encoded_texts.append(encoded_text + self.__escaped(text[position:], escape))
+      placeholders.append(text_placeholders)
+    return encoded_texts, placeholders
+
+  def strip(self, text: str) -> str:
+    """
+    Remove the placeholders of a text.
+
+    :param text: The text.
+    :return: The text without its placeholders.
+    """
+    return self.__pattern.sub("", text)
+
+  def decode(self, texts: list[str], placeholders: list[list[str]], unescape: Callable[[str], str] = None) -> list[str]:
+    """
+    Restore the placeholders of translated texts from their tokens.
+
+    :param texts: The translated texts, in the order of the encoded texts.
+    :param placeholders: The placeholders of each text, as returned by encode.
+    :param unescape: The function unescaping the parts of the texts around the tokens, if the API needs it.
+    :return: The decoded texts, or None for each text whose tokens did not all come back exactly once.
+    """
+    decoded_texts = []
+    for text, text_placeholders in zip(texts, placeholders):
+      decoded_text = ""
+      indexes = []
+      position = 0
+      for match in self.__TOKEN_PATTERN.finditer(text):
+        index = int(match.group(1))
+        indexes.append(index)
+        if index >= len(text_placeholders):
+          break
+        decoded_text += self.__escaped(text[position:match.start()], unescape) + text_placeholders[index]
+        position = match.end()
+      is_valid = sorted(indexes) == list(range(len(text_placeholders)))
+      decoded_texts.append(decoded_text + self.__escaped(text[position:], unescape) if is_valid else None)
+    return decoded_texts
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __escaped(text: str, escape: Callable[[str], str] = None) -> str:
+    """
+    Escape or unescape a part of a text.
+
+    :param text: The part of the text.
+    :param escape: The escaping or unescaping function, if any.
+    :return: The escaped or unescaped part of the text.
+    """
+    return escape(text) if escape is not None and text else text
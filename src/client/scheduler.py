@@ -0,0 +1,173 @@
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import BaseClient
+
+class QuotaScheduler:
+  """
+  Spreads the translate requests across clients by weighted round-robin, the weight of a client being its remaining characters.
+
+  The remaining characters of each client are kept locally and updated by each translate call. They are only polled again from the API once the refresh interval has elapsed, or after a quota error.
+
+  The capabilities declared by each client are enforced: a client is only chosen for the languages it supports, and its requests are spaced and bounded so that they stay within its rate and concurrency limits.
+  """
+  def __init__(self, clients: list[BaseClient], usage_refresh_interval: float = 300) -> None:
+    self.__clients = clients
+    self.__usage_refresh_interval = usage_refresh_interval
+    self.__current_weights = {client: 0 for client in clients}
+    self.__estimated_usage = {}
+    self.__last_usage_refresh = None
+    self.__semaphores = {}
+    self.__next_request_times = {client: 0.0 for client in clients}
+    self.__lock = threading.Lock()
+    self.__refresh_lock = threading.Lock()
+
+  def validate(self) -> None:
+    """
+    Validates the API keys of all clients and fetches their usage concurrently.
+
+    :raises BaseClient.InvalidApiKeyError: If an API key is invalid.
+    """
+    with ThreadPoolExecutor(max_workers=len(self.__clients)) as executor:
+      list(executor.map(lambda client: client.usage(), self.__clients))
+    self.__last_usage_refresh = time.monotonic()
+    for client in self.__clients:
+      max_concurrent_requests = client.capabilities()["max_concurrent_requests"]
+      if max_concurrent_requests is not None:
+        self.__semaphores[client] = threading.BoundedSemaphore(max_concurrent_requests)
+
+  def unsupported_target_languages(self, source_language: str, target_languages: list[str]) -> list[str]:
+    """
+    Finds the target languages that no client can translate to from a source language, so that they are known before any translation.
+
+    The clients must have been validated, as some of them only know their supported languages from the API.
+
+    :param source_language: The source language.
+    :param target_languages: The target languages.
+    :raises BaseClient.UnsupportedLanguageError: If no client supports the source language.
+    :return: The unsupported target languages, in the order of the target languages.
+    """
+    if not any(client.supports_languages(source_language=source_language) for client in self.__clients):
+      raise BaseClient.UnsupportedLanguageError(f"No client supports translating from {source_language}.")
+    return [target_language for target_language in target_languages if not any(client.supports_languages(source_language=source_language, target_language=target_language) for client in self.__clients)]
+
+  def translate(self, texts: list[str], source_language: str, target_language: str) -> list[str]:
+    """
+    Translates a list of texts with the next client that has enough remaining characters.
+
+    If the chosen client runs out of characters, its usage is refreshed and the texts are sent to the next client.
+
+    :param texts: The texts to translate.
+    :param source_language: The language of the texts.
+    :param target_language: The language to translate the texts to.
+    :raises BaseClient.UnsupportedLanguageError: If no client supports the languages.
+    :raises BaseClient.UsageError: If no client has enough remaining characters.
+    :return: The translated texts.
+    """
+    # The clients of a run share their type and placeholder codec, and so their billing
+    characters_count = self.__clients[0].billed_characters(texts)
+    excluded_clients = self.__clients_not_supporting(source_language=source_language, target_language=target_language)
+    while True:
+      client = self.__next_client(characters_count=characters_count, excluded_clients=excluded_clients)
+      try:
+        with self.__semaphores.get(client) or nullcontext():
+          self.__throttle(client)
+          return client.translate(texts=texts, source_language=source_language, target_language=target_language)
+      except BaseClient.UsageError:
+        self.__refresh_usage([client])
+        excluded_clients.add(client)
+
+  def estimate(self, texts: list[str], source_language: str, target_language: str) -> tuple[BaseClient, list[int]]:
+    """
+    Picks the client that would translate a list of texts, without translating them.
+
+    The characters the chosen client would be billed are deducted from an estimated usage, kept apart from the real one.
+
+    :param texts: The texts that would be translated.
+    :param source_language: The language of the texts.
+    :param target_language: The language the texts would be translated to.
+    :raises BaseClient.UnsupportedLanguageError: If no client supports the languages.
+    :return: The chosen client, or None if no client would have enough remaining characters, and the number of billed characters of each text.
+    """
+    excluded_clients = self.__clients_not_supporting(source_language=source_language, target_language=target_language)
+    with self.__lock:
+      for client in self.__clients:
+        self.__estimated_usage.setdefault(client, client.usage())
+    characters_counts = [self.__clients[0].billed_characters([text]) for text in texts]
+    try:
+      client = self.__next_client(characters_count=sum(characters_counts), excluded_clients=excluded_clients, usage=lambda client: self.__estimated_usage[client])
+    except BaseClient.UsageError:
+      return None, characters_counts
+    with self.__lock:
+      self.__estimated_usage[client] -= sum(characters_counts)
+    return client, characters_counts
+
+  # --- Private methods ---
+
+  def __next_client(self, characters_count: int, excluded_clients: set[BaseClient], usage=lambda client: client.usage()) -> BaseClient:
+    """
+    Returns the next client by smooth weighted round-robin among the clients with enough remaining characters.
+
+    :param characters_count: The number of characters to translate.
+    :param excluded_clients: The clients not to choose.
+    :param usage: The function returning the remaining characters of a client.
+    :raises BaseClient.UsageError: If no client has enough remaining characters.
+    :return: The next client.
+    """
+    with self.__refresh_lock:
+      if self.__last_usage_refresh is None or time.monotonic() - self.__last_usage_refresh > self.__usage_refresh_interval:
+        self.__refresh_usage(self.__clients)
+    with self.__lock:
+      weights = {client: usage(client) for client in self.__clients if client not in excluded_clients}
+      weights = {client: weight for client, weight in weights.items() if weight >= max(characters_count, 1)}
+      if len(weights) == 0:
+        raise BaseClient.UsageError("No clients have remaining characters.")
+      for client, weight in weights.items():
+        self.__current_weights[client] += weight
+      client = max(weights, key=lambda client: self.__current_weights[client])
+      self.__current_weights[client] -= sum(weights.values())
+      return client
+
+  def __clients_not_supporting(self, source_language: str, target_language: str) -> set[BaseClient]:
+    """
+    Returns the clients that do not support translating from a source language to a target language.
+
+    :param source_language: The source language.
+    :param target_language: The target language.
+    :raises BaseClient.UnsupportedLanguageError: If no client supports the languages.
+    :return: The clients not supporting the languages.
+    """
+    clients = {client for client in self.__clients if not client.supports_languages(source_language=source_language, target_language=target_language)}
+    if len(clients) == len(self.__clients):
+      raise BaseClient.UnsupportedLanguageError(f"No client supports translating from {source_language} to {target_language}.")
+    return clients
+
+  def __throttle(self, client: BaseClient) -> None:
+    """
+    Waits until a request can be sent to a client without exceeding its declared rate limit.
+
+    :param client: The client about to send a request.
+    """
+    requests_per_second = client.capabilities()["requests_per_second"]
+    if not requests_per_second:
+      return
+    with self.__lock:
+      now = time.monotonic()
+      request_time = max(now, self.__next_request_times[client])
+      self.__next_request_times[client] = request_time + 1 / requests_per_second
+    if request_time > now:
+      time.sleep(request_time - now)
+
+  def __refresh_usage(self, clients: list[BaseClient]) -> None:
+    """
+    Polls the usage of the given clients concurrently.
+
+    :param clients: The clients to poll the usage of.
+    :raises BaseClient.InvalidApiKeyError: If an API key is invalid.
+    """
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+      list(executor.map(lambda client: client.refresh_usage(), clients))
+    if len(clients) == len(self.__clients):
+      self.__last_usage_refresh = time.monotonic()
@@ -0,0 +1,57 @@
+import threading
+
+class CostReport:
+  """
+  Accounting of the characters a run would be billed, per file, per target language and per API key.
+
+  Each unique text is billed once per target language. Its characters are attributed to the first file that needs it.
+  """
+  def __init__(self, client_labels: dict) -> None:
+    self.__client_labels = client_labels
+    self.__characters_by_text = {}
+    self.__characters_by_language = {}
+    self.__characters_by_client = {}
+    self.__lock = threading.Lock()
+
+  def add(self, target_language: str, client, texts: list[str], characters_counts: list[int]) -> None:
+    """
+    Record a batch of texts that would be translated.
+
+    :param target_language: The target language of the texts.
+    :param client: The client that would translate the texts, or None if no client would have enough remaining characters.
+    :param texts: The texts.
+    :param characters_counts: The number of characters that would be billed for each text.
+    """
+    client_label = self.__client_labels[client] if client is not None else "No API key with enough remaining characters"
+    with self.__lock:
+      self.__characters_by_text.update(((target_language, text), characters_count) for text, characters_count in zip(texts, characters_counts))
+      self.__characters_by_language[target_language] = self.__characters_by_language.get(target_language, 0) + sum(characters_counts)
+      self.__characters_by_client[client_label] = self.__characters_by_client.get(client_label, 0) + sum(characters_counts)
+
+  def attribute(self, target_language: str, texts: list[str]) -> int:
+    """
+    Attribute to a file the characters of the given texts that have not been attributed to another file yet.
+
+    :param target_language: The target language of the file.
+    :param texts: The texts of the file.
+    :return: The number of characters attributed to the file.
+    """
+    characters_count = 0
+    with self.__lock:
+      for text in texts:
+        characters_count += self.__characters_by_text.pop((target_language, text), 0)
+    return characters_count
+
+  def summary(self) -> list[str]:
+    """
+    Get the summary of the characters that would be billed.
+
+    :return: The lines of the summary.
+    """
+    with self.__lock:
+      lines = [f"[Dry run] {sum(self.__characters_by_language.values())} characters would be billed"]
+      for target_language, characters_count in sorted(self.__characters_by_language.items()):
+        lines.append(f"[Dry run] Language '{target_language}': {characters_count} characters")
+      for client_label, characters_count in sorted(self.__characters_by_client.items()):
+        lines.append(f"[Dry run] {client_label}: {characters_count} characters")
+      return lines
@@ -1,5 +1,13 @@
 from .factory import FileFactory
-from .yaml import YamlFile
+from .yaml import YamlFile, FastYamlFile, RoundTripYamlFile
 from .json import JsonFile
+from .po import PoFile
+from .android import AndroidXmlFile
+from .strings import StringsFile
+from .arb import ArbFile
+from .xliff import XliffFile
+from .document import LocaleDocument
+from .plural_rules import PluralRules
+from .key_index import KeyIndex
 
-__all__ = ["FileFactory", "YamlFile", "JsonFile"]
+__all__ = ["FileFactory", "YamlFile", "FastYamlFile", "RoundTripYamlFile", "JsonFile", "PoFile", "AndroidXmlFile", "StringsFile", "ArbFile", "XliffFile", "LocaleDocument", "PluralRules", "KeyIndex"]
@@ -0,0 +1,218 @@
+import re
+
+from .base import BaseFile
+from .document import LocaleDocument
+from .plural_rules import PluralRules
+
+class AndroidXmlFile(BaseFile):
+  """
+  Class to handle Android string resources, like `res/values/strings.xml`.
+
+  Strings are keyed by name. A plurals resource is the list of its items, one per quantity, and so is a string array. The strings marked with `translatable="false"` are left out.
+  A translated plurals resource gets the quantities of the target language, each one with the translation of the same quantity of the source file, or of its `other` quantity as Android falls back to.
+  The values are the XML content of the resources, with their markup and their XML entities as is, and their Android escapes, like `\\'` or `\\n`, unescaped.
+  A file is parsed in a single pass over its resources, and written back with its comments, its other resources and the formatting of its unchanged strings, see LocaleDocument.
+  """
+  __RESOURCES_PATTERN = re.compile(r"<resources\b[^>]*>")
+  __RESOURCE_PATTERN = re.compile(r"<!--.*?-->|<(string-array|plurals|string)\b([^>]*?)(?:/>|>(.*?)</\1\s*>)", re.DOTALL)
+  __ITEM_PATTERN = re.compile(r"(<item\b[^>]*?)(?:/>|>(.*?)</item\s*>)", re.DOTALL)
+  __ATTRIBUTE_PATTERN = re.compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+  __QUANTITY_PATTERN = re.compile(r"""(\bquantity\s*=\s*)(["'])[^"']*\2""")
+  __TAG_PATTERN = re.compile(r"(<[^>]*>)")
+  __ESCAPE_PATTERN = re.compile(r"\\(u[0-9A-Fa-f]{4}|.)", re.DOTALL)
+  __ESCAPES = { "n": "\n", "t": "\t" }
+  __DEFAULT_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n<resources>'
+  __DEFAULT_FOOTER = "\n</resources>\n"
+  __DEFAULT_SEPARATOR = "\n    "
+
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the strings of an Android resources file.
+
+    :param file_path: The path to the XML file to read.
+    :raise ParseError: If the file is not an Android resources file.
+    :return: The strings, plurals and string arrays, keyed by name.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      return AndroidXmlFile.__parse(file.read())
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the strings to an Android resources file, unless it already has these contents.
+
+    :param file_path: The path to the XML file to write.
+    :param data: The strings to write, as returned by read or prepare_target.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    document = data if isinstance(data, LocaleDocument) else AndroidXmlFile.prepare_target(data, {}, "")
+    return AndroidXmlFile._write_if_changed(file_path, document.render(lambda key, value: AndroidXmlFile.__render_resource(document, key, value), separator=document.properties["separator"]))
+
+  @staticmethod
+  def prepare_target(target_data: dict, source_data: dict, target_language: str) -> dict:
+    """
+    Prepare the contents of a target resources file, so that its translated plurals get the quantities of the target language.
+
+    A new target file gets the XML declaration and the resources element of the source file.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param source_data: The contents of the source file.
+    :param target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
+    """
+    if isinstance(target_data, LocaleDocument):
+      document = target_data
+    else:
+      properties = source_data.properties if isinstance(source_data, LocaleDocument) else { "header": AndroidXmlFile.__DEFAULT_HEADER, "separator": AndroidXmlFile.__DEFAULT_SEPARATOR }
+      document = LocaleDocument(footer=source_data.footer if isinstance(source_data, LocaleDocument) else AndroidXmlFile.__DEFAULT_FOOTER, header=properties["header"], separator=properties["separator"])
+      document.add_text(properties["header"])
+      document.update(target_data)
+    document.properties["language"] = target_language
+    document.properties["source"] = source_data
+    return document
+
+  # --- Protected methods ---
+
+  @staticmethod
+  def _extension() -> str:
+    """
+    Get the file extension for Android resources files.
+
+    :return: The file extension for Android resources files.
+    """
+    return "xml"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __parse(content: str) -> LocaleDocument:
+    """
+    Parse the content of an Android resources file, resource by resource.
+
+    :param content: The content of the file.
+    :raise ParseError: If the content has no resources element.
+    :return: The strings of the file.
+    """
+    match = AndroidXmlFile.__RESOURCES_PATTERN.search(content)
+    end = content.rfind("</resources>")
+    if match is None or end < match.end():
+      if match is not None and match.group(0).endswith("/>"):
+        return AndroidXmlFile.prepare_target({}, {}, "")
+      raise BaseFile.ParseError("Expected a resources element")
+    document = LocaleDocument(header=content[:match.end()], separator=AndroidXmlFile.__DEFAULT_SEPARATOR)
+    document.add_text(content[:match.end()])
+    position = match.end()
+    for match in AndroidXmlFile.__RESOURCE_PATTERN.finditer(content, position, end):
+      gap = content[position:match.start()]
+      document.add_text(gap)
+      position = match.end()
+      attributes = AndroidXmlFile.__attributes(match.group(2) or "")
+      if match.group(1) is None or "name" not in attributes or attributes.get("translatable") == "false":
+        document.add_text(match.group(0))
+        continue
+      if match.group(1) == "string":
+        value = AndroidXmlFile.__unescape(match.group(3) or "")
+      else:
+        value = [AndroidXmlFile.__unescape(item.group(2) or "") for item in AndroidXmlFile.__ITEM_PATTERN.finditer(match.group(3) or "")]
+      document.properties["separator"] = gap[len(gap.rstrip()):] or document.properties["separator"]
+      document.add_message(attributes["name"], value, match.group(0))
+    document.footer = content[position:]
+    return document
+
+  @staticmethod
+  def __render_resource(document: LocaleDocument, key: str, value) -> str:
+    """
+    Render a translated resource, from its element in the target file or in the source file.
+
+    :param document: The document of the target file.
+    :param key: The name of the resource.
+    :param value: The translation, or the list of translated items.
+    :return: The XML element of the resource.
+    """
+    source_data = document.properties.get("source")
+    texts = [text for text in (document.original_text(key), source_data.original_text(key) if isinstance(source_data, LocaleDocument) else None) if text is not None]
+    matches = [match for match in map(AndroidXmlFile.__RESOURCE_PATTERN.fullmatch, texts) if match and (match.group(1) == "string") == isinstance(value, str)]
+    if isinstance(value, str):
+      attributes = matches[0].group(2) if matches else f' name="{key}"'
+      return f"<string{attributes}>{AndroidXmlFile.__escape(value)}</string>"
+    if not matches:
+      return f'<string-array name="{key}">' + "".join(f"<item>{AndroidXmlFile.__escape(item)}</item>" for item in value) + "</string-array>"
+    quantities = None
+    if any(match.group(1) == "plurals" for match in matches):
+      value, quantities = AndroidXmlFile.__with_target_quantities(document, key, value)
+    # Prefer the element with as many items as the translation, so that each item keeps its quantity
+    match = next((match for match in matches if len(AndroidXmlFile.__ITEM_PATTERN.findall(match.group(3) or "")) == len(value)), matches[0])
+    inner = match.group(3) or ""
+    items = list(AndroidXmlFile.__ITEM_PATTERN.finditer(inner))
+    if not items:
+      return f"<{match.group(1)}{match.group(2)}>" + "".join((f'<item quantity="{quantities[index]}">' if quantities else "<item>") + f"{AndroidXmlFile.__escape(item)}</item>" for index, item in enumerate(value)) + f"</{match.group(1)}>"
+    gaps = [inner[item.end():next_item.start()] for item, next_item in zip(items, items[1:])] or [""]
+    parts = [inner[:items[0].start()]]
+    for index, item in enumerate(value):
+      if index > 0:
+        parts.append(gaps[min(index, len(gaps)) - 1])
+      head = items[min(index, len(items) - 1)].group(1)
+      if quantities:
+        head = AndroidXmlFile.__QUANTITY_PATTERN.sub(lambda quantity_match: f"{quantity_match.group(1)}{quantity_match.group(2)}{quantities[index]}{quantity_match.group(2)}", head)
+      parts.append(f"{head}>{AndroidXmlFile.__escape(item)}</item>")
+    parts.append(inner[items[-1].end():])
+    return f"<{match.group(1)}{match.group(2)}>" + "".join(parts) + f"</{match.group(1)}>"
+
+  @staticmethod
+  def __with_target_quantities(document: LocaleDocument, key: str, value: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Spread the translated items of a plurals resource over the quantities of the target language.
+
+    :param document: The document of the target file.
+    :param key: The name of the plurals resource.
+    :param value: The translated items, one per quantity of the plurals resource of the source file.
+    :return: The items along with their quantity, or the given items and None if the quantities of the source file or of the target language are unknown.
+    """
+    source_data = document.properties.get("source")
+    source_text = source_data.original_text(key) if isinstance(source_data, LocaleDocument) else None
+    source_quantities = [AndroidXmlFile.__attributes(item.group(1)).get("quantity") for item in AndroidXmlFile.__ITEM_PATTERN.finditer(source_text or "")]
+    quantities = PluralRules.categories(document.properties.get("language"))
+    if quantities is None or len(source_quantities) != len(value) or None in source_quantities:
+      return value, None
+    translations = dict(zip(source_quantities, value))
+    return [translations.get(quantity, translations.get("other", value[-1])) for quantity in quantities], list(quantities)
+
+  @staticmethod
+  def __attributes(text: str) -> dict[str, str]:
+    """
+    Parse the attributes of an element.
+
+    :param text: The attributes of the element, as written in its start tag.
+    :return: The values of the attributes, keyed by name.
+    """
+    return { match.group(1): match.group(2) if match.group(2) is not None else match.group(3) for match in AndroidXmlFile.__ATTRIBUTE_PATTERN.finditer(text) }
+
+  @staticmethod
+  def __unescape(text: str) -> str:
+    """
+    Unescape the content of a resource outside of its markup, removing the double quotes around it.
+
+    :param text: The XML content of the resource.
+    :return: The value of the resource.
+    """
+    if len(text) >= 2 and text.startswith('"') and text.endswith('"') and not text.endswith('\\"'):
+      text = text[1:-1]
+    parts = AndroidXmlFile.__TAG_PATTERN.split(text)
+    for index in range(0, len(parts), 2):
+      parts[index] = AndroidXmlFile.__ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1)[1:], 16)) if len(match.group(1)) == 5 else AndroidXmlFile.__ESCAPES.get(match.group(1), match.group(1)), parts[index])
+    return "".join(parts)
+
+  @staticmethod
+  def __escape(text: str) -> str:
+    """
+    Escape a value as the content of a resource outside of its markup.
+
+    :param text: The value.
+    :return: The XML content of the resource.
+    """
+    parts = AndroidXmlFile.__TAG_PATTERN.split(text)
+    for index in range(0, len(parts), 2):
+      parts[index] = parts[index].replace("\\", "\\\\").replace("\n", "\\n").replace("\t", "\\t").replace("'", "\\'").replace('"', '\\"')
+    escaped_text = "".join(parts)
+    return "\\" + escaped_text if escaped_text[:1] in ("@", "?") else escaped_text
@@ -0,0 +1,207 @@
+import json
+import re
+
+from .base import BaseFile
+from .document import LocaleDocument
+
+class ArbFile(BaseFile):
+  """
+  Class to handle Flutter Application Resource Bundle files, like `lib/l10n/app_en.arb`.
+
+  Messages are keyed by name. A message with plural or select arguments, like `{count, plural, =0{No items} other{{count} items}}`, is the list of the texts of its branches and of the texts around its arguments, so that their selectors are not translated, and its ICU structure is kept apart to write it back. The attributes of the file and of the messages, like `@@locale` or `@name`, are not translated, and are written back next to their message.
+  A file is written with the indentation it was read with.
+  """
+  __INDENT_PATTERN = re.compile(r"\n([ \t]+)\S")
+  __SELECT_PATTERN = re.compile(r"\{\s*[A-Za-z0-9_]+\s*,\s*(?:plural|selectordinal|select)\s*,")
+  __BRANCH_PATTERN = re.compile(r"\s*(?:offset\s*:\s*\d+\s+)?(?:=\d+|[A-Za-z_][\w-]*)\s*\{")
+  __END_PATTERN = re.compile(r"\s*\}")
+
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the messages of an ARB file.
+
+    :param file_path: The path to the ARB file to read.
+    :raise ParseError: If the file cannot be parsed as ARB.
+    :return: The messages, keyed by name.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      content = file.read()
+    try:
+      items = json.loads(content) if content.strip() else {}
+    except json.JSONDecodeError as error:
+      raise BaseFile.ParseError from error
+    if not isinstance(items, dict):
+      raise BaseFile.ParseError("Expected an object at the root of the ARB file")
+    match = ArbFile.__INDENT_PATTERN.search(content)
+    document = LocaleDocument(attributes={}, indent=match.group(1) if match else "  ", structures={})
+    for key, value in items.items():
+      if key.startswith("@"):
+        document.properties["attributes"][key] = value
+      elif isinstance(value, str):
+        parts = ArbFile.__split(value)
+        if parts is not None:
+          document.properties["structures"][key] = parts
+        document.add_message(key, value if parts is None else parts[1::2], None)
+    return document
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the messages to an ARB file, unless it already has these contents.
+
+    The attributes of the file come first, then each message followed by its attributes, then the attributes of the messages that are not in the file. A plural or select message whose ICU structure is unknown is left out rather than written broken.
+
+    :param file_path: The path to the ARB file to write.
+    :param data: The messages to write, as returned by read or prepare_target.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    document = data if isinstance(data, LocaleDocument) else ArbFile.prepare_target(data, {}, "")
+    attributes = document.properties["attributes"]
+    content = { key: value for key, value in attributes.items() if key.startswith("@@") }
+    for key, value in document.items():
+      message = ArbFile.__join(document, key, value) if isinstance(value, list) else value
+      if message is not None:
+        content[key] = message
+        if f"@{key}" in attributes:
+          content[f"@{key}"] = attributes[f"@{key}"]
+    content.update((key, value) for key, value in attributes.items() if key not in content)
+    return ArbFile._write_if_changed(file_path, json.dumps(content, indent=document.properties["indent"], ensure_ascii=False) + "\n")
+
+  @staticmethod
+  def prepare_target(target_data: dict, source_data: dict, target_language: str) -> dict:
+    """
+    Prepare the contents of a target ARB file, so that its translated plural and select messages get the ICU structure of the source file. A new target file gets its `@@locale` attribute.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param source_data: The contents of the source file.
+    :param target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
+    """
+    if isinstance(target_data, LocaleDocument):
+      document = target_data
+    else:
+      document = LocaleDocument(attributes={ "@@locale": ArbFile._locale(target_language) } if target_language else {}, indent=source_data.properties["indent"] if isinstance(source_data, LocaleDocument) else "  ", structures={})
+      document.update(target_data)
+    document.properties["source"] = source_data
+    return document
+
+  # --- Protected methods ---
+
+  @staticmethod
+  def _extension() -> str:
+    """
+    Get the file extension for ARB files.
+
+    :return: The file extension for ARB files.
+    """
+    return "arb"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __split(message: str) -> list[str]:
+    """
+    Split a message with plural or select arguments into its ICU structure and its texts.
+
+    The texts are the branches of the arguments and the text around them, without their surrounding whitespace. The simple arguments, like `{count}`, and the `#` of the plural branches stay in the texts.
+
+    :param message: The message.
+    :return: The parts of the message, alternately its structure and its texts, starting and ending with its structure, or None if the message has no plural or select argument or is not valid ICU.
+    """
+    if ArbFile.__SELECT_PATTERN.search(message) is None:
+      return None
+    parts = [""]
+    try:
+      ArbFile.__parse(message, 0, parts, is_branch=False)
+    except ValueError:
+      return None
+    return parts
+
+  @staticmethod
+  def __parse(message: str, position: int, parts: list[str], is_branch: bool) -> int:
+    """
+    Parse a message, or the branch of a plural or select argument, adding its structure and its texts to the parts.
+
+    :param message: The message.
+    :param position: The position to parse from.
+    :param parts: The parts parsed so far, ending with structure.
+    :param is_branch: Whether to parse a branch, up to its closing brace.
+    :raise ValueError: If the message is not valid ICU.
+    :return: The position of the closing brace of the branch, or the length of the message.
+    """
+    text_start = position
+    while position < len(message):
+      if message[position] == "}":
+        if not is_branch:
+          raise ValueError("Unexpected closing brace")
+        ArbFile.__add_text(parts, message[text_start:position])
+        return position
+      if message[position] != "{":
+        position += 1
+        continue
+      select_match = ArbFile.__SELECT_PATTERN.match(message, position)
+      if select_match is None:
+        # A simple argument, like {count} or {amount, number, currency}, stays in the text
+        depth = 0
+        for position in range(position, len(message)):
+          depth += { "{": 1, "}": -1 }.get(message[position], 0)
+          if depth == 0:
+            break
+        if depth != 0:
+          raise ValueError("Unclosed argument")
+        position += 1
+        continue
+      ArbFile.__add_text(parts, message[text_start:position])
+      parts[-1] += select_match.group(0)
+      position = select_match.end()
+      while (end_match := ArbFile.__END_PATTERN.match(message, position)) is None:
+        branch_match = ArbFile.__BRANCH_PATTERN.match(message, position)
+        if branch_match is None:
+          raise ValueError("Expected a branch")
+        parts[-1] += branch_match.group(0)
+        position = ArbFile.__parse(message, branch_match.end(), parts, is_branch=True)
+        parts[-1] += "}"
+        position += 1
+      parts[-1] += end_match.group(0)
+      position = end_match.end()
+      text_start = position
+    if is_branch:
+      raise ValueError("Unclosed branch")
+    ArbFile.__add_text(parts, message[text_start:])
+    return position
+
+  @staticmethod
+  def __add_text(parts: list[str], text: str) -> None:
+    """
+    Add a text to the parts of a message, its surrounding whitespace going to the structure.
+
+    :param parts: The parts of the message, ending with structure.
+    :param text: The text.
+    """
+    stripped_text = text.strip()
+    if not stripped_text:
+      parts[-1] += text
+      return
+    parts[-1] += text[:len(text) - len(text.lstrip())]
+    parts.extend([stripped_text, text[len(text.rstrip()):]])
+
+  @staticmethod
+  def __join(document: LocaleDocument, key: str, texts: list[str]) -> str:
+    """
+    Join the texts of a plural or select message with its ICU structure, the one of the target file while the texts are unchanged, or else the one of the source file they were translated from.
+
+    :param document: The document of the target file.
+    :param key: The name of the message.
+    :param texts: The texts of the message.
+    :return: The message, or None if neither structure has as many texts.
+    """
+    source_data = document.properties.get("source")
+    target_parts = document.properties["structures"].get(key)
+    source_parts = source_data.properties["structures"].get(key) if isinstance(source_data, LocaleDocument) else None
+    candidates = [target_parts] if target_parts is not None and target_parts[1::2] == texts else []
+    candidates += [parts for parts in (source_parts, target_parts) if parts is not None and len(parts) == 2 * len(texts) + 1]
+    if not candidates:
+      return None
+    structure = candidates[0][0::2]
+    return structure[0] + "".join(text + part for text, part in zip(texts, structure[1:]))
@@ -1,5 +1,13 @@
+import copy
+import filecmp
+import fnmatch
 import os
 import glob
+import shutil
+import uuid
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .key_index import KeyIndex
 
 class BaseFile:
   """
@@ -13,33 +21,97 @@ class BaseFile:
     raise NotImplementedError
 
   @staticmethod
-  def write(_file_path: str, _data: dict) -> None:
+  def write(_file_path: str, _data: dict) -> bool:
     raise NotImplementedError
 
+  @classmethod
+  def read_source(cls, file_path: str) -> dict:
+    """
+    Read the contents of a source file.
+
+    The values of a source file are the texts to translate, which bilingual formats hold apart from the translations, like the msgid of gettext or the source of XLIFF.
+
+    :param file_path: The path to the source file to read.
+    :raise ParseError: If the file cannot be parsed.
+    :return: The contents of the source file.
+    """
+    return cls.read(file_path)
+
   @staticmethod
-  def touch(file_path: str) -> None:
+  def prepare_target(target_data: dict, _source_data: dict, _target_language: str) -> dict:
     """
-    Create an empty file at the given path.
+    Prepare the contents of a target file to receive the translations of a source file.
 
-    :param file_path: The path to the file to create.
+    Formats keeping more than the values, like comments or the source texts, take them from the source file for the keys that the target file does not have yet.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param _source_data: The contents of the source file, as returned by read_source.
+    :param _target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
     """
-    BaseFile._ensure_directories_exist(file_path)
-    with open(file_path, "w"):
-      pass
+    return target_data
+
+  @staticmethod
+  def read_values(_file_path: str) -> Iterator[tuple[tuple, object]]:
+    raise NotImplementedError
+
+  @staticmethod
+  def write_values(_file_path: str, _values: Iterable[tuple[tuple, object]], _should_replace: Callable[[], bool] = None) -> bool:
+    raise NotImplementedError
+
+  @staticmethod
+  def supports_streaming() -> bool:
+    """
+    Check if the files can be read and written as streams of values with read_values and write_values.
+
+    :return: True if the files can be streamed, False otherwise.
+    """
+    return False
 
   @classmethod
-  def files_matching_path(cls, path: str) -> list[str]:
+  def discover_files(cls, path: str, ignore_patterns: list[str] = None) -> dict[str, tuple[int, int]]:
     """
-    Get a list of files that match the given path.
+    Get the files that match the given path, along with their fingerprint.
+
+    A directory is walked with os.scandir, in sorted order, for the files with the extension of the file type. Hidden files and directories are skipped, as glob does, and so are the files and directories matching an ignore pattern, without walking the ignored directories.
+    Any other path is expanded with glob.
 
     :param path: The path to the file(s) to get.
-    :return: A list of files that match the given path.
+    :param ignore_patterns: The fnmatch patterns of the files and directories to leave out, matched against their name and their path relative to the given path, like `node_modules` or `legacy/*`.
+    :return: The modification time in nanoseconds and the size of each file, keyed by path.
     """
-    if os.path.isdir(path):
-      if path.endswith("/"):
-        return glob.glob(f"{path}**/*.{cls._extension()}", recursive=True)
-      return glob.glob(f"{path}/**/*.{cls._extension()}", recursive=True)
-    return glob.glob(path)
+    ignore_patterns = ignore_patterns or []
+    if not os.path.isdir(path):
+      return { file_path: BaseFile.fingerprint(file_path) for file_path in sorted(glob.glob(path)) if os.path.isfile(file_path) and not BaseFile.__is_ignored(os.path.basename(file_path), file_path, ignore_patterns) }
+    files = {}
+    suffix = f".{cls._extension()}"
+    directories = [path]
+    while directories:
+      directory = directories.pop()
+      with os.scandir(directory) as iterator:
+        entries = sorted(iterator, key=lambda entry: entry.name)
+      subdirectories = []
+      for entry in entries:
+        if entry.name.startswith(".") or BaseFile.__is_ignored(entry.name, os.path.relpath(entry.path, path), ignore_patterns):
+          continue
+        if entry.is_dir():
+          subdirectories.append(entry.path)
+        elif entry.name.endswith(suffix) and entry.is_file():
+          stat = entry.stat()
+          files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+      directories.extend(reversed(subdirectories))
+    return files
+
+  @staticmethod
+  def fingerprint(file_path: str) -> tuple[int, int]:
+    """
+    Get the fingerprint of a file, which changes when the file is modified.
+
+    :param file_path: The path to the file.
+    :return: The modification time in nanoseconds and the size of the file.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
 
   @staticmethod
   def file_exists(file_path: str) -> bool:
@@ -52,35 +124,17 @@ class BaseFile:
     return os.path.exists(file_path)
 
   @staticmethod
-  def find_missing_keys(source_dict: dict, target_dict: dict, current_key_path: list[str] = []) -> list[str]:
+  def find_missing_keys(source_dict: dict, target_dict: dict) -> list[list[str]]:
     """
     Find the keys that are missing in the target dictionary compared to the source dictionary.
 
-    Works recursively to find missing keys in nested dictionaries.
+    Works on nested dictionaries, see KeyIndex.missing_key_paths.
 
     :param source_dict: The source dictionary to compare.
     :param target_dict: The target dictionary to compare.
-    :param current_key_path: The current key path.
     :return: A list of keys that are missing in the target dictionary.
     """
-    missing_keys = []
-    if type(target_dict) != dict:
-      for nested_key in BaseFile.__get_nested_keys(source_dict):
-        missing_keys.append(current_key_path + nested_key)
-      return missing_keys
-    for key, value in source_dict.items():
-      if value is None:
-        continue
-
-      if type(value) == dict:
-          missing_keys.extend(BaseFile.find_missing_keys(value, target_dict.get(key, {}), current_key_path + [key]))
-      else:
-        if key not in target_dict:
-          missing_keys.append(current_key_path + [key])
-        else:
-          if type(value) != type(target_dict[key]):
-            missing_keys.append(current_key_path + [key])
-    return missing_keys
+    return [list(key_path) for key_path in KeyIndex(source_dict).missing_key_paths(KeyIndex(target_dict))]
 
   @staticmethod
   def prune_useless_keys(object: dict, model_object: dict) -> dict:
@@ -91,15 +145,9 @@ class BaseFile:
     :param model_object: The model object to use for pruning.
     :return: The dictionary with the keys pruned.
     """
-    pruned_data = {}
-    for key, value in object.items():
-      if key not in model_object:
-        continue
-      if type(value) == dict:
-        pruned_data[key] = BaseFile.prune_useless_keys(value, model_object[key])
-      else:
-        pruned_data[key] = value
-    return pruned_data
+    index = KeyIndex(copy.deepcopy(object))
+    index.prune(KeyIndex(model_object))
+    return index.data()
 
   # --- Protected methods ---
 
@@ -107,6 +155,18 @@ class BaseFile:
   def _extension() -> str:
     raise NotImplementedError
 
+  @staticmethod
+  def _locale(language: str, separator: str = "_") -> str:
+    """
+    Get the locale code of a language as locale files name it, like `pt_BR` for `PT-BR`.
+
+    :param language: The language, as the translation APIs name it.
+    :param separator: The separator between the language and the region.
+    :return: The locale code.
+    """
+    parts = language.replace("_", "-").split("-")
+    return separator.join([parts[0].lower()] + [part.upper() if len(part) == 2 else part.title() for part in parts[1:]])
+
   @staticmethod
   def _ensure_directories_exist(file_path: str) -> None:
     """
@@ -120,20 +180,94 @@ class BaseFile:
       os.makedirs(directories, exist_ok=True)
 
   @staticmethod
-  def __get_nested_keys(object: dict) -> list[str]:
+  def _write_if_changed(file_path: str, content: str) -> bool:
+    """
+    Atomically write content to a file, unless the file already has this exact content.
+
+    The content is written to a temporary file in the same directory, which then replaces the file.
+
+    :param file_path: The path to the file to write.
+    :param content: The content to write.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    if os.path.exists(file_path):
+      with open(file_path, "r") as file:
+        if file.read() == content:
+          return False
+    return BaseFile.__write_atomically(file_path, lambda file: file.write(content))
+
+  @staticmethod
+  def _write_stream_if_changed(file_path: str, write: Callable[[TextIO], None], should_replace: Callable[[], bool] = None) -> bool:
+    """
+    Atomically write a stream of content to a file, unless the file already has this exact content.
+
+    The content is written to a temporary file in the same directory, which is then compared to the file chunk by chunk, so that the content is never held in memory.
+
+    :param file_path: The path to the file to write.
+    :param write: The function writing the content to the given file object.
+    :param should_replace: The function telling, once the content is written, whether it should replace the file, if any.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    return BaseFile.__write_atomically(file_path, write, skip_if_unchanged=True, should_replace=should_replace)
+
+  @staticmethod
+  def _common_prefix_length(key_path: tuple, other_key_path: tuple) -> int:
+    """
+    Get the number of leading keys two key paths have in common.
+
+    :param key_path: The first key path.
+    :param other_key_path: The second key path.
+    :return: The number of leading keys in common.
+    """
+    length = 0
+    for key, other_key in zip(key_path, other_key_path):
+      if key != other_key:
+        break
+      length += 1
+    return length
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __is_ignored(name: str, relative_path: str, ignore_patterns: list[str]) -> bool:
+    """
+    Check if a file or directory matches one of the ignore patterns.
+
+    :param name: The name of the file or directory.
+    :param relative_path: The path of the file or directory, relative to the walked directory.
+    :param ignore_patterns: The fnmatch patterns of the files and directories to leave out.
+    :return: True if the file or directory is ignored, False otherwise.
     """
-    Get the nested keys for a dictionary.
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in ignore_patterns)
 
-    :param object: The dictionary to get the nested keys for.
-    :return: A list of nested keys.
+  @staticmethod
+  def __write_atomically(file_path: str, write: Callable[[TextIO], None], skip_if_unchanged: bool = False, should_replace: Callable[[], bool] = None) -> bool:
     """
-    keys = []
-    if type(object) != dict:
-      return keys
-    for key, value in object.items():
-      if type(value) == dict:
-        for nested_key in BaseFile.__get_nested_keys(value):
-          keys.append([key, *nested_key])
-      else:
-        keys.append([key])
-    return keys
+    Write a file through a temporary file in the same directory, which then replaces the file.
+
+    :param file_path: The path to the file to write.
+    :param write: The function writing the content to the given file object.
+    :param skip_if_unchanged: Whether to leave the file untouched when the temporary file has the same content.
+    :param should_replace: The function telling, once the content is written, whether it should replace the file, if any.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    BaseFile._ensure_directories_exist(file_path)
+    directory, file_name = os.path.split(file_path)
+    temporary_file_path = os.path.join(directory, f".{file_name}.{uuid.uuid4().hex}.tmp")
+    try:
+      with open(temporary_file_path, "x") as file:
+        write(file)
+      if should_replace is not None and not should_replace():
+        os.remove(temporary_file_path)
+        return False
+      if os.path.exists(file_path):
+        if skip_if_unchanged and filecmp.cmp(file_path, temporary_file_path, shallow=False):
+          os.remove(temporary_file_path)
+          return False
+        shutil.copymode(file_path, temporary_file_path)
+      os.replace(temporary_file_path, file_path)
+    except BaseException:
+      if os.path.exists(temporary_file_path):
+        os.remove(temporary_file_path)
+      raise
+    return True
@@ -0,0 +1,73 @@
+from typing import Callable
+
+class LocaleDocument(dict):
+  """
+  Messages of a locale file keyed by message key, remembering the text of the file around and for each message, so that the file can be written back with its comments and formatting intact.
+
+  A message whose value did not change since the file was read is written back with its original text, while the other ones are rendered again. The new messages are rendered after the existing ones, before the footer of the file.
+  Plural messages are lists of their plural forms, so that a target language with other plural forms than the source language does not miss any key.
+  The format-specific properties of the file, like its languages or its number of plural forms, are kept in properties.
+  """
+  def __init__(self, footer: str = "", **properties) -> None:
+    super().__init__()
+    self.footer = footer
+    self.properties = properties
+    self.__segments = []
+    self.__originals = {}
+
+  def add_text(self, text: str) -> None:
+    """
+    Add text that is not a message, like a comment or a header, written back as is.
+
+    :param text: The text.
+    """
+    if text:
+      self.__segments.append(text)
+
+  def add_message(self, key: str, value, text: str) -> None:
+    """
+    Add a message read from the file. A message whose key was already read is kept as text, so that only the first one is translated.
+
+    :param key: The key of the message.
+    :param value: The value of the message, None if it has no translation yet.
+    :param text: The text of the message in the file.
+    """
+    if key in self.__originals:
+      self.add_text(text)
+      return
+    self[key] = value
+    self.__segments.append((key,))
+    self.__originals[key] = (text, list(value) if isinstance(value, list) else value)
+
+  def original_text(self, key: str) -> str:
+    """
+    Get the text of a message as it was read from the file.
+
+    :param key: The key of the message.
+    :return: The text of the message, or None if the message was not read from the file.
+    """
+    return self.__originals[key][0] if key in self.__originals else None
+
+  def render(self, render_message: Callable[[str, object], str], separator: str) -> str:
+    """
+    Render the document, keeping the original text of the unchanged messages and of everything else.
+
+    :param render_message: The function rendering a message from its key and its value.
+    :param separator: The text put before each new message, unless it starts the document.
+    :return: The text of the document.
+    """
+    parts = []
+    for segment in self.__segments:
+      if isinstance(segment, str):
+        parts.append(segment)
+      elif segment[0] in self:
+        text, value = self.__originals[segment[0]]
+        parts.append(text if self[segment[0]] == value else render_message(segment[0], self[segment[0]]))
+      elif parts and parts[-1].isspace():
+        # The whitespace separating a removed message from the previous one goes along with it
+        parts.pop()
+    for key, value in self.items():
+      if key not in self.__originals and value is not None:
+        parts.append((separator if parts else "") + render_message(key, value))
+    parts.append(self.footer)
+    return "".join(parts)
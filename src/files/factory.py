@@ -1,5 +1,10 @@
-from .yaml import YamlFile
+from .yaml import YamlFile, FastYamlFile, RoundTripYamlFile
 from .json import JsonFile
+from .po import PoFile
+from .android import AndroidXmlFile
+from .strings import StringsFile
+from .arb import ArbFile
+from .xliff import XliffFile
 
 class FileFactory:
   """
@@ -9,15 +14,32 @@ class FileFactory:
     pass
 
   @staticmethod
-  def for_type(file_type: str):
+  def for_type(file_type: str, yaml_mode: str = "default"):
     """
     Factory method to create the appropriate file object based on the file type
 
     :param file_type: The type of file to create
+    :param yaml_mode: The way YAML files are handled: "default", "fast" or "round_trip"
     :return: The appropriate file object
     """
     if file_type == "yaml" or file_type == "yml":
-      return YamlFile
+      if yaml_mode == "fast":
+        return FastYamlFile
+      if yaml_mode == "round_trip":
+        return RoundTripYamlFile
+      if yaml_mode == "default":
+        return YamlFile
+      raise FileFactory.UnsupportedFileException(f"YAML mode {yaml_mode} is not supported")
     if file_type == "json":
       return JsonFile
+    if file_type == "po":
+      return PoFile
+    if file_type == "android":
+      return AndroidXmlFile
+    if file_type == "strings":
+      return StringsFile
+    if file_type == "arb":
+      return ArbFile
+    if file_type == "xliff" or file_type == "xlf":
+      return XliffFile
     raise FileFactory.UnsupportedFileException(f"File type {file_type} is not supported")
@@ -1,4 +1,7 @@
 import json
+import re
+from json.encoder import encode_basestring_ascii
+from typing import Callable, Iterable, Iterator, TextIO
 
 from .base import BaseFile
 
@@ -6,6 +9,11 @@ class JsonFile(BaseFile):
   """
   Class to handle JSON files.
   """
+  __STREAM_CHUNK_SIZE = 64 * 1024
+  __WHITESPACE_PATTERN = re.compile(r"[ \t\n\r]*")
+  __VALUE_DELIMITERS = " \t\n\r,:]}"
+  __INDENT = "  "
+
   @staticmethod
   def read(file_path: str) -> dict:
     """
@@ -25,27 +33,50 @@ class JsonFile(BaseFile):
         raise BaseFile.ParseError from error
 
   @staticmethod
-  def write(file_path: str, data: dict) -> None:
+  def write(file_path: str, data: dict) -> bool:
     """
-    Write the contents to a JSON file.
+    Write the contents to a JSON file, unless it already has these contents.
 
     :param file_path: The path to the JSON file to write.
     :param data: The data to write to the JSON file.
+    :return: True if the file was written, False if it was left untouched.
     """
-    JsonFile._ensure_directories_exist(file_path)
-    with open(file_path, "w") as file:
-      json.dump(data, file, indent=2)
+    return JsonFile._write_if_changed(file_path, json.dumps(data, indent=2))
 
   @staticmethod
-  def touch(file_path: str) -> None:
+  def read_values(file_path: str) -> Iterator[tuple[tuple, object]]:
     """
-    Create an empty JSON file at the given path.
+    Read the values of a JSON file one by one, without loading the whole file.
+
+    Objects are walked key by key, while the other values, like lists, are decoded as a whole.
 
-    :param file_path: The path to the JSON file to create.
+    :param file_path: The path to the JSON file to read.
+    :raise ParseError: If the file cannot be parsed as JSON.
+    :return: A generator of the key path and the value of each non-null value, in the order of the file.
     """
-    JsonFile._ensure_directories_exist(file_path)
-    with open(file_path, "w") as file:
-      json.dump({}, file, indent=2)
+    with open(file_path, "r") as file:
+      yield from JsonFile.__iterate_values(file)
+
+  @staticmethod
+  def write_values(file_path: str, values: Iterable[tuple[tuple, object]], should_replace: Callable[[], bool] = None) -> bool:
+    """
+    Write a stream of values to a JSON file, formatted as write does, unless it already has these contents.
+
+    :param file_path: The path to the JSON file to write.
+    :param values: The key path and the value of each value, with the values of a same object next to each other.
+    :param should_replace: The function telling, once the values are written, whether they should replace the file, if any.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    return JsonFile._write_stream_if_changed(file_path, lambda file: JsonFile.__write_values(file, values), should_replace=should_replace)
+
+  @staticmethod
+  def supports_streaming() -> bool:
+    """
+    Check if JSON files can be streamed.
+
+    :return: True.
+    """
+    return True
 
   # --- Protected methods ---
 
@@ -57,3 +88,121 @@ class JsonFile(BaseFile):
     :return: The file extension for JSON files.
     """
     return "json"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __iterate_values(file: TextIO) -> Iterator[tuple[tuple, object]]:
+    """
+    Iterate over the values of a JSON document read from a file, holding at most a chunk of the file along with the value being decoded.
+
+    :param file: The file to read.
+    :raise ParseError: If the file cannot be parsed as JSON.
+    :return: A generator of the key path and the value of each non-null value.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    is_end_of_file = False
+
+    def read_more() -> None:
+      nonlocal buffer, position, is_end_of_file
+      chunk = file.read(JsonFile.__STREAM_CHUNK_SIZE)
+      is_end_of_file = not chunk
+      buffer = buffer[position:] + chunk
+      position = 0
+
+    def next_character() -> str:
+      nonlocal position
+      while True:
+        position = JsonFile.__WHITESPACE_PATTERN.match(buffer, position).end()
+        if position < len(buffer) or is_end_of_file:
+          return buffer[position:position + 1]
+        read_more()
+
+    def expect(characters: str) -> str:
+      nonlocal position
+      character = next_character()
+      if not character or character not in characters:
+        raise BaseFile.ParseError(f"Expected one of '{characters}' at character {position} of the current chunk, found '{character}'")
+      position += 1
+      return character
+
+    def decode_value():
+      nonlocal position
+      next_character()
+      while True:
+        try:
+          value, end = decoder.raw_decode(buffer, position)
+          if is_end_of_file or (end < len(buffer) and buffer[end] in JsonFile.__VALUE_DELIMITERS):
+            position = end
+            return value
+        except json.JSONDecodeError as error:
+          if is_end_of_file:
+            raise BaseFile.ParseError from error
+        read_more()
+
+    if not next_character():
+      return
+    if buffer.startswith("null", position):
+      decode_value()
+      return
+    expect("{")
+    key_path = ()
+    if next_character() == "}":
+      position += 1
+      return
+    while True:
+      key = decode_value()
+      if not isinstance(key, str):
+        raise BaseFile.ParseError(f"Expected a key, found {key!r}")
+      expect(":")
+      if next_character() == "{":
+        position += 1
+        if next_character() != "}":
+          key_path += (key,)
+          continue
+        position += 1
+      else:
+        value = decode_value()
+        if value is not None:
+          yield key_path + (key,), value
+      while expect(",}") == "}":
+        if not key_path:
+          if next_character():
+            raise BaseFile.ParseError("Unexpected content after the end of the JSON document")
+          return
+        key_path = key_path[:-1]
+
+  @staticmethod
+  def __write_values(file: TextIO, values: Iterable[tuple[tuple, object]]) -> None:
+    """
+    Write a stream of values to a file as a JSON document indented by 2 spaces.
+
+    :param file: The file to write to.
+    :param values: The key path and the value of each value, with the values of a same object next to each other.
+    """
+    open_key_path = []
+    has_items = [False]
+    file.write("{")
+    for key_path, value in values:
+      parent_key_path = key_path[:-1]
+      common_prefix_length = JsonFile._common_prefix_length(open_key_path, parent_key_path)
+      while len(open_key_path) > common_prefix_length:
+        file.write("\n" + JsonFile.__INDENT * len(open_key_path) + "}")
+        open_key_path.pop()
+        has_items.pop()
+      for key in parent_key_path[common_prefix_length:]:
+        file.write(("," if has_items[-1] else "") + "\n" + JsonFile.__INDENT * (len(open_key_path) + 1) + json.dumps(key) + ": {")
+        has_items[-1] = True
+        open_key_path.append(key)
+        has_items.append(False)
+      indentation = JsonFile.__INDENT * (len(open_key_path) + 1)
+      encoded_value = encode_basestring_ascii(value) if type(value) is str else json.dumps(value, indent=2).replace("\n", "\n" + indentation)
+      file.write(("," if has_items[-1] else "") + "\n" + indentation + json.dumps(key_path[-1]) + ": " + encoded_value)
+      has_items[-1] = True
+    while open_key_path:
+      file.write("\n" + JsonFile.__INDENT * len(open_key_path) + "}")
+      open_key_path.pop()
+      has_items.pop()
+    file.write("\n}" if has_items[0] else "}")
@@ -0,0 +1,139 @@
+import sys
+
+class KeyIndex:
+  """
+  Flattened index of the key paths of a document, built in a single pass over the document.
+
+  Key paths are tuples of interned keys. Values are indexed by key path, and so are the nested dictionaries holding them, so that looking up, inserting and pruning a key does not walk the document again.
+  """
+  def __init__(self, data: dict) -> None:
+    self.__containers = { (): data }
+    self.__values = {}
+    stack = [((), iter(data.items()))]
+    while stack:
+      key_path, items = stack[-1]
+      for key, value in items:
+        child_key_path = key_path + (KeyIndex.__intern(key),)
+        if isinstance(value, dict):
+          self.__containers[child_key_path] = value
+          stack.append((child_key_path, iter(value.items())))
+          break
+        if value is not None:
+          self.__values[child_key_path] = value
+      else:
+        stack.pop()
+
+  def data(self) -> dict:
+    """
+    Get the indexed document.
+
+    :return: The indexed document.
+    """
+    return self.__containers[()]
+
+  def values(self) -> dict[tuple, object]:
+    """
+    Get the values of the document, skipping the null ones.
+
+    :return: The values, keyed by key path, in the order of the document.
+    """
+    return self.__values
+
+  def get(self, key_path: tuple):
+    """
+    Get the value at a key path.
+
+    :param key_path: The key path.
+    :return: The value at the key path.
+    """
+    return self.__values[key_path]
+
+  def missing_key_paths(self, target: 'KeyIndex') -> list[tuple]:
+    """
+    Find the key paths of this document that are missing in a target document, or whose value has another kind there.
+
+    :param target: The index of the target document.
+    :return: The missing key paths, in the order of this document.
+    """
+    target_values = target.__values
+    return [key_path for key_path, value in self.__values.items() if key_path not in target_values or KeyIndex.kind(value) != KeyIndex.kind(target_values[key_path])]
+
+  def set(self, key_path: tuple, value) -> None:
+    """
+    Set the value at a key path, creating the missing nested dictionaries and replacing the values in the way.
+
+    :param key_path: The key path.
+    :param value: The value to set.
+    """
+    container = self.__containers.get(key_path[:-1])
+    if container is None:
+      container = self.__containers[()]
+      for depth in range(1, len(key_path)):
+        parent_container = container
+        container = self.__containers.get(key_path[:depth])
+        if container is None:
+          self.__values.pop(key_path[:depth], None)
+          container = parent_container[key_path[depth - 1]] = {}
+          self.__containers[key_path[:depth]] = container
+    if key_path in self.__containers:
+      self.__discard_containers(key_path)
+    container[key_path[-1]] = value
+    if value is not None:
+      self.__values[key_path] = value
+
+  def prune(self, model: 'KeyIndex') -> None:
+    """
+    Remove the keys of the document that are not in a model document.
+
+    :param model: The index of the model document.
+    """
+    pruned_key_paths = set()
+    for key_path, container in list(self.__containers.items()):
+      if key_path in pruned_key_paths or (key_path and key_path[:-1] in pruned_key_paths):
+        pruned_key_paths.add(key_path)
+        continue
+      model_container = model.__containers.get(key_path)
+      for key in list(container):
+        if model_container is None or key not in model_container:
+          del container[key]
+          pruned_key_paths.add(key_path + (KeyIndex.__intern(key),))
+    for key_path in pruned_key_paths:
+      self.__containers.pop(key_path, None)
+    self.__values = { key_path: value for key_path, value in self.__values.items() if key_path not in pruned_key_paths and key_path[:-1] not in pruned_key_paths }
+
+  @staticmethod
+  def kind(value) -> type:
+    """
+    Get the kind of a value, so that subclasses of the built-in types (like the ones produced by round-trip parsers) match their base type.
+
+    :param value: The value to get the kind of.
+    :return: The built-in type the value is an instance of, or its own type.
+    """
+    for kind in (dict, list, str, bool, int, float):
+      if isinstance(value, kind):
+        return kind
+    return type(value)
+
+  # --- Private methods ---
+
+  def __discard_containers(self, key_path: tuple) -> None:
+    """
+    Remove a nested dictionary and its descendants from the index, before it is replaced by a value.
+
+    :param key_path: The key path of the nested dictionary.
+    """
+    depth = len(key_path)
+    for indexed_key_path in [indexed_key_path for indexed_key_path in self.__containers if indexed_key_path[:depth] == key_path]:
+      del self.__containers[indexed_key_path]
+    for indexed_key_path in [indexed_key_path for indexed_key_path in self.__values if indexed_key_path[:depth] == key_path]:
+      del self.__values[indexed_key_path]
+
+  @staticmethod
+  def __intern(key):
+    """
+    Intern a key, so that the key paths sharing it share the same string.
+
+    :param key: The key.
+    :return: The interned key, or the key itself if it is not a string.
+    """
+    return sys.intern(key) if type(key) is str else key
@@ -0,0 +1,81 @@
+class PluralRules:
+  """
+  Plural rules of the target languages, as the CLDR and gettext define them.
+
+  The CLDR categories of a language, like `one`, `few` or `many`, are the quantities of an Android plurals resource and the branches of an ICU plural message. Gettext numbers the plural forms of a language with its Plural-Forms expression instead, each form standing for one of these categories.
+  A region-specific rule, like `pt-PT`, takes precedence over the rule of its language.
+  """
+  __OTHER = (("other",), "nplurals=1; plural=0;", ("other",))
+  __ONE_OTHER = (("one", "other"), "nplurals=2; plural=(n != 1);", ("one", "other"))
+  __ROMANCE = (("one", "many", "other"), "nplurals=2; plural=(n != 1);", ("one", "other"))
+  __EAST_SLAVIC = (("one", "few", "many", "other"), "nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);", ("one", "few", "many"))
+  __SOUTH_SLAVIC = (("one", "few", "other"), "nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);", ("one", "few", "other"))
+  __WEST_SLAVIC = (("one", "few", "many", "other"), "nplurals=3; plural=(n==1) ? 0 : (n>=2 && n<=4) ? 1 : 2;", ("one", "few", "other"))
+  __RULES = {
+    **dict.fromkeys(("ja", "ko", "zh", "id", "ms", "th", "vi", "lo", "km", "my"), __OTHER),
+    **dict.fromkeys(("en", "de", "nl", "sv", "da", "nb", "nn", "no", "fi", "et", "el", "hu", "bg", "tr", "az", "eu", "gl", "af", "sq", "eo", "ka", "kk", "uz", "sw"), __ONE_OTHER),
+    **dict.fromkeys(("es", "it", "ca", "pt-pt"), __ROMANCE),
+    **dict.fromkeys(("ru", "uk", "be"), __EAST_SLAVIC),
+    **dict.fromkeys(("hr", "sr", "bs"), __SOUTH_SLAVIC),
+    **dict.fromkeys(("cs", "sk"), __WEST_SLAVIC),
+    "fr": (("one", "many", "other"), "nplurals=2; plural=(n > 1);", ("one", "other")),
+    "pt": (("one", "many", "other"), "nplurals=2; plural=(n > 1);", ("one", "other")),
+    "he": (("one", "two", "other"), "nplurals=2; plural=(n != 1);", ("one", "other")),
+    "is": (("one", "other"), "nplurals=2; plural=(n%10!=1 || n%100==11);", ("one", "other")),
+    "mk": (("one", "other"), "nplurals=2; plural=(n==1 || n%10==1 ? 0 : 1);", ("one", "other")),
+    "pl": (("one", "few", "many", "other"), "nplurals=3; plural=(n==1 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);", ("one", "few", "many")),
+    "lt": (("one", "few", "many", "other"), "nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : n%10>=2 && (n%100<10 || n%100>=20) ? 1 : 2);", ("one", "few", "other")),
+    "lv": (("zero", "one", "other"), "nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : n != 0 ? 1 : 2);", ("one", "other", "zero")),
+    "ro": (("one", "few", "other"), "nplurals=3; plural=(n==1 ? 0 : (n==0 || (n%100 > 0 && n%100 < 20)) ? 1 : 2);", ("one", "few", "other")),
+    "sl": (("one", "two", "few", "other"), "nplurals=4; plural=(n%100==1 ? 0 : n%100==2 ? 1 : n%100==3 || n%100==4 ? 2 : 3);", ("one", "two", "few", "other")),
+    "ga": (("one", "two", "few", "many", "other"), "nplurals=5; plural=(n==1 ? 0 : n==2 ? 1 : n<7 ? 2 : n<11 ? 3 : 4);", ("one", "two", "few", "many", "other")),
+    "ar": (("zero", "one", "two", "few", "many", "other"), "nplurals=6; plural=(n==0 ? 0 : n==1 ? 1 : n==2 ? 2 : n%100>=3 && n%100<=10 ? 3 : n%100>=11 ? 4 : 5);", ("zero", "one", "two", "few", "many", "other")),
+  }
+
+  @staticmethod
+  def categories(language: str) -> tuple[str, ...]:
+    """
+    Get the CLDR plural categories of a language.
+
+    :param language: The language, like `PT-BR` or `pl`.
+    :return: The plural categories of the language, in CLDR order, or None if the language is unknown.
+    """
+    rule = PluralRules.__rule(language)
+    return rule[0] if rule else None
+
+  @staticmethod
+  def gettext_plural_forms(language: str) -> str:
+    """
+    Get the gettext Plural-Forms expression of a language.
+
+    :param language: The language, like `PT-BR` or `pl`.
+    :return: The Plural-Forms expression, like `nplurals=2; plural=(n != 1);`, or None if the language is unknown.
+    """
+    rule = PluralRules.__rule(language)
+    return rule[1] if rule else None
+
+  @staticmethod
+  def gettext_categories(language: str) -> tuple[str, ...]:
+    """
+    Get the CLDR plural category each gettext plural form of a language stands for.
+
+    :param language: The language, like `PT-BR` or `pl`.
+    :return: The category of each plural form, in gettext order, or None if the language is unknown.
+    """
+    rule = PluralRules.__rule(language)
+    return rule[2] if rule else None
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __rule(language: str) -> tuple:
+    """
+    Get the plural rule of a language, or of the language of a region-specific language.
+
+    :param language: The language.
+    :return: The CLDR categories, the Plural-Forms expression and the category of each gettext plural form of the language, or None if the language is unknown.
+    """
+    if not language:
+      return None
+    language = language.replace("_", "-").lower()
+    return PluralRules.__RULES.get(language) or PluralRules.__RULES.get(language.split("-")[0])
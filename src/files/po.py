@@ -0,0 +1,283 @@
+import re
+
+from .base import BaseFile
+from .document import LocaleDocument
+from .plural_rules import PluralRules
+
+class PoFile(BaseFile):
+  """
+  Class to handle gettext PO files.
+
+  Messages are keyed by msgid, prefixed by their msgctxt and an EOT character as gettext does. The values of a source file, like a POT template, are the msgid of its messages, while the values of a target file are their msgstr, missing while empty.
+  A plural message is the list of its plural forms, missing while any of them is empty, as gettext does. It is written with the number of plural forms of the header of the target file, each form getting the translation of the singular of the source message when it stands for the `one` plural category, and the translation of its plural otherwise, like the `few` form of Polish.
+  A file is parsed in a single pass over its lines, and written back with its header, its comments, its obsolete messages and the formatting of its unchanged messages, see LocaleDocument.
+  """
+  __CONTEXT_SEPARATOR = "\x04"
+  __DEFAULT_HEADER = 'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n'
+  __KEYWORD_PATTERN = re.compile(r'(msgctxt|msgid_plural|msgid|msgstr(?:\[\d+\])?)\s*"(.*)"\s*$')
+  __CONTINUATION_PATTERN = re.compile(r'"(.*)"\s*$')
+  __ESCAPE_PATTERN = re.compile(r'\\(.)')
+  __LINE_PATTERN = re.compile(r"[^\n]*\n|[^\n]+")
+  __ESCAPES = { "n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v" }
+  __PLURAL_COUNT_PATTERN = re.compile(r"nplurals\s*=\s*(\d+)")
+  __LANGUAGE_PATTERN = re.compile(r'^"Language:.*"$', re.MULTILINE)
+  __PLURAL_FORMS_PATTERN = re.compile(r'^"Plural-Forms:.*"\n?', re.MULTILINE)
+
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the translations of a PO file.
+
+    :param file_path: The path to the PO file to read.
+    :raise ParseError: If the file cannot be parsed as PO.
+    :return: The msgstr of each message, keyed by message key, None for the untranslated ones.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      return PoFile.__parse(file.read(), is_source=False)
+
+  @staticmethod
+  def read_source(file_path: str) -> dict:
+    """
+    Read the texts to translate of a PO or POT file.
+
+    :param file_path: The path to the PO file to read.
+    :raise ParseError: If the file cannot be parsed as PO.
+    :return: The msgid of each message, along with the msgid_plural of the plural ones, keyed by message key.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      return PoFile.__parse(file.read(), is_source=True)
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the translations to a PO file, unless it already has these contents.
+
+    :param file_path: The path to the PO file to write.
+    :param data: The translations to write, as returned by read or prepare_target.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    document = data if isinstance(data, LocaleDocument) else PoFile.prepare_target(data, {}, "")
+    return PoFile._write_if_changed(file_path, document.render(lambda key, value: PoFile.__render_message(document, key, value), separator="\n"))
+
+  @staticmethod
+  def prepare_target(target_data: dict, source_data: dict, target_language: str) -> dict:
+    """
+    Prepare the contents of a target PO file, so that its new messages are written with the comments, the msgctxt and the msgid of the source file.
+
+    A new target file gets the header of the source file, with its language set to the target language and the Plural-Forms of the target language. The Plural-Forms of the source file is left out when the plural rule of the target language is unknown, and a warning asks to set it.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param source_data: The contents of the source file, as returned by read_source.
+    :param target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
+    """
+    if isinstance(target_data, LocaleDocument):
+      document = target_data
+    else:
+      header = source_data.properties["header"] if isinstance(source_data, LocaleDocument) and source_data.properties["header"] else PoFile.__DEFAULT_HEADER
+      header = header.replace("charset=CHARSET", "charset=UTF-8")
+      if target_language:
+        language_line = f'"Language: {PoFile._locale(target_language)}\\n"'
+        header = PoFile.__LANGUAGE_PATTERN.sub(lambda _: language_line, header) if PoFile.__LANGUAGE_PATTERN.search(header) else header.replace('msgstr ""\n', f'msgstr ""\n{language_line}\n', 1)
+        plural_forms = PluralRules.gettext_plural_forms(target_language)
+        header = PoFile.__with_plural_forms(header, plural_forms)
+        if plural_forms is None and isinstance(source_data, dict) and any(isinstance(value, list) for value in source_data.values()):
+          print(f"[Warning] Unknown plural rule for {target_language}, set the Plural-Forms header of its new PO files")
+      document = LocaleDocument(header=header, plural_count=PoFile.__plural_count(header))
+      document.add_text(header)
+      document.update(target_data)
+    categories = PluralRules.gettext_categories(target_language)
+    document.properties["plural_categories"] = categories if categories and len(categories) == document.properties["plural_count"] else None
+    document.properties["source"] = source_data
+    return document
+
+  # --- Protected methods ---
+
+  @staticmethod
+  def _extension() -> str:
+    """
+    Get the file extension for PO files.
+
+    :return: The file extension for PO files.
+    """
+    return "po"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __parse(content: str, is_source: bool) -> LocaleDocument:
+    """
+    Parse the content of a PO file, line by line.
+
+    A message spans its comments and its keywords, and ends before the next comment or msgctxt or msgid following its msgstr, or at the next blank line.
+
+    :param content: The content of the PO file.
+    :param is_source: Whether to read the msgid of the messages instead of their msgstr.
+    :raise ParseError: If the content cannot be parsed as PO.
+    :return: The messages of the file.
+    """
+    document = LocaleDocument(header="", plural_count=None)
+    message_lines = []
+    has_msgstr = False
+    for line in content.splitlines(keepends=True):
+      stripped_line = line.strip()
+      if not stripped_line or (has_msgstr and (stripped_line.startswith("#") or stripped_line.startswith("msgctxt") or stripped_line.startswith("msgid"))):
+        PoFile.__add_message(document, message_lines, is_source)
+        message_lines = []
+        has_msgstr = False
+        if not stripped_line:
+          document.add_text(line)
+          continue
+      message_lines.append(line)
+      has_msgstr = has_msgstr or stripped_line.startswith("msgstr")
+    PoFile.__add_message(document, message_lines, is_source)
+    return document
+
+  @staticmethod
+  def __add_message(document: LocaleDocument, lines: list[str], is_source: bool) -> None:
+    """
+    Add a message to a document, or its lines as text if they are comments only, like obsolete messages, or the header.
+
+    :param document: The document.
+    :param lines: The lines of the message.
+    :param is_source: Whether the value of the message is its msgid instead of its msgstr.
+    :raise ParseError: If the lines cannot be parsed as a PO message.
+    """
+    text = "".join(lines)
+    fields = PoFile.__fields(lines)
+    if "msgid" not in fields:
+      document.add_text(text)
+      return
+    if fields["msgid"] == "" and "msgctxt" not in fields:
+      document.properties["header"] = text
+      document.properties["plural_count"] = PoFile.__plural_count(fields.get("msgstr", ""))
+      document.add_text(text)
+      return
+    key = fields["msgctxt"] + PoFile.__CONTEXT_SEPARATOR + fields["msgid"] if "msgctxt" in fields else fields["msgid"]
+    if is_source:
+      value = [fields["msgid"], fields["msgid_plural"]] if "msgid_plural" in fields else fields["msgid"]
+    elif "msgid_plural" in fields:
+      forms = [fields[keyword] for keyword in sorted((keyword for keyword in fields if keyword.startswith("msgstr[")), key=lambda keyword: int(keyword[7:-1]))]
+      value = forms if forms and all(forms) else None
+    else:
+      value = fields.get("msgstr") or None
+    document.add_message(key, value, text)
+
+  @staticmethod
+  def __fields(lines: list[str]) -> dict[str, str]:
+    """
+    Get the keywords of a message along with their unescaped strings, joining their continuation lines.
+
+    :param lines: The lines of the message.
+    :raise ParseError: If a line is neither a comment, nor a keyword, nor a continuation line.
+    :return: The strings of the message, keyed by keyword.
+    """
+    fields = {}
+    keyword = None
+    for line in lines:
+      stripped_line = line.strip()
+      if stripped_line.startswith("#"):
+        continue
+      if match := PoFile.__KEYWORD_PATTERN.match(stripped_line):
+        keyword = match.group(1)
+        fields[keyword] = PoFile.__unescape(match.group(2))
+      elif keyword is not None and (match := PoFile.__CONTINUATION_PATTERN.match(stripped_line)):
+        fields[keyword] += PoFile.__unescape(match.group(1))
+      else:
+        raise BaseFile.ParseError(f"Unexpected line in PO message: {stripped_line}")
+    return fields
+
+  @staticmethod
+  def __render_message(document: LocaleDocument, key: str, value) -> str:
+    """
+    Render a translated message, from its text in the target file or in the source file without its msgstr and its fuzzy flag.
+
+    :param document: The document of the target file.
+    :param key: The key of the message.
+    :param value: The translation, or the list of translated plural forms.
+    :return: The text of the message.
+    """
+    source_data = document.properties.get("source")
+    text = document.original_text(key)
+    if text is None and isinstance(source_data, LocaleDocument):
+      text = source_data.original_text(key)
+    if text is None:
+      context, _, msgid = key.rpartition(PoFile.__CONTEXT_SEPARATOR) if PoFile.__CONTEXT_SEPARATOR in key else (None, None, key)
+      text = (PoFile.__quote("msgctxt", context) if context is not None else "") + PoFile.__quote("msgid", msgid) + (PoFile.__quote("msgid_plural", msgid) if isinstance(value, list) else "")
+    lines = []
+    is_msgstr = False
+    for line in text.splitlines():
+      stripped_line = line.strip()
+      if stripped_line.startswith("#,"):
+        flags = [flag.strip() for flag in stripped_line[2:].split(",") if flag.strip() and flag.strip() != "fuzzy"]
+        if flags:
+          lines.append("#, " + ", ".join(flags) + "\n")
+        continue
+      if stripped_line.startswith("#|"):
+        continue
+      if not stripped_line.startswith('"'):
+        is_msgstr = stripped_line.startswith("msgstr")
+      if not is_msgstr:
+        lines.append(line + "\n")
+    if not isinstance(value, list):
+      return "".join(lines) + PoFile.__quote("msgstr", value)
+    plural_count = document.properties.get("plural_count") or len(value)
+    categories = document.properties.get("plural_categories") or { 1: ("other",), 2: ("one", "other") }.get(plural_count)
+    if categories and len(value) == 2:
+      # The msgid and the msgid_plural of a message are its singular and its plural
+      translations = { "one": value[0], "other": value[1] }
+      forms = [translations.get(category, translations["other"]) for category in categories]
+    else:
+      forms = [value[min(index, len(value) - 1)] for index in range(plural_count)]
+    return "".join(lines) + "".join(PoFile.__quote(f"msgstr[{index}]", form) for index, form in enumerate(forms))
+
+  @staticmethod
+  def __quote(keyword: str, text: str) -> str:
+    """
+    Render a keyword along with its string, split after each line break as gettext does.
+
+    :param keyword: The keyword.
+    :param text: The string.
+    :return: The lines of the keyword.
+    """
+    escaped_lines = [line.replace("\n", "\\n") for line in PoFile.__LINE_PATTERN.findall(text.replace("\\", "\\\\").replace('"', '\\"').replace("\t", "\\t").replace("\r", "\\r"))]
+    if len(escaped_lines) <= 1:
+      return f'{keyword} "{"".join(escaped_lines)}"\n'
+    return f'{keyword} ""\n' + "".join(f'"{line}"\n' for line in escaped_lines)
+
+  @staticmethod
+  def __unescape(text: str) -> str:
+    """
+    Unescape a C string of a PO file.
+
+    :param text: The escaped string, without its quotes.
+    :return: The string.
+    """
+    return PoFile.__ESCAPE_PATTERN.sub(lambda match: PoFile.__ESCAPES.get(match.group(1), match.group(1)), text)
+
+  @staticmethod
+  def __with_plural_forms(header: str, plural_forms: str) -> str:
+    """
+    Set the Plural-Forms of a header, or remove it.
+
+    :param header: The header.
+    :param plural_forms: The Plural-Forms expression, or None to remove it.
+    :return: The header with the Plural-Forms set.
+    """
+    if plural_forms is None:
+      return PoFile.__PLURAL_FORMS_PATTERN.sub("", header)
+    plural_forms_line = f'"Plural-Forms: {plural_forms}\\n"\n'
+    if PoFile.__PLURAL_FORMS_PATTERN.search(header):
+      return PoFile.__PLURAL_FORMS_PATTERN.sub(lambda _: plural_forms_line, header)
+    return header.rstrip("\n") + "\n" + plural_forms_line
+
+  @staticmethod
+  def __plural_count(header: str) -> int:
+    """
+    Get the number of plural forms declared by a header.
+
+    :param header: The header, or its msgstr.
+    :return: The number of plural forms, or None if the header does not declare it.
+    """
+    match = PoFile.__PLURAL_COUNT_PATTERN.search(header)
+    return int(match.group(1)) if match else None
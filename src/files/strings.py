@@ -0,0 +1,147 @@
+import re
+
+from .base import BaseFile
+from .document import LocaleDocument
+
+class StringsFile(BaseFile):
+  """
+  Class to handle Apple strings files, like `en.lproj/Localizable.strings`.
+
+  Strings are keyed by their key, and their values are unescaped. Files encoded in UTF-16, as older tools write them, are read, and written back in UTF-8.
+  A file is parsed in a single pass over its tokens, and written back with its comments and the formatting of its unchanged strings, see LocaleDocument.
+  """
+  __TOKEN_PATTERN = re.compile(r'\s+|/\*.*?\*/|//[^\n]*|("(?:[^"\\]|\\.)*"|[^\s"=;/]+)\s*=\s*"((?:[^"\\]|\\.)*)"\s*;', re.DOTALL)
+  __ESCAPE_PATTERN = re.compile(r"\\(U[0-9A-Fa-f]{4}|u[0-9A-Fa-f]{4}|.)", re.DOTALL)
+  __ESCAPES = { "n": "\n", "t": "\t", "r": "\r", "0": "\0" }
+
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the strings of a strings file.
+
+    :param file_path: The path to the strings file to read.
+    :raise ParseError: If the file cannot be parsed as a strings file.
+    :return: The strings, keyed by key.
+    """
+    with open(file_path, "rb") as file:
+      content = file.read()
+    encoding = "utf-16" if content.startswith((b"\xff\xfe", b"\xfe\xff")) else "utf-8-sig"
+    try:
+      return StringsFile.__parse(content.decode(encoding))
+    except UnicodeDecodeError as error:
+      raise BaseFile.ParseError from error
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the strings to a strings file, unless it already has these contents.
+
+    :param file_path: The path to the strings file to write.
+    :param data: The strings to write, as returned by read.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    document = data if isinstance(data, LocaleDocument) else StringsFile.prepare_target(data, {}, "")
+    return StringsFile._write_if_changed(file_path, document.render(lambda key, value: StringsFile.__render_string(document, key, value), separator="\n"))
+
+  @staticmethod
+  def prepare_target(target_data: dict, source_data: dict, _target_language: str) -> dict:
+    """
+    Prepare the contents of a target strings file, so that its new strings get the comments of the source file.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param source_data: The contents of the source file.
+    :param _target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
+    """
+    if isinstance(target_data, LocaleDocument):
+      document = target_data
+    else:
+      document = LocaleDocument(footer="\n", comments={})
+      document.update(target_data)
+    document.properties["source"] = source_data
+    return document
+
+  # --- Protected methods ---
+
+  @staticmethod
+  def _extension() -> str:
+    """
+    Get the file extension for strings files.
+
+    :return: The file extension for strings files.
+    """
+    return "strings"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __parse(content: str) -> LocaleDocument:
+    """
+    Parse the content of a strings file, token by token.
+
+    The comment right before a string is remembered as the comment of the string, so that a target file gets it along with the string.
+
+    :param content: The content of the strings file.
+    :raise ParseError: If the content cannot be parsed as a strings file.
+    :return: The strings of the file.
+    """
+    document = LocaleDocument(comments={})
+    position = 0
+    gap = ""
+    comment = None
+    while position < len(content):
+      match = StringsFile.__TOKEN_PATTERN.match(content, position)
+      if match is None:
+        line = content.count("\n", 0, position) + 1
+        raise BaseFile.ParseError(f"Unexpected content on line {line} of the strings file")
+      position = match.end()
+      if match.group(1) is None:
+        gap += match.group(0)
+        if not match.group(0).isspace():
+          comment = match.group(0)
+        continue
+      document.add_text(gap)
+      key = StringsFile.__unescape(match.group(1)[1:-1]) if match.group(1).startswith('"') else match.group(1)
+      if comment is not None:
+        document.properties["comments"][key] = comment
+      document.add_message(key, StringsFile.__unescape(match.group(2)), match.group(0))
+      gap = ""
+      comment = None
+    document.footer = gap
+    return document
+
+  @staticmethod
+  def __render_string(document: LocaleDocument, key: str, value: str) -> str:
+    """
+    Render a translated string, preceded by its comment in the source file when the string is new.
+
+    :param document: The document of the target file.
+    :param key: The key of the string.
+    :param value: The translation.
+    :return: The text of the string.
+    """
+    text = f'"{StringsFile.__escape(key)}" = "{StringsFile.__escape(value)}";'
+    source_data = document.properties.get("source")
+    if document.original_text(key) is None and isinstance(source_data, LocaleDocument) and key in source_data.properties["comments"]:
+      return source_data.properties["comments"][key] + "\n" + text
+    return text
+
+  @staticmethod
+  def __unescape(text: str) -> str:
+    """
+    Unescape a quoted string of a strings file.
+
+    :param text: The escaped string, without its quotes.
+    :return: The string.
+    """
+    return StringsFile.__ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1)[1:], 16)) if len(match.group(1)) == 5 else StringsFile.__ESCAPES.get(match.group(1), match.group(1)), text)
+
+  @staticmethod
+  def __escape(text: str) -> str:
+    """
+    Escape a string to be quoted in a strings file.
+
+    :param text: The string.
+    :return: The escaped string, without its quotes.
+    """
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
@@ -0,0 +1,183 @@
+import re
+
+from .base import BaseFile
+from .document import LocaleDocument
+
+class XliffFile(BaseFile):
+  """
+  Class to handle XLIFF 1.2 and 2.0 files, like the ones Angular extracts.
+
+  Units are keyed by id. The values of a source file are the source of its units, while the values of a target file are their target, missing while absent or empty. Both are the XML content of the elements, with their inline markup and their XML entities as is.
+  The new units of a target file are copied from the source file along with their notes, and a new target file gets the header of the source file with its target language set.
+  A file is parsed in a single pass over its units, and written back with its other elements and the formatting of its unchanged units, see LocaleDocument.
+  """
+  __UNIT_PATTERN = re.compile(r"<!--.*?-->|<(trans-unit|unit)\b([^>]*)>(.*?)</\1\s*>", re.DOTALL)
+  __ID_PATTERN = re.compile(r"""\bid\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+  __SOURCE_PATTERN = re.compile(r"<source\b[^>]*?(?:/>|>(.*?)</source\s*>)", re.DOTALL)
+  __TARGET_PATTERN = re.compile(r"<target\b([^>]*?)(?:/>|>(.*?)</target\s*>)", re.DOTALL)
+  __STATE_PATTERN = re.compile(r"""(\bstate\s*=\s*)(["'])[^"']*\2""")
+  __END_PATTERN = re.compile(r"\s*</(?:body|file|xliff)\s*>")
+  __LANGUAGE_ATTRIBUTES = { "source-language": "target-language", "srcLang": "trgLang" }
+  __DEFAULT_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n  <file source-language="en" datatype="plaintext" original="messages">\n    <body>'
+  __DEFAULT_FOOTER = "\n    </body>\n  </file>\n</xliff>\n"
+  __DEFAULT_SEPARATOR = "\n      "
+
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the translations of an XLIFF file.
+
+    :param file_path: The path to the XLIFF file to read.
+    :raise ParseError: If the file cannot be parsed as XLIFF.
+    :return: The target of each unit, keyed by id, None for the untranslated ones.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      return XliffFile.__parse(file.read(), is_source=False)
+
+  @staticmethod
+  def read_source(file_path: str) -> dict:
+    """
+    Read the texts to translate of an XLIFF file.
+
+    :param file_path: The path to the XLIFF file to read.
+    :raise ParseError: If the file cannot be parsed as XLIFF.
+    :return: The source of each unit, keyed by id.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+      return XliffFile.__parse(file.read(), is_source=True)
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the translations to an XLIFF file, unless it already has these contents.
+
+    :param file_path: The path to the XLIFF file to write.
+    :param data: The translations to write, as returned by read or prepare_target.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    document = data if isinstance(data, LocaleDocument) else XliffFile.prepare_target(data, {}, "")
+    return XliffFile._write_if_changed(file_path, document.render(lambda key, value: XliffFile.__render_unit(document, key, value), separator=document.properties["separator"]))
+
+  @staticmethod
+  def prepare_target(target_data: dict, source_data: dict, target_language: str) -> dict:
+    """
+    Prepare the contents of a target XLIFF file, so that its new units are copied from the source file.
+
+    A new target file gets the header of the source file, with its target language set.
+
+    :param target_data: The contents of the target file, empty if it does not exist.
+    :param source_data: The contents of the source file, as returned by read_source.
+    :param target_language: The target language.
+    :return: The contents of the target file to insert the translations into.
+    """
+    if isinstance(target_data, LocaleDocument):
+      document = target_data
+    else:
+      properties = source_data.properties if isinstance(source_data, LocaleDocument) else { "header": XliffFile.__DEFAULT_HEADER, "separator": XliffFile.__DEFAULT_SEPARATOR }
+      header = XliffFile.__with_target_language(properties["header"], XliffFile._locale(target_language, separator="-")) if target_language else properties["header"]
+      document = LocaleDocument(footer=source_data.footer if isinstance(source_data, LocaleDocument) else XliffFile.__DEFAULT_FOOTER, header=header, separator=properties["separator"])
+      document.add_text(header)
+      document.update(target_data)
+    document.properties["source"] = source_data
+    return document
+
+  # --- Protected methods ---
+
+  @staticmethod
+  def _extension() -> str:
+    """
+    Get the file extension for XLIFF files.
+
+    :return: The file extension for XLIFF files.
+    """
+    return "xlf"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __parse(content: str, is_source: bool) -> LocaleDocument:
+    """
+    Parse the content of an XLIFF file, unit by unit.
+
+    :param content: The content of the XLIFF file.
+    :param is_source: Whether to read the source of the units instead of their target.
+    :raise ParseError: If the content has no units nor the end of a body or file element.
+    :return: The units of the file.
+    """
+    document = LocaleDocument(header=None, separator=XliffFile.__DEFAULT_SEPARATOR)
+    position = 0
+    for match in XliffFile.__UNIT_PATTERN.finditer(content):
+      gap = content[position:match.start()]
+      position = match.end()
+      if document.properties["header"] is None:
+        document.properties["header"] = gap.rstrip()
+        document.add_text(document.properties["header"])
+        gap = gap[len(gap.rstrip()):]
+      document.add_text(gap)
+      id_match = XliffFile.__ID_PATTERN.search(match.group(2) or "")
+      if match.group(1) is None or id_match is None:
+        document.add_text(match.group(0))
+        continue
+      document.properties["separator"] = gap[len(gap.rstrip()):] or document.properties["separator"]
+      element_match = (XliffFile.__SOURCE_PATTERN if is_source else XliffFile.__TARGET_PATTERN).search(match.group(3))
+      value = element_match.group(1 if is_source else 2) if element_match is not None else None
+      document.add_message(id_match.group(1) if id_match.group(1) is not None else id_match.group(2), value or None, match.group(0))
+    if document.properties["header"] is None:
+      end_match = XliffFile.__END_PATTERN.search(content)
+      if end_match is None:
+        raise BaseFile.ParseError("Expected XLIFF units or the end of a body or file element")
+      position = end_match.start()
+      document.properties["header"] = content[:position]
+      document.add_text(content[:position])
+    document.footer = content[position:]
+    return document
+
+  @staticmethod
+  def __render_unit(document: LocaleDocument, key: str, value: str) -> str:
+    """
+    Render a translated unit, from its element in the target file with the source of the source file, or from its element in the source file, with its target replaced or inserted after its source.
+
+    :param document: The document of the target file.
+    :param key: The id of the unit.
+    :param value: The translation.
+    :return: The XML element of the unit.
+    """
+    source_data = document.properties.get("source")
+    source_text = source_data.original_text(key) if isinstance(source_data, LocaleDocument) else None
+    text = document.original_text(key)
+    if text is None:
+      text = source_text
+    elif source_text is not None and (source_match := XliffFile.__SOURCE_PATTERN.search(source_text)) and (target_source_match := XliffFile.__SOURCE_PATTERN.search(text)):
+      # The source of the unit may have changed since the target file was written
+      text = text[:target_source_match.start()] + source_match.group(0) + text[target_source_match.end():]
+    if text is None:
+      if re.search(r"""<xliff\b[^>]*\bversion\s*=\s*["']2""", document.properties["header"]):
+        return f'<unit id="{key}"><segment><target>{value}</target></segment></unit>'
+      return f'<trans-unit id="{key}"><target>{value}</target></trans-unit>'
+    target_match = XliffFile.__TARGET_PATTERN.search(text)
+    if target_match is not None:
+      attributes = XliffFile.__STATE_PATTERN.sub(lambda match: f"{match.group(1)}{match.group(2)}translated{match.group(2)}", target_match.group(1))
+      return text[:target_match.start()] + f"<target{attributes}>{value}</target>" + text[target_match.end():]
+    source_match = XliffFile.__SOURCE_PATTERN.search(text)
+    if source_match is None:
+      return text
+    line_start = text.rfind("\n", 0, source_match.start())
+    indentation = text[line_start:source_match.start()] if line_start >= 0 and text[line_start:source_match.start()].isspace() else ""
+    return text[:source_match.end()] + f"{indentation}<target>{value}</target>" + text[source_match.end():]
+
+  @staticmethod
+  def __with_target_language(header: str, target_language: str) -> str:
+    """
+    Set the target language of the file elements of a header, next to their source language.
+
+    :param header: The header of the XLIFF file.
+    :param target_language: The target language, as a BCP 47 language tag.
+    :return: The header with the target language set.
+    """
+    for source_attribute, target_attribute in XliffFile.__LANGUAGE_ATTRIBUTES.items():
+      target_pattern = re.compile(rf"""(\b{target_attribute}\s*=\s*)(["'])[^"']*\2""")
+      if target_pattern.search(header):
+        header = target_pattern.sub(lambda match: f"{match.group(1)}{match.group(2)}{target_language}{match.group(2)}", header)
+      else:
+        header = re.sub(rf"""\b{source_attribute}\s*=\s*(["'])[^"']*\1""", lambda match: f'{match.group(0)} {target_attribute}="{target_language}"', header)
+    return header
@@ -1,11 +1,22 @@
+import io
 import yaml
+from typing import Callable, Iterable, Iterator, TextIO
 
 from .base import BaseFile
 
+try:
+  from yaml import CSafeLoader as SafeLoader, CSafeDumper as FastDumper
+except ImportError:
+  from yaml import SafeLoader, SafeDumper as FastDumper
+
 class YamlFile(BaseFile):
   """
   Class to handle YAML files.
+
+  Files are parsed with the libyaml loader when available, and written with the pure Python dumper so that the output stays the same.
   """
+  __MAPPING_TAG = "tag:yaml.org,2002:map"
+
   @staticmethod
   def read(file_path: str) -> dict:
     """
@@ -17,7 +28,7 @@ class YamlFile(BaseFile):
     """
     with open(file_path, "r") as file:
       try:
-        content = yaml.safe_load(file)
+        content = yaml.load(file, Loader=SafeLoader)
         if content is None:
           return {}
         return content
@@ -25,16 +36,56 @@ class YamlFile(BaseFile):
         raise BaseFile.ParseError from error
 
   @staticmethod
-  def write(file_path: str, data: dict) -> None:
+  def write(file_path: str, data: dict) -> bool:
     """
-    Write the contents to a YAML file.
+    Write the contents to a YAML file, unless it already has these contents.
 
     :param file_path: The path to the YAML file to write.
     :param data: The data to write to the YAML file.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    return YamlFile._write_if_changed(file_path, yaml.dump(data, sort_keys=False, default_flow_style=False))
+
+  @staticmethod
+  def read_values(file_path: str) -> Iterator[tuple[tuple, object]]:
+    """
+    Read the values of a YAML file one by one from the parser events, without loading the whole file.
+
+    Mappings are walked key by key, while the other values, like sequences, are constructed as a whole. Aliases are not supported.
+
+    :param file_path: The path to the YAML file to read.
+    :raise ParseError: If the file cannot be parsed as YAML, or uses aliases.
+    :return: A generator of the key path and the value of each non-null value, in the order of the file.
+    """
+    with open(file_path, "r") as file:
+      loader = SafeLoader(file)
+      try:
+        yield from YamlFile.__iterate_values(loader)
+      except yaml.YAMLError as error:
+        raise BaseFile.ParseError from error
+      finally:
+        loader.dispose()
+
+  @staticmethod
+  def write_values(file_path: str, values: Iterable[tuple[tuple, object]], should_replace: Callable[[], bool] = None) -> bool:
+    """
+    Write a stream of values to a YAML file, formatted as write does, unless it already has these contents.
+
+    :param file_path: The path to the YAML file to write.
+    :param values: The key path and the value of each value, with the values of a same mapping next to each other.
+    :param should_replace: The function telling, once the values are written, whether they should replace the file, if any.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    return YamlFile._write_stream_if_changed(file_path, lambda file: YamlFile.__write_values(file, values), should_replace=should_replace)
+
+  @staticmethod
+  def supports_streaming() -> bool:
+    """
+    Check if YAML files can be streamed.
+
+    :return: True.
     """
-    YamlFile._ensure_directories_exist(file_path)
-    with open(file_path, "w") as file:
-      yaml.dump(data, file, sort_keys=False, default_flow_style=False)
+    return True
 
   # --- Protected methods ---
 
@@ -46,3 +97,210 @@ class YamlFile(BaseFile):
     :return: The file extension for YAML files.
     """
     return "yml"
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __iterate_values(loader: SafeLoader) -> Iterator[tuple[tuple, object]]:
+    """
+    Iterate over the values of the YAML document of a loader.
+
+    :param loader: The loader.
+    :raise ParseError: If the document is not a mapping, or uses aliases.
+    :return: A generator of the key path and the value of each non-null value.
+    """
+    loader.get_event()
+    if loader.check_event(yaml.StreamEndEvent):
+      return
+    loader.get_event()
+    if not loader.check_event(yaml.MappingStartEvent):
+      if YamlFile.__construct_value(loader) is not None:
+        raise BaseFile.ParseError("The YAML document is not a mapping")
+      return
+    loader.get_event()
+    key_path = ()
+    while True:
+      if loader.check_event(yaml.MappingEndEvent):
+        loader.get_event()
+        if not key_path:
+          return
+        key_path = key_path[:-1]
+        continue
+      key = YamlFile.__construct_value(loader)
+      if loader.check_event(yaml.MappingStartEvent):
+        loader.get_event()
+        key_path += (key,)
+        continue
+      value = YamlFile.__construct_value(loader)
+      if value is not None:
+        yield key_path + (key,), value
+
+  @staticmethod
+  def __construct_value(loader: SafeLoader):
+    """
+    Construct the next value of a loader from its events.
+
+    :param loader: The loader.
+    :raise ParseError: If the value is an alias.
+    :return: The value.
+    """
+    value = loader.construct_object(YamlFile.__compose_node(loader), deep=True)
+    loader.constructed_objects = {}
+    return value
+
+  @staticmethod
+  def __compose_node(loader: SafeLoader) -> yaml.Node:
+    """
+    Compose the next node of a loader from its events, as the composer of PyYAML does.
+
+    :param loader: The loader.
+    :raise ParseError: If the node is an alias.
+    :return: The node.
+    """
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+      raise BaseFile.ParseError(f"Aliases are not supported when streaming YAML files, found '*{event.anchor}'")
+    if isinstance(event, yaml.ScalarEvent):
+      tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+      return yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    if isinstance(event, yaml.SequenceStartEvent):
+      tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.SequenceNode, None, event.implicit)
+      node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+      while not loader.check_event(yaml.SequenceEndEvent):
+        node.value.append(YamlFile.__compose_node(loader))
+    else:
+      tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.MappingNode, None, event.implicit)
+      node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+      while not loader.check_event(yaml.MappingEndEvent):
+        node.value.append((YamlFile.__compose_node(loader), YamlFile.__compose_node(loader)))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+  @staticmethod
+  def __write_values(file: TextIO, values: Iterable[tuple[tuple, object]]) -> None:
+    """
+    Write a stream of values to a file as the YAML document yaml.dump would write.
+
+    :param file: The file to write to.
+    :param values: The key path and the value of each value, with the values of a same mapping next to each other.
+    """
+    dumper = yaml.Dumper(file, default_flow_style=False, sort_keys=False)
+    try:
+      dumper.open()
+      dumper.emit(yaml.DocumentStartEvent(explicit=False))
+      dumper.emit(yaml.MappingStartEvent(anchor=None, tag=YamlFile.__MAPPING_TAG, implicit=True, flow_style=False))
+      open_key_path = []
+      for key_path, value in values:
+        parent_key_path = key_path[:-1]
+        common_prefix_length = YamlFile._common_prefix_length(open_key_path, parent_key_path)
+        while len(open_key_path) > common_prefix_length:
+          dumper.emit(yaml.MappingEndEvent())
+          open_key_path.pop()
+        for key in parent_key_path[common_prefix_length:]:
+          YamlFile.__serialize(dumper, key)
+          dumper.emit(yaml.MappingStartEvent(anchor=None, tag=YamlFile.__MAPPING_TAG, implicit=True, flow_style=False))
+          open_key_path.append(key)
+        YamlFile.__serialize(dumper, key_path[-1])
+        YamlFile.__serialize(dumper, value)
+      for _ in range(len(open_key_path) + 1):
+        dumper.emit(yaml.MappingEndEvent())
+      dumper.emit(yaml.DocumentEndEvent(explicit=False))
+      dumper.close()
+    finally:
+      dumper.dispose()
+
+  @staticmethod
+  def __serialize(dumper: yaml.Dumper, data) -> None:
+    """
+    Emit the events of a value, as yaml.dump would for the same value inside a document.
+
+    :param dumper: The dumper.
+    :param data: The value.
+    """
+    node = dumper.represent_data(data)
+    dumper.represented_objects = {}
+    dumper.object_keeper = []
+    dumper.alias_key = None
+    dumper.anchors = {}
+    dumper.serialized_nodes = {}
+    dumper.anchor_node(node)
+    dumper.serialize_node(node, None, None)
+
+class FastYamlFile(YamlFile):
+  """
+  Class to handle YAML files, written with the libyaml dumper when available.
+
+  The output is the same YAML document, but long quoted strings may be folded differently than with YamlFile.
+  """
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the contents to a YAML file, unless it already has these contents.
+
+    :param file_path: The path to the YAML file to write.
+    :param data: The data to write to the YAML file.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    return FastYamlFile._write_if_changed(file_path, yaml.dump(data, Dumper=FastDumper, sort_keys=False, default_flow_style=False))
+
+class RoundTripYamlFile(YamlFile):
+  """
+  Class to handle YAML files while keeping their comments, anchors, key order and scalar styles.
+
+  Requires the ruamel.yaml package, and is several times slower than YamlFile.
+  """
+  @staticmethod
+  def read(file_path: str) -> dict:
+    """
+    Read the contents of a YAML file, keeping its comments and anchors.
+
+    :param file_path: The path to the YAML file to read.
+    :raise ParseError: If the file cannot be parsed as YAML.
+    :return: The contents of the YAML file.
+    """
+    from ruamel.yaml.error import YAMLError
+    with open(file_path, "r") as file:
+      try:
+        content = RoundTripYamlFile.__round_trip_yaml().load(file)
+        if content is None:
+          return {}
+        return content
+      except YAMLError as error:
+        raise BaseFile.ParseError from error
+
+  @staticmethod
+  def write(file_path: str, data: dict) -> bool:
+    """
+    Write the contents to a YAML file, keeping the comments and anchors read with it, unless it already has these contents.
+
+    :param file_path: The path to the YAML file to write.
+    :param data: The data to write to the YAML file.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    content = io.StringIO()
+    RoundTripYamlFile.__round_trip_yaml().dump(data, content)
+    return RoundTripYamlFile._write_if_changed(file_path, content.getvalue())
+
+  @staticmethod
+  def supports_streaming() -> bool:
+    """
+    Check if YAML files can be streamed while keeping their comments and anchors.
+
+    :return: False, as comments and anchors need the whole document.
+    """
+    return False
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __round_trip_yaml():
+    """
+    Create a round-trip YAML parser and emitter. A new one is created for each file, as they are not thread-safe.
+
+    :return: The round-trip YAML parser and emitter.
+    """
+    from ruamel.yaml import YAML
+    round_trip_yaml = YAML(typ="rt")
+    round_trip_yaml.preserve_quotes = True
+    round_trip_yaml.indent(mapping=2, sequence=2, offset=0)
+    return round_trip_yaml
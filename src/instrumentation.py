@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+class Instrumentation:
+  """
+  Thread-safe timers and counters describing a run.
+  """
+  def __init__(self) -> None:
+    self.__timers = {}
+    self.__counters = {}
+    self.__lock = threading.Lock()
+
+  @contextmanager
+  def timer(self, name: str):
+    """
+    Time the enclosed block, accumulating its duration under the given name.
+
+    :param name: The name of the timer.
+    """
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.record(name, time.perf_counter() - start)
+
+  def record(self, name: str, duration: float) -> None:
+    """
+    Accumulate a duration measured elsewhere, like in a worker process, under the given name.
+
+    :param name: The name of the timer.
+    :param duration: The duration, in seconds.
+    """
+    with self.__lock:
+      timer = self.__timers.setdefault(name, { "count": 0, "total_seconds": 0.0, "max_seconds": 0.0 })
+      timer["count"] += 1
+      timer["total_seconds"] += duration
+      timer["max_seconds"] = max(timer["max_seconds"], duration)
+
+  def increment(self, name: str, value: int = 1) -> None:
+    """
+    Increment a counter.
+
+    :param name: The name of the counter.
+    :param value: The value to add to the counter.
+    """
+    with self.__lock:
+      self.__counters[name] = self.__counters.get(name, 0) + value
+
+  def timers(self) -> dict:
+    """
+    Get the timers.
+
+    :return: The count, total and maximum duration in seconds of each timer, keyed by name.
+    """
+    with self.__lock:
+      return { name: dict(timer) for name, timer in self.__timers.items() }
+
+  def counters(self) -> dict:
+    """
+    Get the counters.
+
+    :return: The value of each counter, keyed by name.
+    """
+    with self.__lock:
+      return dict(self.__counters)
+
+  @staticmethod
+  def write_json(file_path: str, report: dict) -> None:
+    """
+    Write a run report as JSON.
+
+    :param file_path: The path to the JSON file to write.
+    :param report: The run report.
+    """
+    with open(file_path, "w") as file:
+      json.dump(report, file, indent=2)
+
+  @staticmethod
+  def write_step_summary(file_path: str, report: dict) -> None:
+    """
+    Append a run report as Markdown tables to a GitHub step summary.
+
+    :param file_path: The path to the step summary file.
+    :param report: The run report.
+    """
+    lines = ["## Auto-Localize run report", "", f"Duration: {report['duration_seconds']:.2f}s", "", "| Counter | Value |", "| --- | --- |"]
+    lines.extend(f"| {name} | {value} |" for name, value in sorted(report["counters"].items()))
+    lines.extend(["", "| Timer | Count | Total (s) | Max (s) |", "| --- | --- | --- | --- |"])
+    lines.extend(f"| {name} | {timer['count']} | {timer['total_seconds']:.3f} | {timer['max_seconds']:.3f} |" for name, timer in sorted(report["timers"].items()))
+    lines.extend(["", "| API key | Requests | Retries | Sent (bytes) | Received (bytes) | Mean latency (s) |", "| --- | --- | --- | --- | --- | --- |"])
+    for label, statistics in report["http"].items():
+      mean_latency = statistics["total_latency_seconds"] / statistics["requests"] if statistics["requests"] else 0
+      lines.append(f"| {label} | {statistics['requests']} | {statistics['retries']} | {statistics['bytes_sent']} | {statistics['bytes_received']} | {mean_latency:.3f} |")
+    with open(file_path, "a") as file:
+      file.write("\n".join(lines) + "\n")
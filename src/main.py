@@ -1,60 +1,563 @@
 import os
-from functools import reduce
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
+from checkpoint_journal import CheckpointJournal
+from client.base import BaseClient
 from client.factory import ClientFactory
+from client.scheduler import QuotaScheduler
 from files.factory import FileFactory
+from files.key_index import KeyIndex
 
-from utils import generate_target_translation
+from cost_report import CostReport
+from instrumentation import Instrumentation
+from manifest import Manifest
+from normalized_index import NormalizedIndex
+from payload_compactor import PayloadCompactor
+from shard_plan import ShardPlan
+from parse_pool import ParsePool
+from translation_memory import TranslationMemory
+from utils import chunks, generate_target_translation, is_translated, source_values, translate_values
+from value_store import ValueStore
 
 # --- Environment variables ---
 
 SOURCE_LANGUAGE = os.environ["SOURCE_LANGUAGE"]
 TARGET_LANGUAGES = os.environ["TARGET_LANGUAGES"].split(",")
 VARIABLE_PATTERN = os.environ["VARIABLE_PATTERN"]
+PLACEHOLDER_SYNTAXES = [syntax for syntax in os.environ.get("PLACEHOLDER_SYNTAXES", "").split(",") if syntax]
 SOURCE_FILES_DIRECTORY = os.environ["SOURCE_FILES_DIRECTORY"]
+IGNORE_PATTERNS = [pattern for pattern in os.environ.get("IGNORE_PATTERNS", "").split(",") if pattern]
 TARGET_FILES_DIRECTORY = os.environ["TARGET_FILES_DIRECTORY"]
 API_KEYS = os.environ["API_KEYS"].split(",")
 FILE_TYPE = os.environ["FILE_TYPE"]
+YAML_MODE = os.environ.get("YAML_MODE") or "default"
 API_TYPE = os.environ["API_TYPE"]
+API_URL = os.environ.get("API_URL", "")
+LANGUAGES_CACHE_PATH = os.environ.get("LANGUAGES_CACHE_PATH", "")
+UNSUPPORTED_LANGUAGES = os.environ.get("UNSUPPORTED_LANGUAGES") or "fail"
 PRUNE_USELESS_KEYS = os.environ["PRUNE_USELESS_KEYS"].lower() == "true" if "PRUNE_USELESS_KEYS" in os.environ else False
+TRANSLATION_MEMORY_PATH = os.environ.get("TRANSLATION_MEMORY_PATH", "")
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.environ["TRANSLATION_MEMORY_MAX_ENTRIES"]) if os.environ.get("TRANSLATION_MEMORY_MAX_ENTRIES") else 100000
+COMPACT_PAYLOADS = os.environ["COMPACT_PAYLOADS"].lower() == "true" if os.environ.get("COMPACT_PAYLOADS") else True
+DO_NOT_TRANSLATE = [term for term in os.environ.get("DO_NOT_TRANSLATE", "").split(",") if term]
+NORMALIZED_REUSE = os.environ["NORMALIZED_REUSE"].lower() == "true" if os.environ.get("NORMALIZED_REUSE") else True
+NORMALIZED_REUSE_TARGET_FILES = os.environ["NORMALIZED_REUSE_TARGET_FILES"].lower() == "true" if os.environ.get("NORMALIZED_REUSE_TARGET_FILES") else False
+JOURNAL_PATH = os.environ.get("JOURNAL_PATH", "")
+CHECKPOINT_INTERVAL = float(os.environ["CHECKPOINT_INTERVAL"]) if os.environ.get("CHECKPOINT_INTERVAL") else 10
+MANIFEST_PATH = os.environ.get("MANIFEST_PATH", "")
+WATCH = os.environ["WATCH"].lower() == "true" if "WATCH" in os.environ else False
+WATCH_INTERVAL = float(os.environ["WATCH_INTERVAL"]) if os.environ.get("WATCH_INTERVAL") else 0.5
+SHARD_INDEX = int(os.environ["SHARD_INDEX"]) if os.environ.get("SHARD_INDEX") else 0
+SHARD_COUNT = int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else 1
+DRY_RUN = os.environ["DRY_RUN"].lower() == "true" if "DRY_RUN" in os.environ else False
+STREAMING = os.environ["STREAMING"].lower() == "true" if "STREAMING" in os.environ else False
+STREAMING_CHUNK_SIZE = int(os.environ["STREAMING_CHUNK_SIZE"]) if os.environ.get("STREAMING_CHUNK_SIZE") else 1000
+VERBOSITY = int(os.environ["VERBOSITY"]) if os.environ.get("VERBOSITY") else 1
+RUN_REPORT_PATH = os.environ.get("RUN_REPORT_PATH", "")
+CONCURRENCY = max(1, int(os.environ["CONCURRENCY"])) if os.environ.get("CONCURRENCY") else 1
+PARSE_WORKERS = max(1, int(os.environ["PARSE_WORKERS"])) if os.environ.get("PARSE_WORKERS") else 1
+HTTP_POOL_SIZE = int(os.environ["HTTP_POOL_SIZE"]) if os.environ.get("HTTP_POOL_SIZE") else max(10, CONCURRENCY)
+HTTP_CONNECT_TIMEOUT = float(os.environ["HTTP_CONNECT_TIMEOUT"]) if os.environ.get("HTTP_CONNECT_TIMEOUT") else 10
+HTTP_READ_TIMEOUT = float(os.environ["HTTP_READ_TIMEOUT"]) if os.environ.get("HTTP_READ_TIMEOUT") else 60
+MAX_RETRIES = int(os.environ["MAX_RETRIES"]) if os.environ.get("MAX_RETRIES") else 5
+USAGE_REFRESH_INTERVAL = float(os.environ["USAGE_REFRESH_INTERVAL"]) if os.environ.get("USAGE_REFRESH_INTERVAL") else 300
 
 # --- Main script ---
 
+run_start = time.perf_counter()
+instrumentation = Instrumentation()
 client_class = ClientFactory.for_type(API_TYPE)
-file_class = FileFactory.for_type(FILE_TYPE)
-
-clients = client_class.generate_clients(api_keys=API_KEYS, variable_pattern=VARIABLE_PATTERN)
-source_files = file_class.files_matching_path(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE))
-
-for source_file in source_files:
-  source_data = file_class.read(source_file)
-  for target_language in TARGET_LANGUAGES:
-    print(f"[{source_file} - {target_language}] Translating file '{source_file}' to '{target_language}'")
-    target_file = source_file.replace(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE), TARGET_FILES_DIRECTORY.replace("{language}", target_language))
-    if not file_class.file_exists(target_file):
-      file_class.touch(target_file)
-    target_data = file_class.read(source_file.replace(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE), TARGET_FILES_DIRECTORY.replace("{language}", target_language)))
-    missing_keys = file_class.find_missing_keys(source_data, target_data)
-    print(f"[{source_file} - {target_language}] Missing keys: {missing_keys}")
-    target_translations = {}
-    for keys in missing_keys:
-      source_translation = reduce(lambda data, key: data[key], keys, source_data)
-      target_translation = generate_target_translation(
-        source_translation=source_translation,
-        source_file=source_file,
-        source_language=SOURCE_LANGUAGE,
-        target_language=target_language,
-        target_translations=target_translations,
-        client_class=client_class,
-        clients=clients
-      )
-      target_translation_data = target_data
-      for key in keys[:-1]:
-        if type(target_translation_data.get(key)) != dict:
-          target_translation_data[key] = {}
-        target_translation_data = target_translation_data.setdefault(key, {})
-      target_translation_data[keys[-1]] = target_translation
-    print(f"[{source_file} - {target_language}] Writing translations to '{target_file}'")
-    if PRUNE_USELESS_KEYS:
-      target_data = file_class.prune_useless_keys(target_data, source_data)
-    file_class.write(target_file, target_data)
+file_class = FileFactory.for_type(FILE_TYPE, yaml_mode=YAML_MODE)
+if STREAMING and not file_class.supports_streaming():
+  raise FileFactory.UnsupportedFileException(f"Streaming is not supported for file type {FILE_TYPE} in YAML mode {YAML_MODE}")
+if STREAMING and not PRUNE_USELESS_KEYS:
+  # The target files are written in the order of the source files, which leaves no place for the keys they do not have
+  raise FileFactory.UnsupportedFileException("Streaming leaves out the keys that are not in the source files, set prune_useless_keys to true to enable it")
+# The workers are forked before any thread is started
+parse_pool = ParsePool(file_class=file_class, workers=PARSE_WORKERS) if not STREAMING else None
+
+clients = client_class.generate_clients(api_keys=API_KEYS, variable_pattern=VARIABLE_PATTERN, pool_size=HTTP_POOL_SIZE, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), max_retries=MAX_RETRIES, api_url=API_URL, placeholder_syntaxes=PLACEHOLDER_SYNTAXES, languages_cache_path=LANGUAGES_CACHE_PATH)
+scheduler = QuotaScheduler(clients=clients, usage_refresh_interval=USAGE_REFRESH_INTERVAL)
+scheduler.validate()
+# The languages are checked before any file is read, so that no quota is spent on a run bound to fail
+unsupported_target_languages = scheduler.unsupported_target_languages(source_language=SOURCE_LANGUAGE, target_languages=TARGET_LANGUAGES)
+if unsupported_target_languages and UNSUPPORTED_LANGUAGES != "skip":
+  raise BaseClient.UnsupportedLanguageError(f"No client supports translating from {SOURCE_LANGUAGE} to {unsupported_target_languages}, remove them from the target languages or set unsupported_languages to skip")
+if unsupported_target_languages:
+  print(f"[Plan] Skipping unsupported target languages: {unsupported_target_languages}")
+  TARGET_LANGUAGES = [target_language for target_language in TARGET_LANGUAGES if target_language not in unsupported_target_languages]
+with instrumentation.timer("discovery"):
+  source_files = file_class.discover_files(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE), ignore_patterns=IGNORE_PATTERNS)
+instrumentation.increment("source_files", len(source_files))
+shard_plan = ShardPlan(shard_index=SHARD_INDEX, shard_count=SHARD_COUNT, source_files=source_files, target_languages=TARGET_LANGUAGES) if SHARD_COUNT > 1 else None
+if shard_plan is not None:
+  print(shard_plan.summary())
+translation_memory = TranslationMemory(file_path=TRANSLATION_MEMORY_PATH, provider=API_TYPE, variable_pattern=",".join([VARIABLE_PATTERN, *PLACEHOLDER_SYNTAXES]), max_entries=TRANSLATION_MEMORY_MAX_ENTRIES, read_only=DRY_RUN) if TRANSLATION_MEMORY_PATH else None
+journal = CheckpointJournal(file_path=JOURNAL_PATH, provider=API_TYPE, placeholders=",".join([VARIABLE_PATTERN, *PLACEHOLDER_SYNTAXES]), checkpoint_interval=CHECKPOINT_INTERVAL, read_only=DRY_RUN) if JOURNAL_PATH else None
+normalized_index = NormalizedIndex(variable_pattern=VARIABLE_PATTERN, placeholder_syntaxes=PLACEHOLDER_SYNTAXES) if NORMALIZED_REUSE else None
+payload_compactor = PayloadCompactor(variable_pattern=VARIABLE_PATTERN, placeholder_syntaxes=PLACEHOLDER_SYNTAXES, terms=DO_NOT_TRANSLATE) if COMPACT_PAYLOADS else None
+# Watching needs a manifest to find the values that changed, kept in memory if there is no manifest file
+manifest = Manifest.load(MANIFEST_PATH, shard_count=SHARD_COUNT if SHARD_COUNT > 1 else None) if MANIFEST_PATH else (Manifest(file_path="") if WATCH else None)
+cost_report = CostReport(client_labels={client: f"API key #{index + 1}" for index, client in enumerate(clients)}) if DRY_RUN else None
+print_lock = threading.Lock()
+
+def silent(_message: str) -> None:
+  pass
+
+log = print if VERBOSITY >= 1 else silent
+
+def target_file_for(source_file: str, target_language: str) -> str:
+  """
+  Get the path to the target file of a source file.
+
+  :param source_file: The path to the source file.
+  :param target_language: The target language.
+  :return: The path to the target file.
+  """
+  return source_file.replace(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE), TARGET_FILES_DIRECTORY.replace("{language}", target_language))
+
+def plan_file(source_file: str, source_index: KeyIndex, target_language: str, target_data: dict, log, source_file_hash: str = None, value_hashes: dict[str, str] = None) -> dict:
+  """
+  Find the missing and changed keys of a source file for a target language.
+
+  :param source_file: The path to the source file.
+  :param source_index: The key index of the contents of the source file.
+  :param target_language: The target language.
+  :param target_data: The contents of the target file, empty if it does not exist.
+  :param log: The function used to log the messages of this file and language.
+  :param source_file_hash: The hash of the source file, when a manifest is used.
+  :param value_hashes: The hash of each source value, when a manifest is used.
+  :return: The plan of the file, holding the key index of the target file contents along with the keys to translate and their source translations.
+  """
+  log(f"[{source_file} - {target_language}] Translating file '{source_file}' to '{target_language}'")
+  target_file = target_file_for(source_file, target_language)
+  with instrumentation.timer("diff"):
+    target_index = KeyIndex(file_class.prepare_target(target_data, source_index.data(), target_language))
+    missing_keys = source_index.missing_key_paths(target_index)
+    changed_keys = []
+    if manifest is not None:
+      missing_key_set = set(missing_keys)
+      changed_keys = [keys for keys in manifest.changed_keys(source_file, target_language, value_hashes) if keys not in missing_key_set]
+  if VERBOSITY >= 2:
+    log(f"[{source_file} - {target_language}] Missing keys: {missing_keys}")
+    if manifest is not None:
+      log(f"[{source_file} - {target_language}] Changed keys: {changed_keys}")
+  else:
+    log(f"[{source_file} - {target_language}] {len(missing_keys)} missing keys, {len(changed_keys)} changed keys")
+  missing_keys.extend(changed_keys)
+  instrumentation.increment("missing_keys", len(missing_keys))
+  if normalized_index is not None and missing_keys and (manifest is not None or NORMALIZED_REUSE_TARGET_FILES):
+    # The translations already in the target file can be reused by the keys to translate, as long as they are known to translate the current source values
+    with instrumentation.timer("normalized_index"):
+      missing_key_set = set(missing_keys)
+      confirmed_key_set = set(manifest.unchanged_keys(source_file, target_language, value_hashes)) if manifest is not None and not NORMALIZED_REUSE_TARGET_FILES else None
+      target_values = target_index.values()
+      translations = {}
+      for keys, source_value in source_index.values().items():
+        target_value = target_values.get(keys)
+        if keys in missing_key_set or (confirmed_key_set is not None and keys not in confirmed_key_set) or KeyIndex.kind(source_value) != KeyIndex.kind(target_value):
+          continue
+        if isinstance(source_value, list) and len(source_value) == len(target_value):
+          translations.update((source_element, target_element) for source_element, target_element in zip(source_value, target_value) if isinstance(source_element, str) and isinstance(target_element, str))
+        elif isinstance(source_value, str):
+          translations[source_value] = target_value
+      normalized_index.add(translations=translations, target_language=target_language)
+  return {
+    "source_file": source_file,
+    "source_index": source_index,
+    "target_language": target_language,
+    "target_file": target_file,
+    "target_index": target_index,
+    "missing_keys": missing_keys,
+    "source_translations": [source_index.get(keys) for keys in missing_keys],
+    "source_file_hash": source_file_hash,
+    "value_hashes": value_hashes
+  }
+
+def write_file(plan: dict, translations: dict[str, str], log) -> None:
+  """
+  Insert the translations of the missing and changed keys of a plan into its target file contents, and write the target file.
+
+  Keys whose translation is not available are left out, and the manifest is only updated when every key has been translated.
+
+  :param plan: The plan of the file, as returned by plan_file.
+  :param translations: The translations of the target language of the plan, keyed by source value.
+  :param log: The function used to log the messages of this file and language.
+  """
+  source_file = plan["source_file"]
+  target_language = plan["target_language"]
+  target_file = plan["target_file"]
+  target_index = plan["target_index"]
+  untranslated_keys = []
+  for keys, source_translation in zip(plan["missing_keys"], plan["source_translations"]):
+    if not is_translated(source_translation, translations):
+      untranslated_keys.append(keys)
+      continue
+    target_index.set(keys, generate_target_translation(source_translation, translations))
+  if untranslated_keys:
+    log(f"[{source_file} - {target_language}] Untranslated keys: {untranslated_keys if VERBOSITY >= 2 else len(untranslated_keys)}")
+    instrumentation.increment("untranslated_keys", len(untranslated_keys))
+    if len(untranslated_keys) == len(plan["missing_keys"]):
+      return
+  if cost_report is not None:
+    log(f"[{source_file} - {target_language}] Would bill {plan['billed_characters']} characters for '{target_file}'")
+    return
+  if PRUNE_USELESS_KEYS:
+    with instrumentation.timer("prune"):
+      target_index.prune(plan["source_index"])
+  with instrumentation.timer("write"):
+    is_written = file_class.write(target_file, target_index.data())
+  if is_written:
+    log(f"[{source_file} - {target_language}] Wrote translations to '{target_file}'")
+    instrumentation.increment("files_written")
+  else:
+    log(f"[{source_file} - {target_language}] No changes to '{target_file}'")
+    instrumentation.increment("files_unchanged")
+  if manifest is not None and not untranslated_keys:
+    manifest.update(source_file, target_language, plan["source_file_hash"], plan["value_hashes"])
+
+def call_with_grouped_logs(function, job: dict):
+  """
+  Call a function on a job, printing its log messages together once done.
+
+  :param function: The function to call, taking the job as keyword arguments along with log.
+  :param job: The keyword arguments of the function, except log.
+  :return: The result of the function.
+  """
+  messages = []
+  try:
+    return function(**job, log=messages.append if VERBOSITY >= 1 else silent)
+  finally:
+    if messages:
+      with print_lock:
+        print("\n".join(messages), flush=True)
+
+def run_jobs(function, jobs: list[dict], executor: ThreadPoolExecutor = None) -> list:
+  """
+  Call a function on each job, concurrently when an executor is given.
+
+  :param function: The function to call, taking a job as keyword arguments along with log.
+  :param jobs: The keyword arguments of each call, except log.
+  :param executor: The executor used to run the jobs concurrently, if any.
+  :return: The results of the function, in the order of the jobs.
+  """
+  if executor is None:
+    return [function(**job, log=log) for job in jobs]
+  futures = [executor.submit(call_with_grouped_logs, function, job) for job in jobs]
+  try:
+    return [future.result() for future in futures]
+  except BaseException:
+    for future in futures:
+      future.cancel()
+    wait(futures)
+    raise
+
+def stream_file(source_file: str, target_language: str, log, source_file_hash: str = None) -> None:
+  """
+  Translate a source file to a target language one chunk of values at a time, and write the target file as a stream.
+
+  The source and target files are read as streams of values, and the values of the target file are kept on disk, so that the memory used depends on the chunk size instead of the file size.
+  The target file follows the order of the source file, and the keys that are not in the source file are left out, which is why streaming requires PRUNE_USELESS_KEYS. It is only written when a value was translated, and the manifest is only updated when every value has been translated.
+
+  :param source_file: The path to the source file.
+  :param target_language: The target language.
+  :param log: The function used to log the messages of this file and language.
+  :param source_file_hash: The hash of the source file, when a manifest is used.
+  """
+  log(f"[{source_file} - {target_language}] Streaming file '{source_file}' to '{target_language}'")
+  target_file = target_file_for(source_file, target_language)
+  with instrumentation.timer("parse_target"):
+    target_values = ValueStore(file_class.read_values(target_file) if file_class.file_exists(target_file) else [])
+  value_hashes = {} if manifest is not None else None
+  counts = { "missing": 0, "translated": 0, "billed": 0 }
+
+  def merged_values():
+    for chunk in chunks(file_class.read_values(source_file), STREAMING_CHUNK_SIZE):
+      with instrumentation.timer("diff"):
+        target_chunk = target_values.get_many([keys for keys, _ in chunk])
+        changed_keys = set()
+        if manifest is not None:
+          chunk_hashes = Manifest.hash_values(dict(chunk))
+          value_hashes.update(chunk_hashes)
+          changed_keys = set(manifest.changed_keys(source_file, target_language, chunk_hashes))
+        missing_translations = { keys: source_translation for keys, source_translation in chunk if keys not in target_chunk or KeyIndex.kind(source_translation) != KeyIndex.kind(target_chunk[keys]) or keys in changed_keys }
+      counts["missing"] += len(missing_translations)
+      translations_by_language = {}
+      if missing_translations:
+        values = source_values(list(missing_translations.values()))
+        with instrumentation.timer("stage_translate"):
+          translate_values(
+            values_by_language={ target_language: values },
+            translations_by_language=translations_by_language,
+            source_language=SOURCE_LANGUAGE,
+            client_class=client_class,
+            scheduler=scheduler,
+            translation_memory=translation_memory,
+            journal=journal,
+            normalized_index=normalized_index,
+            payload_compactor=payload_compactor,
+            cost_report=cost_report,
+            verbose=VERBOSITY >= 2,
+            log=log
+          )
+        if cost_report is not None:
+          counts["billed"] += cost_report.attribute(target_language, values)
+      translations = translations_by_language.get(target_language, {})
+      for keys, source_translation in chunk:
+        if keys in missing_translations and is_translated(source_translation, translations):
+          counts["translated"] += 1
+          yield keys, generate_target_translation(source_translation, translations)
+        elif keys in target_chunk:
+          yield keys, target_chunk[keys]
+
+  try:
+    if cost_report is not None:
+      for _ in merged_values():
+        pass
+      log(f"[{source_file} - {target_language}] Would bill {counts['billed']} characters for '{target_file}'")
+      return
+    with instrumentation.timer("write"):
+      is_written = file_class.write_values(target_file, merged_values(), should_replace=lambda: counts["translated"] > 0)
+  finally:
+    target_values.close()
+  instrumentation.increment("missing_keys", counts["missing"])
+  untranslated_keys_count = counts["missing"] - counts["translated"]
+  log(f"[{source_file} - {target_language}] {counts['missing']} missing or changed keys, {untranslated_keys_count} untranslated")
+  if untranslated_keys_count:
+    instrumentation.increment("untranslated_keys", untranslated_keys_count)
+  if is_written:
+    log(f"[{source_file} - {target_language}] Wrote translations to '{target_file}'")
+    instrumentation.increment("files_written")
+  else:
+    log(f"[{source_file} - {target_language}] No changes to '{target_file}'")
+    instrumentation.increment("files_unchanged")
+  if manifest is not None and not untranslated_keys_count:
+    manifest.update(source_file, target_language, source_file_hash, value_hashes)
+
+def target_languages_for(source_file: str) -> tuple[str, list[str]]:
+  """
+  Get the target languages a source file should be translated to.
+
+  When the run is sharded, only the target languages assigned to this shard are kept. When a manifest is used, the target languages whose file was generated from the current version of the source file are skipped.
+
+  :param source_file: The path to the source file.
+  :return: The hash of the source file when a manifest is used, and the target languages to translate the file to.
+  """
+  shard_languages = [target_language for target_language in TARGET_LANGUAGES if shard_plan is None or shard_plan.includes(source_file, target_language)]
+  if manifest is None or not shard_languages:
+    return None, shard_languages
+  source_file_hash = manifest.file_hash(source_file, source_files[source_file])
+  target_languages = [target_language for target_language in shard_languages if not (manifest.is_up_to_date(source_file, target_language, source_file_hash) and file_class.file_exists(target_file_for(source_file, target_language)))]
+  if len(target_languages) < len(shard_languages):
+    log(f"[{source_file}] Skipping unchanged languages: {[target_language for target_language in shard_languages if target_language not in target_languages]}")
+    instrumentation.increment("skipped_files", len(shard_languages) - len(target_languages))
+  return source_file_hash, target_languages
+
+def parse_jobs(source_files: list[str]) -> list[dict]:
+  """
+  Generate the arguments of ParsePool.parse for each source file to translate.
+
+  Source files without any target language to translate to are skipped.
+
+  :param source_files: The paths to the source files.
+  :return: The path to each source file, its hash when a manifest is used, and the paths to its target files keyed by target language.
+  """
+  jobs = []
+  for source_file in source_files:
+    source_file_hash, target_languages = target_languages_for(source_file)
+    if target_languages:
+      jobs.append({ "source_file": source_file, "source_file_hash": source_file_hash, "target_files": { target_language: target_file_for(source_file, target_language) for target_language in target_languages } })
+  return jobs
+
+def translation_jobs(jobs: list[dict]):
+  """
+  Generate the arguments of plan_file for each source file and target language to translate, as the files get parsed.
+
+  :param jobs: The arguments of ParsePool.parse for each source file to translate.
+  :return: A generator of the arguments of plan_file, except log.
+  """
+  for job, parsed_files in zip(jobs, parse_pool.parse(jobs)):
+    instrumentation.record("parse_source", parsed_files["source_seconds"])
+    for target_seconds in parsed_files["target_seconds"].values():
+      instrumentation.record("parse_target", target_seconds)
+    source_index = KeyIndex(parsed_files["source_data"])
+    value_hashes = Manifest.hash_values(source_index.values()) if manifest is not None else None
+    for target_language, target_data in parsed_files["target_data"].items():
+      yield { "source_file": job["source_file"], "source_index": source_index, "target_language": target_language, "target_data": target_data, "source_file_hash": job["source_file_hash"], "value_hashes": value_hashes }
+
+def streaming_jobs(source_files: list[str]):
+  """
+  Generate the arguments of stream_file for each source file and target language to translate.
+
+  :param source_files: The paths to the source files.
+  :return: A generator of the arguments of stream_file, except log.
+  """
+  for source_file in source_files:
+    source_file_hash, target_languages = target_languages_for(source_file)
+    for target_language in target_languages:
+      yield { "source_file": source_file, "target_language": target_language, "source_file_hash": source_file_hash }
+
+executor = ThreadPoolExecutor(max_workers=CONCURRENCY) if CONCURRENCY > 1 else None
+def translate_files(source_file_paths: list[str]) -> None:
+  """
+  Translate source files to the target languages, and write their target files.
+
+  :param source_file_paths: The paths to the source files.
+  :raises BaseClient.ClientError: If a translation failed, once the translations obtained so far are written.
+  """
+  if STREAMING:
+    jobs = list(streaming_jobs(source_file_paths))
+    instrumentation.increment("planned_files", len(jobs))
+    with instrumentation.timer("stage_stream"):
+      run_jobs(stream_file, jobs, executor)
+  else:
+    plans = []
+    requested_values_by_language = {}
+    pending_values_by_language = {}
+    translations_by_language = {}
+    translation_futures = []
+    translation_errors = []
+    flush_size = (clients[0].capabilities()["max_texts_per_request"] or 50) * 4
+
+    def translate_pending_values(target_language: str, count: int = None) -> None:
+      """
+      Translate the values of a target language gathered since the last call, in the background when an executor is given.
+
+      Once a translation failed, the remaining values are left untranslated.
+
+      :param target_language: The target language.
+      :param count: The number of values to translate, all of them if None. The other values are kept for the next call.
+      """
+      pending_values = pending_values_by_language.get(target_language, [])
+      values = pending_values[:count] if count is not None else pending_values
+      pending_values_by_language[target_language] = pending_values[len(values):]
+      if not values or translation_errors or any(future.done() and future.exception() is not None for future in translation_futures):
+        return
+      arguments = {
+        "values_by_language": { target_language: values },
+        "translations_by_language": translations_by_language,
+        "source_language": SOURCE_LANGUAGE,
+        "client_class": client_class,
+        "scheduler": scheduler,
+        "translation_memory": translation_memory,
+        "journal": journal,
+        "normalized_index": normalized_index,
+        "payload_compactor": payload_compactor,
+        "cost_report": cost_report,
+        "verbose": VERBOSITY >= 2,
+        "log": log
+      }
+      if executor is None:
+        try:
+          with instrumentation.timer("stage_translate"):
+            translate_values(**arguments)
+        except Exception as error:
+          translation_errors.append(error)
+        return
+      translation_futures.append(executor.submit(translate_values, **arguments))
+
+    with instrumentation.timer("stage_plan"):
+      for job in translation_jobs(parse_jobs(source_file_paths)):
+        plan = plan_file(**job, log=log)
+        plans.append(plan)
+        requested_values = requested_values_by_language.setdefault(plan["target_language"], set())
+        pending_values = pending_values_by_language.setdefault(plan["target_language"], [])
+        for value in source_values(plan["source_translations"]):
+          if value not in requested_values:
+            requested_values.add(value)
+            pending_values.append(value)
+        while len(pending_values_by_language[plan["target_language"]]) >= flush_size:
+          translate_pending_values(plan["target_language"], count=flush_size)
+    instrumentation.increment("planned_files", len(plans))
+    instrumentation.increment("unique_values", sum(len(values) for values in requested_values_by_language.values()))
+    log(f"[Plan] {sum(len(plan['missing_keys']) for plan in plans)} keys to translate in {len(plans)} files, {sum(len(values) for values in requested_values_by_language.values())} unique values across {len(requested_values_by_language)} languages")
+    for target_language in list(pending_values_by_language):
+      translate_pending_values(target_language)
+    with instrumentation.timer("stage_translate"):
+      wait(translation_futures)
+    translation_errors.extend(future.exception() for future in translation_futures if future.exception() is not None)
+    translation_error = translation_errors[0] if translation_errors else None
+    if translation_error is not None:
+      print(f"[Error] Translation stopped, writing the translations obtained so far: {translation_error!r}")
+    if cost_report is not None:
+      for plan in plans:
+        plan["billed_characters"] = cost_report.attribute(plan["target_language"], source_values(plan["source_translations"]))
+    with instrumentation.timer("stage_write"):
+      run_jobs(write_file, [{ "plan": plan, "translations": translations_by_language.get(plan["target_language"], {}) } for plan in plans], executor)
+    if translation_error is not None:
+      raise translation_error
+
+def watch_source_files() -> bool:
+  """
+  Translate the source files again each time they change, until interrupted.
+
+  The source files are polled for the ones whose fingerprint changed, and only those are translated, with the clients and the caches of the run kept warm. When sharded, the shard plan is computed again from the current source files, and the files with pairs newly assigned to this shard are translated too. An error is printed without stopping the watch, so that a file saved while being edited is translated once it is valid again.
+  The watch stops when interrupted while waiting for changes, while an interruption during a translation is raised, so that the run is not taken as completed.
+
+  :return: True if the last translation of every changed file completed, False otherwise.
+  """
+  global source_files, shard_plan
+  failed_source_files = set()
+  log(f"[Watch] Watching '{SOURCE_FILES_DIRECTORY.replace('{language}', SOURCE_LANGUAGE)}' for changes, press Ctrl+C to stop")
+  while True:
+    try:
+      time.sleep(WATCH_INTERVAL)
+      current_source_files = file_class.discover_files(SOURCE_FILES_DIRECTORY.replace("{language}", SOURCE_LANGUAGE), ignore_patterns=IGNORE_PATTERNS)
+    except KeyboardInterrupt:
+      log("[Watch] Stopped")
+      return not failed_source_files
+    changed_source_files = [source_file for source_file, fingerprint in current_source_files.items() if source_files.get(source_file) != fingerprint]
+    if shard_plan is not None and (changed_source_files or current_source_files.keys() != source_files.keys()):
+      # The pairs are weighted by the size of their source file, so a changed file can move pairs of unchanged files to this shard
+      previous_shard_plan = shard_plan
+      shard_plan = ShardPlan(shard_index=SHARD_INDEX, shard_count=SHARD_COUNT, source_files=current_source_files, target_languages=TARGET_LANGUAGES)
+      changed_source_files += [source_file for source_file in current_source_files if source_file not in changed_source_files and any(shard_plan.includes(source_file, target_language) and not previous_shard_plan.includes(source_file, target_language) for target_language in TARGET_LANGUAGES)]
+      log(shard_plan.summary())
+    source_files = current_source_files
+    if not changed_source_files:
+      continue
+    start = time.perf_counter()
+    log(f"[Watch] Changed files: {changed_source_files}")
+    try:
+      translate_files(changed_source_files)
+      failed_source_files.difference_update(changed_source_files)
+      log(f"[Watch] Done in {time.perf_counter() - start:.2f}s")
+    except Exception as error:
+      failed_source_files.update(changed_source_files)
+      print(f"[Error] {error!r}")
+
+is_completed = False
+try:
+  translate_files(list(source_files))
+  is_completed = watch_source_files() if WATCH else True
+finally:
+  if cost_report is not None:
+    print("\n".join(cost_report.summary()))
+  if parse_pool is not None:
+    parse_pool.close()
+  if MANIFEST_PATH and cost_report is None and shard_plan is not None:
+    manifest.save(shard_index=SHARD_INDEX, includes=shard_plan.includes, shard_count=SHARD_COUNT)
+  elif MANIFEST_PATH and cost_report is None:
+    manifest.save()
+  if translation_memory is not None:
+    translation_memory.close()
+  if journal is not None:
+    journal.close(is_completed=is_completed)
+  report = {
+    "duration_seconds": time.perf_counter() - run_start,
+    "counters": instrumentation.counters() | ({ f"translation_memory_{name}": value for name, value in translation_memory.statistics().items() } if translation_memory is not None else {}) | ({ f"journal_{name}": value for name, value in journal.statistics().items() } if journal is not None else {}) | ({ f"normalized_index_{name}": value for name, value in normalized_index.statistics().items() } if normalized_index is not None else {}),
+    "timers": instrumentation.timers(),
+    "http": { f"API key #{index + 1}": client.statistics() for index, client in enumerate(clients) }
+  }
+  retries = ", ".join(f"{label}: {statistics['retries']}" for label, statistics in report["http"].items())
+  print(f"[Summary] Done in {report['duration_seconds']:.2f}s, {sum(statistics['requests'] for statistics in report['http'].values())} requests, {sum(statistics['retries'] for statistics in report['http'].values())} retried ({retries})")
+  if RUN_REPORT_PATH:
+    Instrumentation.write_json(RUN_REPORT_PATH, report)
+  if os.environ.get("GITHUB_STEP_SUMMARY"):
+    Instrumentation.write_step_summary(os.environ["GITHUB_STEP_SUMMARY"], report)
+  for client in clients:
+    client.close()
+  if executor is not None:
+    executor.shutdown(cancel_futures=True)
@@ -0,0 +1,193 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Callable
+
+class Manifest:
+  """
+  Lockfile recording, for each source file and target language, a hash of the source file and of each source value when the target file was last generated.
+
+  It is used to retranslate the values that changed in the source files since the last run, and to skip the files that did not change at all.
+  The hash of each source file is also recorded along with its modification time and size, so that the unchanged files are not read again to be hashed.
+  A sharded run saves the entries of its own shard next to the manifest, as `<manifest>.shard-<index>`, so that the jobs of a run do not write the same file. The shard files are merged into the manifest when it is loaded, and deleted when a run that is not sharded saves it. The shard files left by an earlier run with more shards are ignored and deleted by a sharded run, so that their entries do not override the newer ones.
+  """
+  __VERSION = 1
+
+  def __init__(self, file_path: str, entries: dict = None, fingerprints: dict = None, shard_file_paths: list[str] = None) -> None:
+    self.__file_path = file_path
+    self.__entries = {} if entries is None else entries
+    self.__fingerprints = {} if fingerprints is None else fingerprints
+    self.__shard_file_paths = [] if shard_file_paths is None else shard_file_paths
+    self.__lock = threading.Lock()
+
+  @staticmethod
+  def load(file_path: str, shard_count: int = None) -> 'Manifest':
+    """
+    Load the manifest at the given path merged with its shard files, or an empty manifest if there is none.
+
+    :param file_path: The path to the manifest.
+    :param shard_count: The number of shards of a sharded run, whose shard files with a higher index are ignored.
+    :return: The manifest.
+    """
+    entries = {}
+    fingerprints = {}
+    shard_file_paths = [path for path, index in sorted(Manifest.__shard_files(file_path).items(), key=lambda item: item[1]) if shard_count is None or index < shard_count]
+    for path in [file_path, *shard_file_paths]:
+      if not os.path.exists(path):
+        continue
+      with open(path, "r") as file:
+        content = json.load(file)
+      if content.get("version") != Manifest.__VERSION:
+        continue
+      for source_file, language_entries in content["files"].items():
+        entries.setdefault(source_file, {}).update(language_entries)
+      fingerprints.update(content.get("fingerprints", {}))
+    return Manifest(file_path=file_path, entries=entries, fingerprints=fingerprints, shard_file_paths=shard_file_paths)
+
+  @staticmethod
+  def hash_file(file_path: str) -> str:
+    """
+    Hash the contents of a file.
+
+    :param file_path: The path to the file to hash.
+    :return: The hash of the file.
+    """
+    with open(file_path, "rb") as file:
+      return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+  def file_hash(self, file_path: str, fingerprint: tuple[int, int]) -> str:
+    """
+    Hash the contents of a file, reusing the recorded hash when the file has the same fingerprint as when it was recorded.
+
+    :param file_path: The path to the file to hash.
+    :param fingerprint: The current fingerprint of the file, see BaseFile.fingerprint.
+    :return: The hash of the file.
+    """
+    with self.__lock:
+      recorded_fingerprint = self.__fingerprints.get(file_path)
+    if recorded_fingerprint is not None and recorded_fingerprint["fingerprint"] == list(fingerprint):
+      return recorded_fingerprint["hash"]
+    file_hash = Manifest.hash_file(file_path)
+    with self.__lock:
+      self.__fingerprints[file_path] = { "fingerprint": list(fingerprint), "hash": file_hash }
+    return file_hash
+
+  @staticmethod
+  def hash_values(source_values: dict[tuple, object]) -> dict[str, str]:
+    """
+    Hash each value of a source document.
+
+    :param source_values: The values of the source document, keyed by key path, as returned by KeyIndex.values.
+    :return: The hash of each value, keyed by the JSON-encoded key path of the value.
+    """
+    hashes = {}
+    for key_path, value in source_values.items():
+      encoded_value = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+      hashes[json.dumps(key_path, ensure_ascii=False, default=str)] = hashlib.blake2b(encoded_value, digest_size=8).hexdigest()
+    return hashes
+
+  def is_up_to_date(self, source_file: str, target_language: str, source_file_hash: str) -> bool:
+    """
+    Check if a target file was generated from the current version of a source file.
+
+    :param source_file: The path to the source file.
+    :param target_language: The target language.
+    :param source_file_hash: The hash of the current version of the source file.
+    :return: True if the target file was generated from the current version of the source file, False otherwise.
+    """
+    entry = self.__entries.get(source_file, {}).get(target_language)
+    return entry is not None and entry["hash"] == source_file_hash
+
+  def changed_keys(self, source_file: str, target_language: str, value_hashes: dict[str, str]) -> list[tuple]:
+    """
+    Find the keys whose source value changed since the target file was last generated.
+
+    :param source_file: The path to the source file.
+    :param target_language: The target language.
+    :param value_hashes: The hash of each current source value, as returned by hash_values.
+    :return: The key paths of the changed values.
+    """
+    entry = self.__entries.get(source_file, {}).get(target_language)
+    if entry is None:
+      return []
+    recorded_hashes = entry["values"]
+    return [tuple(json.loads(key_path)) for key_path, value_hash in value_hashes.items() if key_path in recorded_hashes and recorded_hashes[key_path] != value_hash]
+
+  def unchanged_keys(self, source_file: str, target_language: str, value_hashes: dict[str, str]) -> list[tuple]:
+    """
+    Find the keys whose source value is the one the target file was last generated from.
+
+    :param source_file: The path to the source file.
+    :param target_language: The target language.
+    :param value_hashes: The hash of each current source value, as returned by hash_values.
+    :return: The key paths of the unchanged values.
+    """
+    entry = self.__entries.get(source_file, {}).get(target_language)
+    if entry is None:
+      return []
+    recorded_hashes = entry["values"]
+    return [tuple(json.loads(key_path)) for key_path, value_hash in value_hashes.items() if recorded_hashes.get(key_path) == value_hash]
+
+  def update(self, source_file: str, target_language: str, source_file_hash: str, value_hashes: dict[str, str]) -> None:
+    """
+    Record that a target file was generated from the given version of a source file.
+
+    :param source_file: The path to the source file.
+    :param target_language: The target language.
+    :param source_file_hash: The hash of the source file.
+    :param value_hashes: The hash of each source value, as returned by hash_values.
+    """
+    with self.__lock:
+      self.__entries.setdefault(source_file, {})[target_language] = { "hash": source_file_hash, "values": value_hashes }
+
+  def save(self, shard_index: int = None, includes: Callable[[str, str], bool] = None, shard_count: int = None) -> None:
+    """
+    Write the manifest to its path, or the entries of a shard to the shard file.
+
+    :param shard_index: The index of the shard of a sharded run.
+    :param includes: The function checking if a source file and a target language belong to the shard, for a sharded run.
+    :param shard_count: The number of shards of a sharded run, whose shard files with a higher index are deleted.
+    """
+    with self.__lock:
+      entries = self.__entries
+      fingerprints = self.__fingerprints
+      if shard_index is not None:
+        entries = { source_file: { target_language: entry for target_language, entry in language_entries.items() if includes(source_file, target_language) } for source_file, language_entries in entries.items() }
+        entries = { source_file: language_entries for source_file, language_entries in entries.items() if language_entries }
+        fingerprints = { source_file: fingerprint for source_file, fingerprint in fingerprints.items() if source_file in entries }
+      content = json.dumps({ "version": self.__VERSION, "files": entries, "fingerprints": fingerprints }, indent=2, sort_keys=True, ensure_ascii=False)
+    file_path = self.__file_path if shard_index is None else f"{self.__file_path}.shard-{shard_index}"
+    if os.path.dirname(file_path):
+      os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temporary_file_path = f"{file_path}.tmp"
+    with open(temporary_file_path, "w") as file:
+      file.write(content)
+    os.replace(temporary_file_path, file_path)
+    if shard_index is None:
+      # The entries of the shard files are now in the manifest
+      for shard_file_path in self.__shard_file_paths:
+        os.remove(shard_file_path)
+      self.__shard_file_paths = []
+    elif shard_count is not None:
+      # The other jobs of the run may delete them at the same time
+      for shard_file_path, index in Manifest.__shard_files(self.__file_path).items():
+        if index >= shard_count:
+          try:
+            os.remove(shard_file_path)
+          except FileNotFoundError:
+            pass
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __shard_files(file_path: str) -> dict[str, int]:
+    """
+    Find the shard files of a manifest.
+
+    :param file_path: The path to the manifest.
+    :return: The index of each shard file, keyed by path.
+    """
+    prefix = f"{file_path}.shard-"
+    return { path: int(path[len(prefix):]) for path in glob.glob(f"{glob.escape(prefix)}*") if path[len(prefix):].isdigit() }
@@ -0,0 +1,107 @@
+import re
+import threading
+
+from client.placeholder_codec import PlaceholderCodec
+
+class NormalizedIndex:
+  """
+  Index of the known translations by normalized source text, so that a text differing from a translated one only by its placeholders, its whitespace or its trailing punctuation reuses that translation instead of being translated again.
+
+  A text is normalized by replacing its placeholders with tokens numbered in order, collapsing its whitespace, and stripping its surrounding whitespace along with its trailing periods, colons and ellipses.
+  When a translation is reused, the placeholders of the text take the place of the ones of the translated text, wherever the translation moved them, and the surrounding whitespace and trailing punctuation of the text take the place of the ones of the translation when they differ.
+  """
+  __AFFIXES_PATTERN = re.compile(r"(\s*)(.*?)(\s*[.:…]*\s*)", re.DOTALL)
+  __WHITESPACE_PATTERN = re.compile(r"\s+")
+
+  def __init__(self, variable_pattern: str = None, placeholder_syntaxes: list[str] = None) -> None:
+    self.__codec = PlaceholderCodec(variable_pattern=variable_pattern, syntaxes=placeholder_syntaxes)
+    self.__entries = {}
+    self.__statistics = { "reused": 0 }
+    self.__lock = threading.Lock()
+
+  def key(self, text: str) -> str:
+    """
+    Get the normalized form of a text.
+
+    :param text: The text.
+    :return: The normalized text, or None if nothing is left of the text once normalized.
+    """
+    encoded_texts, _ = self.__codec.encode([text])
+    core = self.__AFFIXES_PATTERN.fullmatch(encoded_texts[0]).group(2)
+    return self.__WHITESPACE_PATTERN.sub(" ", core) if core else None
+
+  def add(self, translations: dict[str, str], target_language: str) -> None:
+    """
+    Index translations. The first translation indexed for a normalized text is the one reused.
+
+    :param translations: The translations, keyed by source text.
+    :param target_language: The language of the translations.
+    """
+    keyed_translations = [(self.key(source_text), source_text, target_text) for source_text, target_text in translations.items()]
+    with self.__lock:
+      entries = self.__entries.setdefault(target_language, {})
+      for key, source_text, target_text in keyed_translations:
+        if key is not None:
+          entries.setdefault(key, (source_text, target_text))
+
+  def lookup(self, texts: list[str], target_language: str) -> dict[str, str]:
+    """
+    Find translations to reuse for texts, adapted to each text.
+
+    :param texts: The texts to look up.
+    :param target_language: The language of the translations.
+    :return: The adapted translations found, keyed by text.
+    """
+    keys = { text: self.key(text) for text in texts }
+    with self.__lock:
+      entries = self.__entries.get(target_language, {})
+      matches = { text: entries.get(key) for text, key in keys.items() if key is not None }
+    translations = {}
+    for text, entry in matches.items():
+      if entry is not None:
+        translation = entry[1] if entry[0] == text else self.__adapt(source_text=entry[0], target_text=entry[1], text=text)
+        if translation is not None:
+          translations[text] = translation
+    with self.__lock:
+      self.__statistics["reused"] += len(translations)
+    return translations
+
+  def statistics(self) -> dict:
+    """
+    Get the statistics of the index.
+
+    :return: The number of translations reused.
+    """
+    with self.__lock:
+      return dict(self.__statistics)
+
+  # --- Private methods ---
+
+  def __adapt(self, source_text: str, target_text: str, text: str) -> str:
+    """
+    Adapt the translation of a source text to a text with the same normalized form.
+
+    :param source_text: The source text.
+    :param target_text: The translation of the source text.
+    :param text: The text to adapt the translation to.
+    :return: The adapted translation, or None if the translation holds placeholders that are not in the source text, or if they cannot be restored.
+    """
+    _, [source_placeholders] = self.__codec.encode([source_text])
+    _, [text_placeholders] = self.__codec.encode([text])
+    encoded_target_texts, [target_placeholders] = self.__codec.encode([target_text])
+    source_indexes = {}
+    for index, placeholder in enumerate(source_placeholders):
+      source_indexes.setdefault(placeholder, []).append(index)
+    replacements = []
+    for placeholder in target_placeholders:
+      if not source_indexes.get(placeholder):
+        return None
+      replacements.append(text_placeholders[source_indexes[placeholder].pop(0)])
+    translation = self.__codec.decode(encoded_target_texts, [replacements])[0]
+    if translation is None:
+      return None
+    source_affixes = self.__AFFIXES_PATTERN.fullmatch(source_text).group(1, 3)
+    text_affixes = self.__AFFIXES_PATTERN.fullmatch(text).group(1, 3)
+    if source_affixes == text_affixes:
+      return translation
+    return text_affixes[0] + self.__AFFIXES_PATTERN.fullmatch(translation).group(2) + text_affixes[1]
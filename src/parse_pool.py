@@ -0,0 +1,62 @@
+import multiprocessing
+import time
+from functools import partial
+from typing import Iterator
+
+from files.base import BaseFile
+
+class ParsePool:
+  """
+  Parses the source files and their target files in worker processes, ahead of the translation stage.
+
+  The parsed files are handed over in the order of the jobs, each one as soon as it is parsed, while the workers keep parsing the next ones.
+  The workers are forked when the pool is created, so the pool must be created before any thread is started. Forking is required because the action is a script, that processes started from scratch could not import.
+  """
+  __CHUNK_SIZE = 4
+
+  def __init__(self, file_class: type[BaseFile], workers: int = 1) -> None:
+    self.__file_class = file_class
+    self.__pool = multiprocessing.get_context("fork").Pool(processes=workers) if workers > 1 else None
+
+  def parse(self, jobs: list[dict]) -> Iterator[dict]:
+    """
+    Parse the source file and the target files of each job.
+
+    :param jobs: The source file and the target files keyed by target language of each job, as `source_file` and `target_files`.
+    :raises BaseFile.ParseError: If a file cannot be parsed.
+    :return: A generator of the parsed files, in the order of the jobs, as returned by parse_files.
+    """
+    parse_files = partial(ParsePool.parse_files, self.__file_class)
+    if self.__pool is None:
+      return map(parse_files, jobs)
+    return self.__pool.imap(parse_files, jobs, chunksize=self.__CHUNK_SIZE)
+
+  def close(self) -> None:
+    """
+    Stop the worker processes.
+    """
+    if self.__pool is not None:
+      self.__pool.terminate()
+      self.__pool.join()
+
+  @staticmethod
+  def parse_files(file_class: type[BaseFile], job: dict) -> dict:
+    """
+    Parse the source file and the target files of a job.
+
+    :param file_class: The class of the files.
+    :param job: The path to the source file as `source_file`, and the paths to the target files keyed by target language as `target_files`.
+    :raises BaseFile.ParseError: If a file cannot be parsed.
+    :return: The contents of the source file, the contents of each target file keyed by target language, empty when the target file does not exist, and the time spent parsing them.
+    """
+    start = time.perf_counter()
+    source_data = file_class.read_source(job["source_file"])
+    source_seconds = time.perf_counter() - start
+    target_data = {}
+    target_seconds = {}
+    for target_language, target_file in job["target_files"].items():
+      start = time.perf_counter()
+      target_data[target_language] = file_class.read(target_file) if file_class.file_exists(target_file) else {}
+      target_seconds[target_language] = time.perf_counter() - start
+    return { "source_data": source_data, "target_data": target_data, "source_seconds": source_seconds, "target_seconds": target_seconds }
+
@@ -0,0 +1,48 @@
+import re
+
+from client.placeholder_codec import PlaceholderCodec
+
+class PayloadCompactor:
+  """
+  Keeps the values that need no translation out of the translate requests, and trims the other ones down to the part that needs a translation, so that fewer characters are billed.
+
+  A value needs no translation when it is not a text, like `5` or `true`, when it has no letter once its placeholders are removed, like `%{name}`, `42` or `$9.99`, when it is a URL or an email address, or when it is one of the terms never to translate, like a brand name.
+  The surrounding whitespace of a value, and the HTML tags wrapping it as a whole, like `<b>Save</b>`, are not sent, and are put back around the translation.
+  """
+  __URL_PATTERN = re.compile(r"(?:[a-z][a-z0-9+.-]*://|www\.)\S+", re.IGNORECASE)
+  __EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+  __WRAPPING_TAG_PATTERN = re.compile(r"(<([A-Za-z][A-Za-z0-9-]*)(?:\s[^<>]*)?>\s*)(.*?)(\s*</\2\s*>)", re.DOTALL)
+
+  def __init__(self, variable_pattern: str = None, placeholder_syntaxes: list[str] = None, terms: list[str] = None) -> None:
+    self.__codec = PlaceholderCodec(variable_pattern=variable_pattern, syntaxes=placeholder_syntaxes)
+    self.__terms = set(terms or [])
+
+  def is_translatable(self, text) -> bool:
+    """
+    Check if a value needs a translation. Values that are not texts, like numbers or booleans, never do.
+
+    :param text: The value.
+    :return: False if the value is kept as is in every language, True otherwise.
+    """
+    if not isinstance(text, str):
+      return False
+    stripped_text = text.strip()
+    if stripped_text in self.__terms or self.__URL_PATTERN.fullmatch(stripped_text) or self.__EMAIL_PATTERN.fullmatch(stripped_text):
+      return False
+    return any(character.isalpha() for character in self.__codec.strip(text))
+
+  def compact(self, text: str) -> tuple[str, str, str]:
+    """
+    Split a text into the part to translate and the parts around it, kept as is.
+
+    :param text: The text.
+    :return: The leading part, the part to translate and the trailing part of the text.
+    """
+    core = text.strip()
+    prefix = text[:len(text) - len(text.lstrip())]
+    suffix = text[len(text.rstrip()):]
+    while (match := self.__WRAPPING_TAG_PATTERN.fullmatch(core)) and not re.search(rf"</?{re.escape(match.group(2))}\b", match.group(3)):
+      prefix += match.group(1)
+      suffix = match.group(4) + suffix
+      core = match.group(3)
+    return prefix, core, suffix
@@ -0,0 +1,47 @@
+import heapq
+
+class ShardPlan:
+  """
+  Deterministic split of the (source file, target language) pairs of a run across shards, so that several jobs, like the ones of a GitHub Actions matrix, each translate and write their own part of the target files.
+
+  Each pair is weighted by the size of its source file, as an estimate of its characters to translate, and the pairs are assigned from the heaviest to the lightest to the least loaded shard, so that the shards finish at about the same time.
+  The assignment only depends on the source files and the target languages, so that every job computes the same one.
+  """
+  class InvalidShardError(Exception):
+    pass
+
+  def __init__(self, shard_index: int, shard_count: int, source_files: dict[str, tuple[int, int]], target_languages: list[str]) -> None:
+    if shard_count < 1:
+      raise ShardPlan.InvalidShardError(f"The shard count must be at least 1, got {shard_count}")
+    if not 0 <= shard_index < shard_count:
+      raise ShardPlan.InvalidShardError(f"The shard index must be between 0 and {shard_count - 1}, got {shard_index}")
+    self.__shard_index = shard_index
+    self.__pairs = set()
+    self.__weight = 0
+    pairs = sorted(((source_file, target_language) for source_file in source_files for target_language in target_languages), key=lambda pair: (-source_files[pair[0]][1], pair))
+    loads = [(0, index) for index in range(shard_count)]
+    for source_file, target_language in pairs:
+      load, index = heapq.heappop(loads)
+      if index == shard_index:
+        self.__pairs.add((source_file, target_language))
+        self.__weight += source_files[source_file][1]
+      # Empty files still take some time to process
+      heapq.heappush(loads, (load + source_files[source_file][1] + 1, index))
+
+  def includes(self, source_file: str, target_language: str) -> bool:
+    """
+    Check if a source file is translated to a target language by this shard.
+
+    :param source_file: The path to the source file.
+    :param target_language: The target language.
+    :return: True if the pair is assigned to this shard, False otherwise.
+    """
+    return (source_file, target_language) in self.__pairs
+
+  def summary(self) -> str:
+    """
+    Get a summary of the work assigned to this shard.
+
+    :return: The summary.
+    """
+    return f"[Shard {self.__shard_index}] {len(self.__pairs)} target files assigned, weighing {self.__weight} bytes of source files"
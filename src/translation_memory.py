@@ -0,0 +1,133 @@
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import unicodedata
+
+class TranslationMemory:
+  """
+  On-disk memory of the translations generated by previous runs, stored in a SQLite database.
+
+  Translations are keyed by provider, source language, target language, variable pattern and normalized source text. When the memory holds more than its maximum number of entries, the least recently used ones are evicted.
+  A memory opened read only, to estimate the cost of a run, is left untouched: its translations are not marked as used, nothing is stored in it and nothing is evicted.
+  """
+  __LOOKUP_CHUNK_SIZE = 500
+
+  def __init__(self, file_path: str, provider: str, variable_pattern: str, max_entries: int = 100000, read_only: bool = False) -> None:
+    self.__provider = provider
+    self.__variable_pattern = variable_pattern
+    self.__max_entries = max_entries
+    self.__read_only = read_only
+    self.__lock = threading.Lock()
+    self.__statistics = { "hits": 0, "misses": 0, "stored": 0, "evicted": 0 }
+    if read_only:
+      # A missing memory is read as an empty one instead of being created
+      self.__connection = sqlite3.connect(f"{pathlib.Path(file_path).absolute().as_uri()}?mode=ro" if os.path.exists(file_path) else ":memory:", uri=True, check_same_thread=False)
+    else:
+      if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+      self.__connection = sqlite3.connect(file_path, check_same_thread=False)
+    self.__connection.execute("""
+      CREATE TABLE IF NOT EXISTS translations (
+        provider TEXT NOT NULL,
+        source_language TEXT NOT NULL,
+        target_language TEXT NOT NULL,
+        variable_pattern TEXT NOT NULL,
+        source_text TEXT NOT NULL,
+        target_text TEXT NOT NULL,
+        last_used INTEGER NOT NULL,
+        UNIQUE (provider, source_language, target_language, variable_pattern, source_text)
+      )
+    """)
+    self.__connection.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+    self.__connection.commit()
+
+  def lookup(self, texts: list[str], source_language: str, target_language: str) -> dict[str, str]:
+    """
+    Look up the translations of the given texts.
+
+    :param texts: The texts to look up.
+    :param source_language: The language of the texts.
+    :param target_language: The language of the translations.
+    :return: The translations found, keyed by text.
+    """
+    texts_by_normalized_text = {}
+    for text in texts:
+      texts_by_normalized_text.setdefault(self.__normalize(text), []).append(text)
+    normalized_texts = list(texts_by_normalized_text)
+    translations = {}
+    with self.__lock:
+      for index in range(0, len(normalized_texts), self.__LOOKUP_CHUNK_SIZE):
+        chunk = normalized_texts[index:index + self.__LOOKUP_CHUNK_SIZE]
+        rows = self.__connection.execute(
+          f"SELECT source_text, target_text FROM translations WHERE provider = ? AND source_language = ? AND target_language = ? AND variable_pattern = ? AND source_text IN ({', '.join('?' * len(chunk))})",
+          [self.__provider, source_language, target_language, self.__variable_pattern, *chunk]
+        ).fetchall()
+        for source_text, target_text in rows:
+          for text in texts_by_normalized_text[source_text]:
+            translations[text] = target_text
+        if not self.__read_only:
+          self.__connection.executemany(
+            "UPDATE translations SET last_used = ? WHERE provider = ? AND source_language = ? AND target_language = ? AND variable_pattern = ? AND source_text = ?",
+            [(time.time_ns(), self.__provider, source_language, target_language, self.__variable_pattern, source_text) for source_text, _ in rows]
+          )
+      self.__connection.commit()
+      self.__statistics["hits"] += len(translations)
+      self.__statistics["misses"] += len(texts) - len(translations)
+    return translations
+
+  def store(self, translations: dict[str, str], source_language: str, target_language: str) -> None:
+    """
+    Store translations in the memory.
+
+    :param translations: The translations to store, keyed by source text.
+    :param source_language: The language of the source texts.
+    :param target_language: The language of the translations.
+    """
+    if self.__read_only:
+      return
+    with self.__lock:
+      self.__connection.executemany(
+        "INSERT OR REPLACE INTO translations (provider, source_language, target_language, variable_pattern, source_text, target_text, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(self.__provider, source_language, target_language, self.__variable_pattern, self.__normalize(source_text), target_text, time.time_ns()) for source_text, target_text in translations.items()]
+      )
+      self.__connection.commit()
+      self.__statistics["stored"] += len(translations)
+
+  def statistics(self) -> dict:
+    """
+    Get the statistics of the memory since it was opened.
+
+    :return: The number of texts found and not found in the memory, of translations stored and of evicted ones.
+    """
+    with self.__lock:
+      return dict(self.__statistics)
+
+  def close(self) -> None:
+    """
+    Evict the least recently used translations above the maximum number of entries, then close the memory.
+    """
+    with self.__lock:
+      count = self.__connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+      if count > self.__max_entries and not self.__read_only:
+        self.__connection.execute(
+          "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+          [count - self.__max_entries]
+        )
+        self.__statistics["evicted"] += count - self.__max_entries
+        self.__connection.commit()
+        self.__connection.execute("VACUUM")
+      self.__connection.close()
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __normalize(text: str) -> str:
+    """
+    Normalize a source text so that equivalent texts share the same entry.
+
+    :param text: The text to normalize.
+    :return: The normalized text.
+    """
+    return unicodedata.normalize("NFC", text)
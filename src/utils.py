@@ -1,28 +1,159 @@
+from typing import Iterable, Iterator
+
+from checkpoint_journal import CheckpointJournal
 from client.base import BaseClient
+from client.scheduler import QuotaScheduler
+from cost_report import CostReport
+from normalized_index import NormalizedIndex
+from payload_compactor import PayloadCompactor
+from translation_memory import TranslationMemory
 
-def generate_target_translation(source_translation: list[str] | str, source_file: str, source_language: str, target_language: str, target_translations: dict[str, str], client_class: BaseClient, clients: list['BaseClient']) -> list[str] | str:
+def chunks(items: Iterable, size: int) -> Iterator[list]:
   """
-  Generate the target translation for the given source translation.
+  Split an iterable into lists of at most the given size, consuming it lazily.
 
-  :param source_translation: The source translation to generate the target translation for.
-  :param source_file: The path to the source file.
-  :param source_language: The source language of the translation.
-  :param target_language: The target language of the translation.
-  :param target_translations: The translations that have already been generated.
+  :param items: The items to split.
+  :param size: The maximum size of each list.
+  :return: A generator of the lists of items, in order.
+  """
+  chunk = []
+  for item in items:
+    chunk.append(item)
+    if len(chunk) >= size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+def source_values(source_translations: list[list[str] | str]) -> list[str]:
+  """
+  Get the unique texts to translate of the given source translations, including the elements of lists.
+
+  The values that are not texts, like numbers or booleans, are left out, since they are kept as is in every language.
+
+  :param source_translations: The source translations.
+  :return: The unique values, in the order they first appear.
+  """
+  values = {}
+  for source_translation in source_translations:
+    for value in (source_translation if isinstance(source_translation, list) else [source_translation]):
+      if isinstance(value, str):
+        values[value] = None
+  return list(values)
+
+def translate_values(values_by_language: dict[str, list[str]], translations_by_language: dict[str, dict[str, str]], source_language: str, client_class: BaseClient, scheduler: QuotaScheduler, translation_memory: TranslationMemory = None, journal: CheckpointJournal = None, normalized_index: NormalizedIndex = None, payload_compactor: PayloadCompactor = None, cost_report: CostReport = None, verbose: bool = True, log=print) -> None:
+  """
+  Translate each unique value once per target language.
+
+  The values are looked up in the checkpoint journal and in the translation memory first, then the remaining ones are translated in batches.
+  With a payload compactor, the values that need no translation are kept as is, and only the part of each value that needs a translation is sent.
+  With a normalized index, the values matching a known translation once normalized reuse it, and the values sharing a normalized form are translated once, the other ones reusing that translation.
+  When a cost report is given, the batches are only accounted in it instead of being translated, and the source values are used in place of their translations.
+  The translations are added to translations_by_language as soon as each batch is done, so that the ones obtained before an error are kept.
+
+  :param values_by_language: The unique values to translate, keyed by target language.
+  :param translations_by_language: The translations, keyed by target language then by source value.
+  :param source_language: The source language of the values.
   :param client_class: The client class to use for translation.
-  :param clients: The clients to use for translation.
+  :param scheduler: The scheduler spreading the translations across clients.
+  :param translation_memory: The translation memory to look up and store translations in, if any.
+  :param journal: The checkpoint journal to resume translations from and to record them in, if any.
+  :param normalized_index: The index of known translations by normalized text to reuse and to add translations to, if any.
+  :param payload_compactor: The compactor keeping the values that need no translation out of the requests and trimming the other ones, if any.
+  :param cost_report: The report accounting the characters that would be billed, for a dry run.
+  :param verbose: Whether to log each value to translate.
+  :param log: The function used to log messages.
+  """
+  batches = []
+  variants_by_language = {}
+  for target_language, values in values_by_language.items():
+    translations = translations_by_language.setdefault(target_language, {})
+    missing_values = [value for value in values if value not in translations]
+    if payload_compactor is not None and missing_values:
+      untranslatable_values = [value for value in missing_values if not payload_compactor.is_translatable(value)]
+      if untranslatable_values:
+        log(f"[{target_language}] Kept {len(untranslatable_values)} values that need no translation" + (f": {untranslatable_values}" if verbose else ""))
+        translations.update(zip(untranslatable_values, untranslatable_values))
+        missing_values = [value for value in missing_values if value not in translations]
+    if journal is not None and missing_values:
+      resumed_translations = journal.lookup(texts=missing_values, source_language=source_language, target_language=target_language)
+      if resumed_translations:
+        log(f"[{target_language}] Resumed {len(resumed_translations)} translations from the checkpoint journal")
+        translations.update(resumed_translations)
+        missing_values = [value for value in missing_values if value not in resumed_translations]
+    if translation_memory is not None and missing_values:
+      remembered_translations = translation_memory.lookup(texts=missing_values, source_language=source_language, target_language=target_language)
+      log(f"[{target_language}] Found {len(remembered_translations)} translations in the translation memory")
+      translations.update(remembered_translations)
+      missing_values = [value for value in missing_values if value not in remembered_translations]
+    if normalized_index is not None and missing_values:
+      normalized_index.add(translations={ value: translations[value] for value in values if value in translations }, target_language=target_language)
+      reused_translations = normalized_index.lookup(texts=missing_values, target_language=target_language)
+      if reused_translations:
+        log(f"[{target_language}] Reused {len(reused_translations)} translations of values differing only by placeholders, whitespace or punctuation")
+        translations.update(reused_translations)
+        missing_values = [value for value in missing_values if value not in reused_translations]
+      representatives = {}
+      variants = variants_by_language.setdefault(target_language, {})
+      for value in missing_values:
+        representative = representatives.setdefault(normalized_index.key(value) or value, value)
+        if representative != value:
+          variants.setdefault(representative, []).append(value)
+      missing_values = list(representatives.values())
+    if verbose:
+      for value in missing_values:
+        log(f"[{target_language}] {'Would translate' if cost_report is not None else 'Translating'} '{value}' from '{source_language}' to {target_language}")
+    else:
+      log(f"[{target_language}] {'Would translate' if cost_report is not None else 'Translating'} {len(missing_values)} values from '{source_language}' to {target_language}")
+    batches.extend((target_language, batch) for batch in client_class.batches(missing_values))
+
+  def translate_batch(target_language: str, batch: list[str]) -> None:
+    parts = [payload_compactor.compact(value) if payload_compactor is not None else ("", value, "") for value in batch]
+    texts = list(dict.fromkeys(text for _, text, _ in parts))
+    if cost_report is not None:
+      client, characters_counts = scheduler.estimate(texts=texts, source_language=source_language, target_language=target_language)
+      characters_counts_by_text = dict(zip(texts, characters_counts))
+      # Each text sent is billed to the first value it is part of
+      cost_report.add(target_language=target_language, client=client, texts=batch, characters_counts=[characters_counts_by_text.pop(text, 0) for _, text, _ in parts])
+      translations_by_language[target_language].update(zip(batch, batch))
+      translations_by_language[target_language].update((variant, variant) for value in batch for variant in variants_by_language.get(target_language, {}).get(value, []))
+      return
+    translated_texts = dict(zip(texts, scheduler.translate(texts=texts, source_language=source_language, target_language=target_language)))
+    translated_values = [prefix + translated_texts[text] + suffix if translated_texts[text] is not None else None for prefix, text, suffix in parts]
+    translations = { value: translated_value for value, translated_value in zip(batch, translated_values) if translated_value is not None }
+    if len(translations) < len(batch):
+      rejected_values = [value for value in batch if value not in translations]
+      log(f"[{target_language}] Rejected {len(rejected_values)} translations whose placeholders did not come back" + (f": {rejected_values}" if verbose else ""))
+    if normalized_index is not None:
+      normalized_index.add(translations=translations, target_language=target_language)
+      translations |= normalized_index.lookup(texts=[variant for value in translations for variant in variants_by_language.get(target_language, {}).get(value, [])], target_language=target_language)
+    if translation_memory is not None:
+      translation_memory.store(translations=translations, source_language=source_language, target_language=target_language)
+    if journal is not None:
+      journal.store(translations=translations, source_language=source_language, target_language=target_language)
+    translations_by_language[target_language].update(translations)
+
+  for target_language, batch in batches:
+    translate_batch(target_language, batch)
+
+def is_translated(source_translation: list[str] | str, translations: dict[str, str]) -> bool:
+  """
+  Check if a source translation, or all its elements for a list, have been translated. The values that are not texts need no translation.
+
+  :param source_translation: The source translation.
+  :param translations: The translations, keyed by source value.
+  :return: True if the source translation has been translated, False otherwise.
+  """
+  return all(value in translations or not isinstance(value, str) for value in (source_translation if isinstance(source_translation, list) else [source_translation]))
+
+def generate_target_translation(source_translation: list[str] | str, translations: dict[str, str]) -> list[str] | str:
+  """
+  Generate the target translation for the given source translation, keeping the values that are not texts as is.
+
+  :param source_translation: The source translation to generate the target translation for.
+  :param translations: The translations, keyed by source value.
   :return: The target translation for the given source translation.
   """
-  if type(source_translation) == list:
-    target_translation = []
-    for value in source_translation:
-      if value not in target_translations:
-        print(f"[{source_file} - {target_language}] Translating '{value}' from '{source_language}' to {target_language}")
-        target_translations[value] = client_class.best_client(clients).translate(texts=[value], source_language=source_language, target_language=target_language)[0]
-      target_translation.append(target_translations[value])
-  else:
-    if source_translation not in target_translations:
-      print(f"[{source_file} - {target_language}] Translating '{source_translation}' from '{source_language}' to {target_language}")
-      target_translations[source_translation] = client_class.best_client(clients).translate(texts=[source_translation], source_language=source_language, target_language=target_language)[0]
-    target_translation = target_translations[source_translation]
-  return target_translation
+  if isinstance(source_translation, list):
+    return [translations[value] if isinstance(value, str) else value for value in source_translation]
+  return translations[source_translation] if isinstance(source_translation, str) else source_translation
@@ -0,0 +1,59 @@
+import pickle
+import sqlite3
+from typing import Iterable
+
+class ValueStore:
+  """
+  Values of a document keyed by key path, kept in a temporary SQLite database so that large documents are not held in memory.
+
+  The database lives in a temporary file deleted when the store is closed, and SQLite only keeps a bounded cache of it in memory.
+  """
+  __INSERT_CHUNK_SIZE = 1000
+  __LOOKUP_CHUNK_SIZE = 500
+
+  def __init__(self, values: Iterable[tuple[tuple, object]]) -> None:
+    self.__connection = sqlite3.connect("")
+    self.__connection.execute("CREATE TABLE vals (key_path TEXT PRIMARY KEY, value BLOB NOT NULL)")
+    rows = []
+    for key_path, value in values:
+      rows.append((self.__encode_key_path(key_path), pickle.dumps(value)))
+      if len(rows) >= self.__INSERT_CHUNK_SIZE:
+        self.__connection.executemany("INSERT OR REPLACE INTO vals VALUES (?, ?)", rows)
+        rows = []
+    self.__connection.executemany("INSERT OR REPLACE INTO vals VALUES (?, ?)", rows)
+    self.__connection.commit()
+
+  def get_many(self, key_paths: list[tuple]) -> dict[tuple, object]:
+    """
+    Get the values at the given key paths.
+
+    :param key_paths: The key paths.
+    :return: The values found, keyed by key path.
+    """
+    key_paths_by_encoded_key_path = { self.__encode_key_path(key_path): key_path for key_path in key_paths }
+    encoded_key_paths = list(key_paths_by_encoded_key_path)
+    values = {}
+    for index in range(0, len(encoded_key_paths), self.__LOOKUP_CHUNK_SIZE):
+      chunk = encoded_key_paths[index:index + self.__LOOKUP_CHUNK_SIZE]
+      rows = self.__connection.execute(f"SELECT key_path, value FROM vals WHERE key_path IN ({', '.join('?' * len(chunk))})", chunk)
+      for encoded_key_path, value in rows:
+        values[key_paths_by_encoded_key_path[encoded_key_path]] = pickle.loads(value)
+    return values
+
+  def close(self) -> None:
+    """
+    Close the store, deleting its temporary database.
+    """
+    self.__connection.close()
+
+  # --- Private methods ---
+
+  @staticmethod
+  def __encode_key_path(key_path: tuple) -> str:
+    """
+    Encode a key path as a database key.
+
+    :param key_path: The key path.
+    :return: The encoded key path.
+    """
+    return repr(key_path)
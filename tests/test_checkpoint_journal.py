@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from checkpoint_journal import CheckpointJournal
+
+class TestCheckpointJournal(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, "journal.jsonl")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def open(self, placeholders="%{.*?}", checkpoint_interval=0, read_only=False):
+    return CheckpointJournal(file_path=self.file_path, provider="deepl", placeholders=placeholders, checkpoint_interval=checkpoint_interval, read_only=read_only)
+
+  def read_lines(self):
+    with open(self.file_path, encoding="utf-8") as file:
+      return file.read().splitlines()
+
+  def test_interrupted_runs_are_resumed(self):
+    journal = self.open()
+    journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    journal.store({ "Hello": "Hallo" }, source_language="EN", target_language="DE")
+    journal.close(is_completed=False)
+    journal = self.open()
+    self.assertEqual(journal.lookup(["Hello", "Bye"], source_language="EN", target_language="FR"), { "Hello": "Bonjour" })
+    self.assertEqual(journal.lookup(["Hello"], source_language="EN", target_language="DE"), { "Hello": "Hallo" })
+    self.assertEqual(journal.statistics(), { "resumed": 2, "checkpointed": 0 })
+    journal.close(is_completed=True)
+    self.assertFalse(os.path.exists(self.file_path))
+
+  def test_truncated_and_duplicate_lines_are_dropped_when_resuming(self):
+    journal = self.open()
+    journal.store({ "Hello": "Salut" }, source_language="EN", target_language="FR")
+    journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    journal.close(is_completed=False)
+    with open(self.file_path, "a", encoding="utf-8") as file:
+      file.write('{"source_language": "EN", "tar')
+    journal = self.open()
+    self.assertEqual(journal.lookup(["Hello"], source_language="EN", target_language="FR"), { "Hello": "Bonjour" })
+    journal.close(is_completed=False)
+    self.assertEqual(len(self.read_lines()), 2)
+
+  def test_journals_written_with_other_settings_are_discarded(self):
+    journal = self.open()
+    journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    journal.close(is_completed=False)
+    journal = self.open(placeholders="{{.*?}}")
+    self.assertEqual(journal.lookup(["Hello"], source_language="EN", target_language="FR"), {})
+    journal.close(is_completed=False)
+    self.assertEqual(len(self.read_lines()), 1)
+
+  def test_translations_are_checkpointed_once_the_interval_has_elapsed(self):
+    journal = self.open(checkpoint_interval=3600)
+    journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    self.assertEqual(len(self.read_lines()), 1)
+    journal.close(is_completed=False)
+    self.assertEqual(len(self.read_lines()), 2)
+    self.assertEqual(journal.statistics()["checkpointed"], 1)
+
+  def test_read_only_journal_resumes_without_being_written(self):
+    journal = self.open()
+    journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    journal.close(is_completed=False)
+    with open(self.file_path, "a", encoding="utf-8") as file:
+      file.write('{"source_language": "EN", "tar')
+    with open(self.file_path, encoding="utf-8") as file:
+      content = file.read()
+    journal = self.open(read_only=True)
+    self.assertEqual(journal.lookup(["Hello", "World"], source_language="EN", target_language="FR"), { "Hello": "Bonjour" })
+    journal.store({ "World": "Monde" }, source_language="EN", target_language="FR")
+    journal.close(is_completed=True)
+    with open(self.file_path, encoding="utf-8") as file:
+      self.assertEqual(file.read(), content)
+
+  def test_missing_read_only_journal_is_not_created(self):
+    journal = self.open(read_only=True)
+    self.assertEqual(journal.lookup(["Hello"], source_language="EN", target_language="FR"), {})
+    journal.close(is_completed=False)
+    self.assertFalse(os.path.exists(self.file_path))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.base import BaseClient
+
+class TestClientRetries(unittest.TestCase):
+  def client(self, outcomes):
+    client = BaseClient(api_key="key", max_retries=3)
+    self.addCleanup(client.close)
+    responses = []
+    for outcome in outcomes:
+      if isinstance(outcome, int):
+        response = requests.Response()
+        response.status_code = outcome
+        response._content = b"{}"
+        outcome = response
+      responses.append(outcome)
+    client._session.request = mock.Mock(side_effect=responses)
+    return client
+
+  def test_rate_limited_and_failed_requests_are_retried(self):
+    client = self.client([429, requests.ConnectionError(), 503, 200])
+    with mock.patch("time.sleep"):
+      self.assertEqual(client._post("https://api.test/translate").status_code, 200)
+    self.assertEqual(client.statistics()["retries"], 3)
+
+  def test_retries_stop_after_max_retries(self):
+    client = self.client([503] * 4)
+    with mock.patch("time.sleep"):
+      self.assertEqual(client._get("https://api.test/usage").status_code, 503)
+    self.assertEqual(client._session.request.call_count, 4)
+
+  def test_read_timeouts_are_only_retried_for_get_requests(self):
+    client = self.client([requests.ReadTimeout(), 200])
+    with mock.patch("time.sleep"):
+      self.assertEqual(client._get("https://api.test/usage").status_code, 200)
+    client = self.client([requests.ReadTimeout(), 200])
+    with mock.patch("time.sleep"), self.assertRaises(requests.ReadTimeout):
+      client._post("https://api.test/translate")
+    self.assertEqual(client._session.request.call_count, 1)
+
+  def test_connect_timeouts_are_retried_for_post_requests(self):
+    client = self.client([requests.ConnectTimeout(), 200])
+    with mock.patch("time.sleep"):
+      self.assertEqual(client._post("https://api.test/translate").status_code, 200)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,64 @@
+import http.server
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.base import BaseClient
+
+class KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+
+  def do_GET(self):
+    self.server.client_ports.append(self.client_address[1])
+    self.send_response(200)
+    self.send_header("Content-Length", "2")
+    self.end_headers()
+    self.wfile.write(b"{}")
+
+  def do_POST(self):
+    self.rfile.read(int(self.headers["Content-Length"]))
+    self.do_GET()
+
+  def log_message(self, *_args):
+    pass
+
+class TestClientSessions(unittest.TestCase):
+  def setUp(self):
+    self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    self.server.client_ports = []
+    self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+    threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+  def tearDown(self):
+    self.server.shutdown()
+    self.server.server_close()
+
+  def test_requests_reuse_the_connection_kept_alive(self):
+    client = BaseClient(api_key="key", timeout=(1, 1))
+    self.addCleanup(client.close)
+    for _ in range(3):
+      self.assertEqual(client._get(f"{self.url}/usage").status_code, 200)
+      self.assertEqual(client._post(f"{self.url}/translate", data="text=Hello").status_code, 200)
+    self.assertEqual(len(self.server.client_ports), 6)
+    self.assertEqual(len(set(self.server.client_ports)), 1)
+    statistics = client.statistics()
+    self.assertEqual(statistics["requests"], 6)
+    self.assertEqual(statistics["bytes_sent"], 3 * len("text=Hello"))
+    self.assertEqual(statistics["bytes_received"], 6 * 2)
+
+  def test_concurrent_requests_are_bounded_by_the_pool_size(self):
+    client = BaseClient(api_key="key", pool_size=2, timeout=(1, 1))
+    self.addCleanup(client.close)
+    threads = [threading.Thread(target=lambda: [client._get(f"{self.url}/usage") for _ in range(5)]) for _ in range(2)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertEqual(len(self.server.client_ports), 10)
+    self.assertLessEqual(len(set(self.server.client_ports)), 2)
+
+if __name__ == "__main__":
+  unittest.main()
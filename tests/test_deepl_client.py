@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.deepl import DeeplClient
+
+class TestDeeplClient(unittest.TestCase):
+  LIVE_LANGUAGES = { "source": ["DE", "EN", "FR", "PT"], "target": ["DE", "EN-GB", "EN-US", "FR", "PT-BR", "PT-PT"] }
+
+  def client(self, languages=None):
+    client = DeeplClient(api_key="key:fx")
+    client._DeeplClient__languages = languages
+    self.addCleanup(client.close)
+    return client
+
+  def test_bare_languages_fall_back_to_their_default_regional_variant(self):
+    client = self.client(self.LIVE_LANGUAGES)
+    self.assertTrue(client.supports_languages("en", "pt"))
+    self.assertTrue(client.supports_languages("fr", "en"))
+    self.assertEqual(client._match_language("en", self.LIVE_LANGUAGES["target"]), "EN-US")
+    self.assertEqual(client._match_language("pt", self.LIVE_LANGUAGES["target"]), "PT-PT")
+    self.assertEqual(client._match_language("pt_br", self.LIVE_LANGUAGES["target"]), "PT-BR")
+    self.assertEqual(client._match_language("de-AT", self.LIVE_LANGUAGES["target"]), "DE")
+
+  def test_known_languages_keep_their_bare_form(self):
+    client = self.client()
+    self.assertEqual(client._match_language("en", client._supported_languages()[1]), "EN")
+    self.assertFalse(client.supports_languages("en", "tl"))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,57 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import JsonFile, YamlFile
+
+class TestFileWrites(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_files_with_the_same_content_are_left_untouched(self):
+    for file_class in [YamlFile, JsonFile]:
+      file_path = os.path.join(self.directory.name, "fr", f"fr.{file_class._extension()}")
+      self.assertTrue(file_class.write(file_path, { "fr": { "hello": "Bonjour" } }))
+      os.utime(file_path, ns=(0, 0))
+      self.assertFalse(file_class.write(file_path, { "fr": { "hello": "Bonjour" } }))
+      self.assertEqual(os.stat(file_path).st_mtime_ns, 0)
+      self.assertFalse(file_class.write_values(file_path, [(("fr", "hello"), "Bonjour")]))
+      self.assertEqual(os.stat(file_path).st_mtime_ns, 0)
+      self.assertTrue(file_class.write(file_path, { "fr": { "hello": "Salut" } }))
+      self.assertEqual(file_class.read(file_path), { "fr": { "hello": "Salut" } })
+    self.assertEqual(sorted(os.listdir(os.path.join(self.directory.name, "fr"))), ["fr.json", "fr.yml"])
+
+  def test_replaced_files_keep_their_permissions(self):
+    file_path = os.path.join(self.directory.name, "fr.yml")
+    YamlFile.write(file_path, { "fr": { "hello": "Bonjour" } })
+    os.chmod(file_path, 0o640)
+    YamlFile.write(file_path, { "fr": { "hello": "Salut" } })
+    self.assertEqual(stat.S_IMODE(os.stat(file_path).st_mode), 0o640)
+
+  def test_streamed_values_are_only_written_when_they_should_replace_the_file(self):
+    file_path = os.path.join(self.directory.name, "fr.yml")
+    self.assertFalse(YamlFile.write_values(file_path, [(("fr", "hello"), "Bonjour")], should_replace=lambda: False))
+    self.assertEqual(os.listdir(self.directory.name), [])
+    self.assertTrue(YamlFile.write_values(file_path, [(("fr", "hello"), "Bonjour")], should_replace=lambda: True))
+    self.assertEqual(YamlFile.read(file_path), { "fr": { "hello": "Bonjour" } })
+
+  def test_interrupted_writes_leave_the_file_and_no_temporary_file(self):
+    file_path = os.path.join(self.directory.name, "fr.yml")
+    YamlFile.write(file_path, { "fr": { "hello": "Bonjour" } })
+    def values():
+      yield ("fr", "hello"), "Salut"
+      raise KeyboardInterrupt
+    with self.assertRaises(KeyboardInterrupt):
+      YamlFile.write_values(file_path, values())
+    self.assertEqual(os.listdir(self.directory.name), ["fr.yml"])
+    self.assertEqual(YamlFile.read(file_path), { "fr": { "hello": "Bonjour" } })
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from instrumentation import Instrumentation
+
+class TestInstrumentation(unittest.TestCase):
+  def test_timers_accumulate_their_durations(self):
+    instrumentation = Instrumentation()
+    instrumentation.record("parse", 0.5)
+    instrumentation.record("parse", 1.5)
+    with self.assertRaises(ValueError), instrumentation.timer("write"):
+      raise ValueError
+    timers = instrumentation.timers()
+    self.assertEqual(timers["parse"], { "count": 2, "total_seconds": 2.0, "max_seconds": 1.5 })
+    self.assertEqual(timers["write"]["count"], 1)
+
+  def test_counters_are_incremented_from_several_threads(self):
+    instrumentation = Instrumentation()
+    threads = [threading.Thread(target=lambda: [instrumentation.increment("keys") for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    instrumentation.increment("files", 3)
+    self.assertEqual(instrumentation.counters(), { "keys": 4000, "files": 3 })
+
+  def test_reports_are_written_as_json_and_markdown(self):
+    instrumentation = Instrumentation()
+    instrumentation.increment("files", 2)
+    instrumentation.record("translate", 0.25)
+    report = { "duration_seconds": 1.0, "counters": instrumentation.counters(), "timers": instrumentation.timers(), "http": { "API key #1": { "requests": 4, "retries": 1, "bytes_sent": 100, "bytes_received": 200, "total_latency_seconds": 2.0 } } }
+    with tempfile.TemporaryDirectory() as directory:
+      Instrumentation.write_json(os.path.join(directory, "report.json"), report)
+      with open(os.path.join(directory, "report.json")) as file:
+        self.assertEqual(json.load(file), report)
+      Instrumentation.write_step_summary(os.path.join(directory, "summary.md"), report)
+      with open(os.path.join(directory, "summary.md")) as file:
+        summary = file.read()
+    self.assertIn("| files | 2 |", summary)
+    self.assertIn("| translate | 1 | 0.250 | 0.250 |", summary)
+    self.assertIn("| API key #1 | 4 | 1 | 100 | 200 | 0.500 |", summary)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import KeyIndex
+from files.base import BaseFile
+
+class TestKeyIndex(unittest.TestCase):
+  def test_missing_key_paths_are_the_absent_values_and_the_ones_of_another_kind(self):
+    source = KeyIndex({ "en": { "hello": "Hello", "menu": { "open": "Open", "close": "Close" }, "days": ["Mon", "Tue"], "count": 3, "unset": None } })
+    target = KeyIndex({ "en": { "hello": "Bonjour", "menu": { "open": "Ouvrir" }, "days": "Lun", "count": 3, "extra": "Extra" } })
+    self.assertEqual(source.missing_key_paths(target), [("en", "menu", "close"), ("en", "days")])
+    self.assertEqual(source.values(), { ("en", "hello"): "Hello", ("en", "menu", "open"): "Open", ("en", "menu", "close"): "Close", ("en", "days"): ["Mon", "Tue"], ("en", "count"): 3 })
+
+  def test_missing_keys_keep_the_format_of_base_file(self):
+    self.assertEqual(BaseFile.find_missing_keys({ "a": { "b": "B", "c": "C" } }, { "a": { "b": "B" } }), [["a", "c"]])
+
+  def test_prune_removes_the_keys_missing_from_the_model(self):
+    index = KeyIndex({ "fr": { "hello": "Bonjour", "old": "Vieux", "menu": { "open": "Ouvrir", "gone": { "deep": "Profond" } }, "stale": { "key": "Clé" } } })
+    index.prune(KeyIndex({ "fr": { "hello": "Hello", "menu": { "open": "Open" } } }))
+    self.assertEqual(index.data(), { "fr": { "hello": "Bonjour", "menu": { "open": "Ouvrir" } } })
+    self.assertEqual(index.values(), { ("fr", "hello"): "Bonjour", ("fr", "menu", "open"): "Ouvrir" })
+    index.set(("fr", "stale", "key"), "Clé")
+    self.assertEqual(index.data()["fr"]["stale"], { "key": "Clé" })
+
+  def test_prune_useless_keys_leaves_the_original_untouched(self):
+    original = { "fr": { "hello": "Bonjour", "old": "Vieux" } }
+    self.assertEqual(BaseFile.prune_useless_keys(original, { "fr": { "hello": "Hello" } }), { "fr": { "hello": "Bonjour" } })
+    self.assertEqual(original, { "fr": { "hello": "Bonjour", "old": "Vieux" } })
+
+  def test_set_creates_and_replaces_nested_dictionaries(self):
+    index = KeyIndex({ "fr": { "menu": "Menu", "title": { "main": "Titre" } } })
+    index.set(("fr", "menu", "open"), "Ouvrir")
+    index.set(("fr", "title"), "Titre")
+    index.set(("fr", "new", "deep", "key"), "Clé")
+    self.assertEqual(index.data(), { "fr": { "menu": { "open": "Ouvrir" }, "title": "Titre", "new": { "deep": { "key": "Clé" } } } })
+    self.assertEqual(index.values(), { ("fr", "title"): "Titre", ("fr", "menu", "open"): "Ouvrir", ("fr", "new", "deep", "key"): "Clé" })
+    self.assertEqual(index.get(("fr", "menu", "open")), "Ouvrir")
+
+if __name__ == "__main__":
+  unittest.main()
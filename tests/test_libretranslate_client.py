@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.base import BaseClient
+from client.factory import ClientFactory
+from client.libretranslate import LibreTranslateClient
+
+class TestLibreTranslateClient(unittest.TestCase):
+  LANGUAGES = [{ "code": "en", "targets": ["fr", "pt-BR"] }, { "code": "fr", "targets": ["en"] }]
+
+  def client(self, api_key=""):
+    client = LibreTranslateClient(api_key=api_key, variable_pattern="%{.*?}", api_url="https://translate.test/")
+    self.addCleanup(client.close)
+    self.bodies = []
+    client._session.request = mock.Mock(side_effect=self.respond)
+    return client
+
+  def respond(self, _method, url, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    if url == "https://translate.test/languages":
+      body = self.LANGUAGES
+    else:
+      data = json.loads(kwargs["data"])
+      self.bodies.append(data)
+      # Translates the text around the tags, like the API does with HTML
+      body = { "translatedText": [f"[{data['target']}] {text}" for text in data["q"]] }
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+  def test_texts_are_sent_as_html_with_their_placeholders_protected(self):
+    client = self.client()
+    self.assertEqual(client.translate(["Hello %{name} & <friends>", "Bye"], source_language="EN", target_language="pt_br"), ["[pt-BR] Hello %{name} & <friends>", "[pt-BR] Bye"])
+    self.assertEqual(self.bodies, [{ "q": ['Hello <x id="0"/> &amp; &lt;friends&gt;', "Bye"], "source": "en", "target": "pt-BR", "format": "html" }])
+    self.assertEqual(client.billed_characters(["Hello %{name} & <friends>"]), len('Hello <x id="0"/> &amp; &lt;friends&gt;'))
+
+  def test_api_key_is_only_sent_when_set(self):
+    self.client(api_key="secret").translate(["Hello"], source_language="en", target_language="fr")
+    self.assertEqual(self.bodies[0]["api_key"], "secret")
+
+  def test_texts_are_split_in_batches(self):
+    client = self.client()
+    self.assertEqual(len(client.translate([f"Text {index}" for index in range(120)], source_language="en", target_language="fr")), 120)
+    self.assertEqual([len(body["q"]) for body in self.bodies], [50, 50, 20])
+
+  def test_capabilities_come_from_the_languages_of_the_api(self):
+    client = self.client()
+    client.validate_api_key()
+    capabilities = client.capabilities()
+    self.assertEqual(capabilities["max_texts_per_request"], 50)
+    self.assertEqual(capabilities["source_languages"], ["en", "fr"])
+    self.assertEqual(capabilities["target_languages"], ["en", "fr", "pt-BR"])
+    self.assertTrue(client.supports_languages("EN", "FR"))
+    self.assertFalse(client.supports_languages("EN", "DE"))
+    with self.assertRaises(BaseClient.UnsupportedLanguageError):
+      client.translate(["Bonjour"], source_language="fr", target_language="pt-BR")
+
+  def test_factory_returns_the_client_of_the_api_type(self):
+    self.assertIs(ClientFactory.for_type("libretranslate"), LibreTranslateClient)
+    with self.assertRaises(ClientFactory.UnsupportedClientError):
+      ClientFactory.for_type("google")
+
+if __name__ == "__main__":
+  unittest.main()
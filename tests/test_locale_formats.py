@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import AndroidXmlFile, ArbFile, PoFile, StringsFile, XliffFile
+
+class TestLocaleFormats(unittest.TestCase):
+  PO = '# French translation\nmsgid ""\nmsgstr ""\n"Language: fr\\n"\n"Plural-Forms: nplurals=2; plural=(n > 1);\\n"\n\n#: app.py:1\nmsgid "Hello"\nmsgstr "Bonjour"\n\nmsgctxt "menu"\nmsgid "Open"\nmsgstr ""\n\nmsgid "%d file"\nmsgid_plural "%d files"\nmsgstr[0] "%d fichier"\nmsgstr[1] "%d fichiers"\n'
+  ANDROID = '<?xml version="1.0" encoding="utf-8"?>\n<resources>\n    <!-- Greeting -->\n    <string name="hello">Bonjour</string>\n    <string name="quote">L\\\'ami</string>\n    <string name="app" translatable="false">Acme</string>\n    <plurals name="files">\n        <item quantity="one">%d fichier</item>\n        <item quantity="other">%d fichiers</item>\n    </plurals>\n    <string-array name="days">\n        <item>Lundi</item>\n        <item>Mardi</item>\n    </string-array>\n</resources>\n'
+  STRINGS = '/* Greeting */\n"hello" = "Bonjour";\n// Quote\n"quote" = "Il a dit \\"oui\\"\\n";\n'
+  ARB = '{\n  "@@locale": "fr",\n  "hello": "Bonjour",\n  "@hello": {\n    "description": "Greeting"\n  },\n  "items": "{count, plural, one{Un élément} other{{count} éléments}}"\n}\n'
+  XLIFF = '<?xml version="1.0" encoding="UTF-8"?>\n<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n  <file source-language="en" target-language="fr" datatype="plaintext" original="messages">\n    <body>\n      <!-- Greeting -->\n      <trans-unit id="hello" datatype="html">\n        <source>Hello <x id="INTERPOLATION" equiv-text="{{ name }}"/></source>\n        <target state="translated">Bonjour <x id="INTERPOLATION" equiv-text="{{ name }}"/></target>\n      </trans-unit>\n      <trans-unit id="bye" datatype="html">\n        <source>Bye</source>\n      </trans-unit>\n    </body>\n  </file>\n</xliff>\n'
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write_file(self, file_name, content):
+    file_path = os.path.join(self.directory.name, file_name)
+    with open(file_path, "w", encoding="utf-8") as file:
+      file.write(content)
+    return file_path
+
+  def read_file(self, file_path):
+    with open(file_path, encoding="utf-8") as file:
+      return file.read()
+
+  def round_trip(self, file_class, file_name, content, translations):
+    file_path = self.write_file(file_name, content)
+    data = file_class.read(file_path)
+    self.assertFalse(file_class.write(file_path, data))
+    data.update(translations)
+    self.assertTrue(file_class.write(file_path, data))
+    self.assertEqual({ key: file_class.read(file_path)[key] for key in translations }, translations)
+    return self.read_file(file_path)
+
+  def test_po_files_round_trip(self):
+    self.assertEqual(PoFile.read(self.write_file("fr.po", self.PO)), { "Hello": "Bonjour", "menu\x04Open": None, "%d file": ["%d fichier", "%d fichiers"] })
+    content = self.round_trip(PoFile, "fr.po", self.PO, { "Hello": "Salut", "menu\x04Open": "Ouvrir" })
+    self.assertEqual(content, self.PO.replace('msgstr "Bonjour"', 'msgstr "Salut"').replace('msgid "Open"\nmsgstr ""', 'msgid "Open"\nmsgstr "Ouvrir"'))
+
+  def test_android_files_round_trip(self):
+    self.assertEqual(AndroidXmlFile.read(self.write_file("strings.xml", self.ANDROID)), { "hello": "Bonjour", "quote": "L'ami", "files": ["%d fichier", "%d fichiers"], "days": ["Lundi", "Mardi"] })
+    content = self.round_trip(AndroidXmlFile, "strings.xml", self.ANDROID, { "hello": "Salut", "new": "Nouveau l'ami" })
+    self.assertEqual(content, self.ANDROID.replace(">Bonjour<", ">Salut<").replace("</resources>", "    <string name=\"new\">Nouveau l\\'ami</string>\n</resources>"))
+
+  def test_strings_files_round_trip(self):
+    self.assertEqual(StringsFile.read(self.write_file("fr.strings", self.STRINGS)), { "hello": "Bonjour", "quote": "Il a dit \"oui\"\n" })
+    content = self.round_trip(StringsFile, "fr.strings", self.STRINGS, { "hello": "Salut", "new": "Tab\there \"q\"" })
+    self.assertEqual(content, self.STRINGS.replace('"Bonjour"', '"Salut"') + '"new" = "Tab\\there \\"q\\"";\n')
+
+  def test_utf16_strings_files_are_read(self):
+    file_path = os.path.join(self.directory.name, "fr.strings")
+    with open(file_path, "w", encoding="utf-16") as file:
+      file.write(self.STRINGS)
+    self.assertEqual(StringsFile.read(file_path)["hello"], "Bonjour")
+
+  def test_arb_files_round_trip(self):
+    self.assertEqual(ArbFile.read(self.write_file("app_fr.arb", self.ARB)), { "hello": "Bonjour", "items": ["Un élément", "{count} éléments"] })
+    content = self.round_trip(ArbFile, "app_fr.arb", self.ARB, { "hello": "Salut", "items": ["Un truc", "{count} trucs"] })
+    self.assertEqual(content, self.ARB.replace('"Bonjour"', '"Salut"').replace("élément", "truc"))
+
+  def test_xliff_files_round_trip(self):
+    self.assertEqual(XliffFile.read(self.write_file("messages.fr.xlf", self.XLIFF)), { "hello": 'Bonjour <x id="INTERPOLATION" equiv-text="{{ name }}"/>', "bye": None })
+    content = self.round_trip(XliffFile, "messages.fr.xlf", self.XLIFF, { "bye": "Au revoir" })
+    self.assertEqual(content, self.XLIFF.replace("<source>Bye</source>", "<source>Bye</source>\n        <target>Au revoir</target>"))
+
+  def test_new_xliff_target_files_get_the_header_and_units_of_the_source_file(self):
+    source_file_path = self.write_file("messages.xlf", self.XLIFF.replace(' target-language="fr"', "").replace('\n        <target state="translated">Bonjour <x id="INTERPOLATION" equiv-text="{{ name }}"/></target>', ""))
+    source_data = XliffFile.read_source(source_file_path)
+    self.assertEqual(source_data, { "hello": 'Hello <x id="INTERPOLATION" equiv-text="{{ name }}"/>', "bye": "Bye" })
+    target_data = XliffFile.prepare_target({}, source_data, "FR")
+    target_data.update({ "hello": 'Bonjour <x id="INTERPOLATION" equiv-text="{{ name }}"/>', "bye": "Au revoir" })
+    target_file_path = os.path.join(self.directory.name, "messages.fr.xlf")
+    XliffFile.write(target_file_path, target_data)
+    self.assertEqual(self.read_file(target_file_path), self.XLIFF.replace("      <!-- Greeting -->\n", "").replace(' state="translated"', "").replace("<source>Bye</source>", "<source>Bye</source>\n        <target>Au revoir</target>"))
+
+if __name__ == "__main__":
+  unittest.main()
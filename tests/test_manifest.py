@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from manifest import Manifest
+
+class TestManifest(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, "manifest.json")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write_shard(self, index, file_hash):
+    with open(f"{self.file_path}.shard-{index}", "w") as file:
+      json.dump({ "version": 1, "files": { "en.yml": { "fr": { "hash": file_hash, "values": {} } } }, "fingerprints": {} }, file)
+
+  def test_only_the_values_changed_since_the_last_run_are_reported(self):
+    manifest = Manifest(file_path=self.file_path)
+    manifest.update("en.yml", "fr", "v1", Manifest.hash_values({ ("en", "hello"): "Hello", ("en", "bye"): "Bye" }))
+    manifest.save()
+    manifest = Manifest.load(self.file_path)
+    self.assertTrue(manifest.is_up_to_date("en.yml", "fr", "v1"))
+    self.assertFalse(manifest.is_up_to_date("en.yml", "fr", "v2"))
+    self.assertFalse(manifest.is_up_to_date("en.yml", "de", "v1"))
+    value_hashes = Manifest.hash_values({ ("en", "hello"): "Hello!", ("en", "bye"): "Bye", ("en", "new"): "New" })
+    self.assertEqual(manifest.changed_keys("en.yml", "fr", value_hashes), [("en", "hello")])
+    self.assertEqual(manifest.unchanged_keys("en.yml", "fr", value_hashes), [("en", "bye")])
+    self.assertEqual(manifest.changed_keys("en.yml", "de", value_hashes), [])
+
+  def test_files_with_a_recorded_fingerprint_are_not_hashed_again(self):
+    source_file_path = os.path.join(self.directory.name, "en.yml")
+    with open(source_file_path, "w") as file:
+      file.write("en:\n  hello: Hello\n")
+    manifest = Manifest(file_path=self.file_path)
+    file_hash = manifest.file_hash(source_file_path, (1, 20))
+    self.assertEqual(file_hash, Manifest.hash_file(source_file_path))
+    manifest.save()
+    with open(source_file_path, "w") as file:
+      file.write("en:\n  hello: Hi\n")
+    manifest = Manifest.load(self.file_path)
+    self.assertEqual(manifest.file_hash(source_file_path, (1, 20)), file_hash)
+    self.assertNotEqual(manifest.file_hash(source_file_path, (2, 17)), file_hash)
+
+  def test_manifests_of_another_version_are_ignored(self):
+    with open(self.file_path, "w") as file:
+      json.dump({ "version": 0, "files": { "en.yml": { "fr": { "hash": "v1", "values": {} } } } }, file)
+    self.assertFalse(Manifest.load(self.file_path).is_up_to_date("en.yml", "fr", "v1"))
+
+  def test_shard_files_of_an_earlier_run_with_more_shards_are_ignored_and_deleted(self):
+    self.write_shard(1, "new")
+    self.write_shard(3, "stale")
+    manifest = Manifest.load(self.file_path, shard_count=2)
+    self.assertTrue(manifest.is_up_to_date("en.yml", "fr", "new"))
+    manifest.save(shard_index=1, includes=lambda _source_file, _target_language: True, shard_count=2)
+    self.assertTrue(os.path.exists(f"{self.file_path}.shard-1"))
+    self.assertFalse(os.path.exists(f"{self.file_path}.shard-3"))
+
+  def test_a_run_that_is_not_sharded_merges_every_shard_file(self):
+    self.write_shard(0, "first")
+    self.write_shard(1, "second")
+    manifest = Manifest.load(self.file_path)
+    self.assertTrue(manifest.is_up_to_date("en.yml", "fr", "second"))
+    manifest.save()
+    self.assertEqual(sorted(os.listdir(self.directory.name)), ["manifest.json"])
+
+if __name__ == "__main__":
+  unittest.main()
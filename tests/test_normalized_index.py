@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.placeholder_codec import PlaceholderCodec
+from normalized_index import NormalizedIndex
+
+class TestNormalizedIndex(unittest.TestCase):
+  def test_translations_are_adapted_to_the_placeholders_and_affixes_of_the_text(self):
+    index = NormalizedIndex()
+    index.add({ "Hello %{name}": "Bonjour %{name}" }, target_language="FR")
+    self.assertEqual(index.lookup(["Hello %{user}:", "  Hello %{name}"], target_language="FR"), { "Hello %{user}:": "Bonjour %{user}:", "  Hello %{name}": "  Bonjour %{name}" })
+    self.assertEqual(index.lookup(["Hello %{user}"], target_language="DE"), {})
+    self.assertEqual(index.statistics(), { "reused": 2 })
+
+  def test_translations_with_unknown_placeholders_are_not_reused(self):
+    index = NormalizedIndex()
+    index.add({ "Hello %{name}": "Bonjour %{name} %{other}" }, target_language="FR")
+    self.assertEqual(index.lookup(["Hello %{user}"], target_language="FR"), {})
+
+  def test_translations_whose_placeholders_cannot_be_restored_are_not_reused(self):
+    index = NormalizedIndex()
+    index.add({ "Hello %{name}": "Bonjour %{name}" }, target_language="FR")
+    with mock.patch.object(PlaceholderCodec, "decode", return_value=[None]):
+      self.assertEqual(index.lookup(["Hello %{user}"], target_language="FR"), {})
+
+  def test_literal_token_markup_is_adapted_like_a_placeholder(self):
+    index = NormalizedIndex()
+    index.add({ 'Hello <x id="1"/> world': 'Bonjour <x id="1"/> monde' }, target_language="FR")
+    self.assertEqual(index.lookup(['Hello <x id="2"/> world'], target_language="FR"), { 'Hello <x id="2"/> world': 'Bonjour <x id="2"/> monde' })
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from payload_compactor import PayloadCompactor
+from utils import generate_target_translation, is_translated, source_values
+
+class TestPayloadCompactor(unittest.TestCase):
+  def test_values_that_are_not_texts_are_not_translatable(self):
+    compactor = PayloadCompactor()
+    for value in (5, 1.5, True, False):
+      self.assertFalse(compactor.is_translatable(value))
+
+  def test_texts_with_letters_are_translatable(self):
+    compactor = PayloadCompactor()
+    self.assertTrue(compactor.is_translatable("Save"))
+    self.assertFalse(compactor.is_translatable("42"))
+
+  def test_texts_holding_token_markup_do_not_break_the_check(self):
+    compactor = PayloadCompactor()
+    self.assertTrue(compactor.is_translatable('Hello <x id="1"/> world'))
+    self.assertFalse(compactor.is_translatable('<x id="0"/> %{count}'))
+
+  def test_urls_emails_and_terms_are_not_translatable(self):
+    compactor = PayloadCompactor(terms=["Acme"])
+    for text in ("https://example.com/docs", "support@example.com", " Acme "):
+      self.assertFalse(compactor.is_translatable(text))
+
+  def test_compact_keeps_whitespace_and_wrapping_tags_apart(self):
+    compactor = PayloadCompactor()
+    self.assertEqual(compactor.compact("  <b><i>Save</i></b>\n"), ("  <b><i>", "Save", "</i></b>\n"))
+    self.assertEqual(compactor.compact("<b>Save</b> or <b>Cancel</b>"), ("", "<b>Save</b> or <b>Cancel</b>", ""))
+
+  def test_values_that_are_not_texts_pass_through(self):
+    source_translations = [5, 1.5, True, ["Save", 3, False]]
+    self.assertEqual(source_values(source_translations), ["Save"])
+    translations = { "Save": "Enregistrer" }
+    for source_translation in source_translations:
+      self.assertTrue(is_translated(source_translation, translations))
+    self.assertEqual([generate_target_translation(source_translation, translations) for source_translation in source_translations], [5, 1.5, True, ["Enregistrer", 3, False]])
+
+if __name__ == "__main__":
+  unittest.main()
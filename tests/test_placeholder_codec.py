@@ -0,0 +1,59 @@
+import html
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.placeholder_codec import PlaceholderCodec
+
+class TestPlaceholderCodec(unittest.TestCase):
+  def test_placeholders_of_every_syntax_round_trip(self):
+    codec = PlaceholderCodec(syntaxes=["mustache", "icu", "printf", "html"])
+    texts = ["Hello %{name}, you have {count} {{unread}} messages", "<b>%1$s</b> of %d", "No placeholder"]
+    encoded_texts, placeholders = codec.encode(texts)
+    self.assertEqual(encoded_texts[0], 'Hello <x id="0"/>, you have <x id="1"/> <x id="2"/> messages')
+    self.assertEqual(placeholders[1], ["<b>", "%1$s", "</b>", "%d"])
+    self.assertEqual(codec.decode(encoded_texts, placeholders), texts)
+
+  def test_moved_tokens_restore_their_placeholder(self):
+    codec = PlaceholderCodec()
+    encoded_texts, placeholders = codec.encode(["%{count} files in %{folder}"])
+    self.assertEqual(codec.decode(['<x id="1"/> : <x id="0"/> fichiers'], placeholders), ["%{folder} : %{count} fichiers"])
+
+  def test_translations_missing_or_repeating_a_token_are_rejected(self):
+    codec = PlaceholderCodec()
+    _, placeholders = codec.encode(["%{a} and %{b}", "%{a}"])
+    self.assertEqual(codec.decode(['<x id="0"/> et', '<x id="0"/><x id="0"/>'], placeholders), [None, None])
+
+  def test_literal_token_markup_round_trips(self):
+    codec = PlaceholderCodec()
+    texts = ['Hello <x id="0"/> world', 'Hi <x id="1"/> and %{name} <x id="INTERPOLATION" equiv-text="{{ name }}"/>']
+    encoded_texts, placeholders = codec.encode(texts)
+    self.assertEqual(placeholders[0], ['<x id="0"/>'])
+    self.assertEqual(placeholders[1], ['<x id="1"/>', "%{name}", '<x id="INTERPOLATION" equiv-text="{{ name }}"/>'])
+    self.assertEqual(codec.decode(encoded_texts, placeholders), texts)
+
+  def test_escaped_texts_round_trip(self):
+    codec = PlaceholderCodec()
+    texts = ["Tom & Jerry <3 %{name}"]
+    encoded_texts, placeholders = codec.encode(texts, escape=html.escape)
+    self.assertEqual(encoded_texts, ['Tom &amp; Jerry &lt;3 <x id="0"/>'])
+    self.assertEqual(codec.decode(encoded_texts, placeholders, unescape=html.unescape), texts)
+
+  def test_custom_variable_patterns_and_expanded_tokens(self):
+    codec = PlaceholderCodec(variable_pattern="{{(.*?)}}")
+    encoded_texts, placeholders = codec.encode(["Hi {{ user.name }}, %{kept}"])
+    self.assertEqual(encoded_texts, ['Hi <x id="0"/>, %{kept}'])
+    self.assertEqual(codec.decode(['Salut <x id="0"></x>, %{kept}'], placeholders), ["Salut {{ user.name }}, %{kept}"])
+
+  def test_strip_removes_the_placeholders(self):
+    codec = PlaceholderCodec(syntaxes=["printf"])
+    self.assertEqual(codec.strip('%{name}: %d <x id="1"/>'), ":  ")
+
+  def test_unsupported_syntaxes_are_refused(self):
+    with self.assertRaises(PlaceholderCodec.UnsupportedSyntaxError):
+      PlaceholderCodec(syntaxes=["ruby"])
+
+if __name__ == "__main__":
+  unittest.main()
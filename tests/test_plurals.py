@@ -0,0 +1,76 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import AndroidXmlFile, ArbFile, PoFile
+
+class TestPlurals(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write_source(self, file_name, content):
+    file_path = os.path.join(self.directory.name, file_name)
+    with open(file_path, "w") as file:
+      file.write(content)
+    return file_path
+
+  def translate(self, file_class, source_file_path, target_language, translations):
+    source_data = file_class.read_source(source_file_path)
+    target_data = file_class.prepare_target({}, source_data, target_language)
+    target_data.update(translations)
+    target_file_path = os.path.join(self.directory.name, f"{target_language}.{file_class._extension()}")
+    file_class.write(target_file_path, target_data)
+    with open(target_file_path) as file:
+      return file.read()
+
+  def test_new_po_file_gets_the_plural_forms_of_its_language(self):
+    source_file_path = self.write_source("en.po", 'msgid ""\nmsgstr ""\n"Language: en\\n"\n"Plural-Forms: nplurals=2; plural=(n != 1);\\n"\n\nmsgid "%d file"\nmsgid_plural "%d files"\nmsgstr[0] ""\nmsgstr[1] ""\n')
+    content = self.translate(PoFile, source_file_path, "PL", { "%d file": ["%d plik", "%d pliki"] })
+    self.assertIn('"Plural-Forms: nplurals=3; plural=(n==1 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);\\n"', content)
+    self.assertIn('msgstr[0] "%d plik"\nmsgstr[1] "%d pliki"\nmsgstr[2] "%d pliki"\n', content)
+    self.assertEqual(PoFile.read(os.path.join(self.directory.name, "PL.po"))["%d file"], ["%d plik", "%d pliki", "%d pliki"])
+    content = self.translate(PoFile, source_file_path, "JA", { "%d file": ["%d ファイル", "%d ファイル"] })
+    self.assertIn('"Plural-Forms: nplurals=1; plural=0;\\n"', content)
+    self.assertIn('msgstr[0] "%d ファイル"\n', content)
+    self.assertNotIn("msgstr[1]", content)
+
+  def test_new_po_file_of_an_unknown_language_has_no_plural_forms(self):
+    source_file_path = self.write_source("en.po", 'msgid ""\nmsgstr ""\n"Plural-Forms: nplurals=2; plural=(n != 1);\\n"\n\nmsgid "%d file"\nmsgid_plural "%d files"\nmsgstr[0] ""\nmsgstr[1] ""\n')
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      content = self.translate(PoFile, source_file_path, "TL", { "%d file": ["%d file", "%d files"] })
+    self.assertNotIn("Plural-Forms", content)
+    self.assertIn("[Warning]", output.getvalue())
+
+  def test_new_plurals_resource_gets_the_quantities_of_its_language(self):
+    source_file_path = self.write_source("strings.xml", '<resources>\n  <plurals name="files">\n    <item quantity="one">%d file</item>\n    <item quantity="other">%d files</item>\n  </plurals>\n</resources>\n')
+    content = self.translate(AndroidXmlFile, source_file_path, "RU", { "files": ["%d файл", "%d файлов"] })
+    self.assertIn('<item quantity="one">%d файл</item>\n    <item quantity="few">%d файлов</item>\n    <item quantity="many">%d файлов</item>\n    <item quantity="other">%d файлов</item>', content)
+    content = self.translate(AndroidXmlFile, source_file_path, "JA", { "files": ["%d ファイル", "%d ファイル"] })
+    self.assertIn('<plurals name="files">\n    <item quantity="other">%d ファイル</item>\n  </plurals>', content)
+
+  def test_only_the_branches_of_icu_plurals_are_translated(self):
+    source_file_path = self.write_source("app_en.arb", '{\n  "items": "{count, plural, =0{No items} one{One item} other{{count} items}}",\n  "title": "Hello {name}"\n}\n')
+    source_data = ArbFile.read_source(source_file_path)
+    self.assertEqual(source_data["items"], ["No items", "One item", "{count} items"])
+    self.assertEqual(source_data["title"], "Hello {name}")
+    content = self.translate(ArbFile, source_file_path, "FR", { "items": ["Aucun élément", "Un élément", "{count} éléments"], "title": "Bonjour {name}" })
+    self.assertIn('"items": "{count, plural, =0{Aucun élément} one{Un élément} other{{count} éléments}}"', content)
+    self.assertEqual(ArbFile.read(os.path.join(self.directory.name, "FR.arb"))["items"], ["Aucun élément", "Un élément", "{count} éléments"])
+
+  def test_icu_plurals_without_a_matching_structure_are_left_out(self):
+    source_file_path = self.write_source("app_en.arb", '{\n  "items": "{count, plural, one{One item} other{{count} items}}",\n  "title": "Hello"\n}\n')
+    content = self.translate(ArbFile, source_file_path, "FR", { "items": ["Un élément", "{count} éléments", "Trop"], "title": "Bonjour" })
+    self.assertNotIn('"items"', content)
+    self.assertIn('"title": "Bonjour"', content)
+
+if __name__ == "__main__":
+  unittest.main()
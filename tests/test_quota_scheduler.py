@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from client.base import BaseClient
+from client.deepl import DeeplClient
+from client.mock import MockClient
+from client.scheduler import QuotaScheduler
+
+class TestQuotaScheduler(unittest.TestCase):
+  def scheduler(self, api_keys):
+    clients = MockClient.generate_clients(api_keys=api_keys)
+    for client in clients:
+      self.addCleanup(client.close)
+    scheduler = QuotaScheduler(clients=clients)
+    scheduler.validate()
+    return scheduler, clients
+
+  def test_requests_are_spread_by_remaining_characters(self):
+    scheduler, clients = self.scheduler(["quota=300000", "quota=100000"])
+    for _ in range(8):
+      scheduler.translate(texts=["Hello"], source_language="EN", target_language="FR")
+    self.assertEqual([client.statistics()["requests"] - 1 for client in clients], [6, 2])
+
+  def test_clients_without_enough_billed_characters_are_excluded(self):
+    # The placeholder is billed as its token, which is longer than the text
+    scheduler, clients = self.scheduler(["quota=15", "quota=1000"])
+    self.assertEqual(scheduler.translate(texts=["Hi %{name}"], source_language="EN", target_language="FR"), ['[FR] Hi %{name}'])
+    self.assertEqual([client.usage() for client in clients], [15, 1000 - len('Hi <x id="0"/>')])
+
+  def test_running_out_of_characters_raises_a_usage_error(self):
+    scheduler, _ = self.scheduler(["quota=3"])
+    with self.assertRaises(BaseClient.UsageError):
+      scheduler.translate(texts=["Hello"], source_language="EN", target_language="FR")
+
+  def test_estimates_are_kept_apart_from_the_usage(self):
+    scheduler, clients = self.scheduler(["quota=10"])
+    client, characters_counts = scheduler.estimate(texts=["Hello", "World"], source_language="EN", target_language="FR")
+    self.assertIs(client, clients[0])
+    self.assertEqual(characters_counts, [5, 5])
+    self.assertEqual(scheduler.estimate(texts=["Again"], source_language="EN", target_language="FR")[0], None)
+    self.assertEqual(clients[0].usage(), 10)
+
+  def test_invalid_api_keys_fail_before_any_translation(self):
+    clients = MockClient.generate_clients(api_keys=["quota=100", "invalid=true"])
+    for client in clients:
+      self.addCleanup(client.close)
+    with self.assertRaises(BaseClient.InvalidApiKeyError):
+      QuotaScheduler(clients=clients).validate()
+
+  def test_unsupported_target_languages_are_found_before_any_translation(self):
+    clients = [DeeplClient(api_key="key:fx"), DeeplClient(api_key="other-key:fx")]
+    for client in clients:
+      self.addCleanup(client.close)
+    scheduler = QuotaScheduler(clients=clients)
+    self.assertEqual(scheduler.unsupported_target_languages(source_language="en", target_languages=["fr", "tl", "pt_BR", "xx"]), ["tl", "xx"])
+    with self.assertRaises(BaseClient.UnsupportedLanguageError):
+      scheduler.unsupported_target_languages(source_language="tl", target_languages=["fr"])
+    self.assertEqual([client.statistics()["requests"] for client in clients], [0, 0])
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import JsonFile, KeyIndex, YamlFile
+from files.base import BaseFile
+
+class TestStreaming(unittest.TestCase):
+  DATA = {
+    "en": {
+      "hello": "Hello %{name}",
+      "quote": "She said \"hi\": it's {fine}",
+      "multiline": "First line\nSecond line",
+      "long": "A long sentence " * 20,
+      "unicode": "Café ✓ 日本語",
+      "special": "- yes",
+      "numbers": { "count": 3, "ratio": 0.5, "enabled": True },
+      "days": ["Mon", "Tue", { "nested": "value" }],
+      "menu": { "file": { "open": "Open", "close": "Close" }, "edit": "Edit" },
+      "after": "After"
+    }
+  }
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write_both(self, file_class):
+    file_path = os.path.join(self.directory.name, f"written.{file_class._extension()}")
+    streamed_file_path = os.path.join(self.directory.name, f"streamed.{file_class._extension()}")
+    file_class.write(file_path, self.DATA)
+    file_class.write_values(streamed_file_path, KeyIndex(self.DATA).values().items())
+    with open(file_path) as file, open(streamed_file_path) as streamed_file:
+      return file.read(), streamed_file.read()
+
+  def test_streamed_writes_match_the_whole_document_writes(self):
+    for file_class in [YamlFile, JsonFile]:
+      content, streamed_content = self.write_both(file_class)
+      self.assertEqual(streamed_content, content)
+
+  def test_streamed_reads_match_the_whole_document_reads(self):
+    for file_class in [YamlFile, JsonFile]:
+      file_path = os.path.join(self.directory.name, f"en.{file_class._extension()}")
+      file_class.write(file_path, self.DATA | { "empty": {}, "unset": None })
+      self.assertEqual(list(file_class.read_values(file_path)), list(KeyIndex(file_class.read(file_path)).values().items()))
+
+  def test_json_values_spanning_chunks_are_read(self):
+    file_path = os.path.join(self.directory.name, "en.json")
+    JsonFile.write(file_path, self.DATA)
+    with mock.patch.object(JsonFile, "_JsonFile__STREAM_CHUNK_SIZE", 7):
+      self.assertEqual(dict(JsonFile.read_values(file_path)), KeyIndex(self.DATA).values())
+
+  def test_invalid_streamed_files_raise_parse_errors(self):
+    for file_class, content in [(JsonFile, '{"en": {"hello": "Hello",}}'), (JsonFile, '{"en": "Hello"} trailing'), (YamlFile, "en: [unclosed\n"), (YamlFile, "base: &base Hello\nother: *base\n")]:
+      file_path = os.path.join(self.directory.name, f"invalid.{file_class._extension()}")
+      with open(file_path, "w") as file:
+        file.write(content)
+      with self.assertRaises(BaseFile.ParseError):
+        list(file_class.read_values(file_path))
+
+if __name__ == "__main__":
+  unittest.main()
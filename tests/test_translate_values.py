@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from checkpoint_journal import CheckpointJournal
+from client.mock import MockClient
+from client.scheduler import QuotaScheduler
+from normalized_index import NormalizedIndex
+from payload_compactor import PayloadCompactor
+from utils import source_values, translate_values
+
+class TestTranslateValues(unittest.TestCase):
+  def setUp(self):
+    self.clients = MockClient.generate_clients(api_keys=["latency=0"], variable_pattern="%{.*?}")
+    for client in self.clients:
+      self.addCleanup(client.close)
+    self.scheduler = QuotaScheduler(clients=self.clients)
+    self.scheduler.validate()
+
+  def translate(self, values_by_language, translations_by_language=None, **kwargs):
+    translations_by_language = {} if translations_by_language is None else translations_by_language
+    with mock.patch.object(self.scheduler, "translate", wraps=self.scheduler.translate) as translate:
+      translate_values(values_by_language, translations_by_language, source_language="EN", client_class=MockClient, scheduler=self.scheduler, log=lambda _message: None, **kwargs)
+    sent_texts = {}
+    for call in translate.call_args_list:
+      sent_texts.setdefault(call.kwargs["target_language"], []).extend(call.kwargs["texts"])
+    return translations_by_language, sent_texts
+
+  def test_source_values_are_unique_texts(self):
+    self.assertEqual(source_values(["Hello", ["Bye", "Hello"], 3, True, ["One", 2]]), ["Hello", "Bye", "One"])
+
+  def test_each_value_is_translated_once_per_language(self):
+    translations_by_language, sent_texts = self.translate({ "FR": source_values(["Hello", "Bye", ["Hello", "Bye"]]), "DE": source_values(["Hello"]) })
+    self.assertEqual(sent_texts, { "FR": ["Hello", "Bye"], "DE": ["Hello"] })
+    self.assertEqual(translations_by_language, { "FR": { "Hello": "[FR] Hello", "Bye": "[FR] Bye" }, "DE": { "Hello": "[DE] Hello" } })
+
+  def test_values_already_translated_are_not_sent(self):
+    translations_by_language, sent_texts = self.translate({ "FR": ["Hello", "Bye"] }, translations_by_language={ "FR": { "Hello": "Salut" } })
+    self.assertEqual(sent_texts, { "FR": ["Bye"] })
+    self.assertEqual(translations_by_language["FR"], { "Hello": "Salut", "Bye": "[FR] Bye" })
+
+  def test_values_found_in_the_journal_are_resumed_instead_of_sent(self):
+    with tempfile.TemporaryDirectory() as directory:
+      journal = CheckpointJournal(file_path=os.path.join(directory, "journal.jsonl"), provider="mock", placeholders="%{.*?}", checkpoint_interval=0)
+      journal.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+      translations_by_language, sent_texts = self.translate({ "FR": ["Hello", "Bye"] }, journal=journal)
+      journal.close(is_completed=False)
+    self.assertEqual(sent_texts, { "FR": ["Bye"] })
+    self.assertEqual(translations_by_language["FR"], { "Hello": "Bonjour", "Bye": "[FR] Bye" })
+    self.assertEqual(journal.lookup(["Bye"], source_language="EN", target_language="FR"), { "Bye": "[FR] Bye" })
+
+  def test_values_differing_only_by_placeholders_are_translated_once(self):
+    normalized_index = NormalizedIndex(variable_pattern="%{.*?}")
+    translations_by_language, sent_texts = self.translate({ "FR": ["Delete %{count} files", "Delete %{n} files.", "  Delete %{total} files"] }, normalized_index=normalized_index)
+    self.assertEqual(sent_texts, { "FR": ["Delete %{count} files"] })
+    self.assertEqual(translations_by_language["FR"], { "Delete %{count} files": "[FR] Delete %{count} files", "Delete %{n} files.": "[FR] Delete %{n} files.", "  Delete %{total} files": "  [FR] Delete %{total} files" })
+    self.assertEqual(normalized_index.statistics(), { "reused": 2 })
+
+  def test_only_the_part_of_the_values_needing_a_translation_is_sent(self):
+    payload_compactor = PayloadCompactor(variable_pattern="%{.*?}", terms=["Acme"])
+    translations_by_language, sent_texts = self.translate({ "FR": [" <b>Save</b> ", "%{count}", "https://example.com", "Acme", "<i>Save</i>"] }, payload_compactor=payload_compactor)
+    self.assertEqual(sent_texts, { "FR": ["Save"] })
+    self.assertEqual(translations_by_language["FR"], { " <b>Save</b> ": " <b>[FR] Save</b> ", "%{count}": "%{count}", "https://example.com": "https://example.com", "Acme": "Acme", "<i>Save</i>": "<i>[FR] Save</i>" })
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from translation_memory import TranslationMemory
+
+class TestTranslationMemory(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, "memory.sqlite")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def open(self, max_entries=100000, read_only=False):
+    return TranslationMemory(file_path=self.file_path, provider="deepl", variable_pattern="%{.*?}", max_entries=max_entries, read_only=read_only)
+
+  def test_translations_are_found_again_after_closing(self):
+    memory = self.open()
+    memory.store({ "Caf\u00e9": "Caf\u00e9 FR", "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    memory.close()
+    memory = self.open()
+    self.addCleanup(memory.close)
+    # The decomposed form of a text shares the entry of its composed form
+    self.assertEqual(memory.lookup(["Cafe\u0301", "Hello", "World"], source_language="EN", target_language="FR"), { "Cafe\u0301": "Caf\u00e9 FR", "Hello": "Bonjour" })
+    self.assertEqual(memory.statistics(), { "hits": 2, "misses": 1, "stored": 0, "evicted": 0 })
+
+  def test_translations_are_keyed_by_languages_provider_and_variable_pattern(self):
+    memory = self.open()
+    memory.store({ "Hello": "Bonjour" }, source_language="EN", target_language="FR")
+    memory.close()
+    memory = self.open()
+    self.addCleanup(memory.close)
+    self.assertEqual(memory.lookup(["Hello"], source_language="EN", target_language="DE"), {})
+    self.assertEqual(memory.lookup(["Hello"], source_language="DE", target_language="FR"), {})
+    other_memory = TranslationMemory(file_path=self.file_path, provider="libretranslate", variable_pattern="%{.*?}")
+    self.addCleanup(other_memory.close)
+    self.assertEqual(other_memory.lookup(["Hello"], source_language="EN", target_language="FR"), {})
+    other_memory = TranslationMemory(file_path=self.file_path, provider="deepl", variable_pattern="{{.*?}}")
+    self.addCleanup(other_memory.close)
+    self.assertEqual(other_memory.lookup(["Hello"], source_language="EN", target_language="FR"), {})
+
+  def test_least_recently_used_translations_are_evicted_on_close(self):
+    memory = self.open(max_entries=2)
+    memory.store({ "One": "Un" }, source_language="EN", target_language="FR")
+    memory.store({ "Two": "Deux" }, source_language="EN", target_language="FR")
+    memory.store({ "Three": "Trois" }, source_language="EN", target_language="FR")
+    memory.lookup(["One"], source_language="EN", target_language="FR")
+    memory.close()
+    self.assertEqual(memory.statistics()["evicted"], 1)
+    memory = self.open()
+    self.addCleanup(memory.close)
+    self.assertEqual(memory.lookup(["One", "Two", "Three"], source_language="EN", target_language="FR"), { "One": "Un", "Three": "Trois" })
+
+  def test_read_only_memory_is_left_untouched(self):
+    memory = self.open()
+    memory.store({ "Hello": "Bonjour", "World": "Monde" }, source_language="EN", target_language="FR")
+    memory.close()
+    with open(self.file_path, "rb") as file:
+      content = file.read()
+    memory = self.open(max_entries=1, read_only=True)
+    self.assertEqual(memory.lookup(["Hello", "Bye"], source_language="EN", target_language="FR"), { "Hello": "Bonjour" })
+    memory.store({ "Bye": "Au revoir" }, source_language="EN", target_language="FR")
+    memory.close()
+    self.assertEqual(memory.statistics(), { "hits": 1, "misses": 1, "stored": 0, "evicted": 0 })
+    with open(self.file_path, "rb") as file:
+      self.assertEqual(file.read(), content)
+
+  def test_missing_read_only_memory_is_not_created(self):
+    memory = self.open(read_only=True)
+    self.assertEqual(memory.lookup(["Hello"], source_language="EN", target_language="FR"), {})
+    memory.close()
+    self.assertFalse(os.path.exists(self.file_path))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,67 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+class TestWatch(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    os.makedirs(os.path.join(self.directory.name, "en"))
+    self.source_file_path = os.path.join(self.directory.name, "en", "app.yml")
+    self.target_file_path = os.path.join(self.directory.name, "fr", "app.yml")
+    self.write_source("hello: Hello\n")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write_source(self, content):
+    with open(self.source_file_path, "w") as file:
+      file.write(content)
+
+  def wait_for_target(self, expected_content):
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+      if os.path.exists(self.target_file_path):
+        with open(self.target_file_path) as file:
+          if file.read() == expected_content:
+            return
+      time.sleep(0.05)
+    self.fail(f"The target file never got {expected_content!r}")
+
+  def test_saved_source_files_are_translated_until_interrupted(self):
+    environment = os.environ | {
+      "SOURCE_LANGUAGE": "en",
+      "TARGET_LANGUAGES": "fr",
+      "VARIABLE_PATTERN": "%{(.*?)}",
+      "SOURCE_FILES_DIRECTORY": os.path.join(self.directory.name, "{language}"),
+      "TARGET_FILES_DIRECTORY": os.path.join(self.directory.name, "{language}"),
+      "API_KEYS": "latency=0",
+      "API_TYPE": "mock",
+      "FILE_TYPE": "yaml",
+      "WATCH": "true",
+      "WATCH_INTERVAL": "0.05",
+      "JOURNAL_PATH": os.path.join(self.directory.name, "journal.jsonl")
+    }
+    process = subprocess.Popen([sys.executable, MAIN_PATH], env=environment, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+      self.wait_for_target("hello: '[FR] Hello'\n")
+      self.write_source("hello: Hello\nbye: [unclosed\n")
+      time.sleep(0.5)
+      self.write_source("hello: Hello\nbye: Bye\n")
+      self.wait_for_target("hello: '[FR] Hello'\nbye: '[FR] Bye'\n")
+      time.sleep(0.2)
+    finally:
+      process.send_signal(signal.SIGINT)
+      output, _ = process.communicate(timeout=20)
+    self.assertEqual(process.returncode, 0, output)
+    self.assertIn("[Watch] Stopped", output)
+    self.assertIn("[Error]", output)
+    self.assertFalse(os.path.exists(environment["JOURNAL_PATH"]))
+
+if __name__ == "__main__":
+  unittest.main()
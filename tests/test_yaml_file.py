@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from files import FastYamlFile, FileFactory, RoundTripYamlFile, YamlFile
+from files.base import BaseFile
+
+class TestYamlFile(unittest.TestCase):
+  DATA = { "en": { "greeting": "Hello %{name}", "long": "A quoted value: " + "very " * 30 + "long", "count": 3, "list": ["one", "two"], "empty": "" } }
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, "en.yml")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def read_content(self):
+    with open(self.file_path) as file:
+      return file.read()
+
+  def test_default_mode_writes_the_output_of_the_pure_python_dumper(self):
+    YamlFile.write(self.file_path, self.DATA)
+    self.assertEqual(self.read_content(), yaml.dump(self.DATA, sort_keys=False, default_flow_style=False))
+    self.assertEqual(YamlFile.read(self.file_path), self.DATA)
+
+  def test_fast_mode_writes_the_same_document(self):
+    FastYamlFile.write(self.file_path, self.DATA)
+    self.assertEqual(FastYamlFile.read(self.file_path), self.DATA)
+
+  def test_round_trip_mode_keeps_comments_anchors_and_quotes(self):
+    with open(self.file_path, "w") as file:
+      file.write("# Greetings\nen:\n  base: &base 'Hello' # Reused\n  greeting: *base\n  farewell: \"Bye\"\n")
+    data = RoundTripYamlFile.read(self.file_path)
+    data["en"]["welcome"] = "Welcome"
+    RoundTripYamlFile.write(self.file_path, data)
+    self.assertEqual(self.read_content(), "# Greetings\nen:\n  base: &base 'Hello' # Reused\n  greeting: *base\n  farewell: \"Bye\"\n  welcome: Welcome\n")
+
+  def test_empty_and_invalid_files(self):
+    with open(self.file_path, "w") as file:
+      file.write("")
+    self.assertEqual(YamlFile.read(self.file_path), {})
+    with open(self.file_path, "w") as file:
+      file.write("en: [unclosed\n")
+    for file_class in [YamlFile, RoundTripYamlFile]:
+      with self.assertRaises(BaseFile.ParseError):
+        file_class.read(self.file_path)
+
+  def test_factory_picks_the_class_of_the_yaml_mode(self):
+    self.assertIs(FileFactory.for_type("yml"), YamlFile)
+    self.assertIs(FileFactory.for_type("yaml", yaml_mode="fast"), FastYamlFile)
+    self.assertIs(FileFactory.for_type("yaml", yaml_mode="round_trip"), RoundTripYamlFile)
+    with self.assertRaises(FileFactory.UnsupportedFileException):
+      FileFactory.for_type("yaml", yaml_mode="slow")
+
+if __name__ == "__main__":
+  unittest.main()